@@ -17,6 +17,9 @@ class Constants:
     LOSS_FUNCTION = "loss_function"
     MSE = "mse"
     BCE = "bce"
+    GRADIENT_ENGINE = "gradient_engine"
+    AUTOGRAD = "autograd"
+    MANUAL = "manual"
     SCALE_HEAD_LR = "scale_head_lr"
     SCALE_HIDDEN_LR = "scale_hidden_lr"
     TIMESTEP = "timestep"
@@ -39,6 +42,9 @@ class Constants:
     LOGGING = "logging"
     TEST_BATCH_SIZE = "test_batch_size"
     TEST_FREQUENCY = "test_frequency"
+    ERROR_EVALUATION = "error_evaluation"
+    MONTE_CARLO = "monte_carlo"
+    ANALYTIC = "analytic"
     OVERLAP_FREQUENCY = "overlap_frequency"
     TESTING = "testing"
     INPUT_DIMENSION = "input_dimension"
@@ -101,12 +107,26 @@ class Constants:
     IMPLEMENTATION = "implementation"
     CPP = "cpp"
     PYTHON = "python"
+    JIT = "jit"
     ODE_RUN = "ode_run"
+    ENGINE = "engine"
+    LOOP = "loop"
+    VECTORISED = "vectorised"
+    COVARIANCE_CHECK_FREQUENCY = "covariance_check_frequency"
+    INTEGRATOR = "integrator"
+    EULER = "euler"
+    RK4 = "rk4"
+    DORMAND_PRINCE = "dormand_prince"
+    RELATIVE_TOLERANCE = "relative_tolerance"
+    ABSOLUTE_TOLERANCE = "absolute_tolerance"
+    STEADY_STATE_TOLERANCE = "steady_state_tolerance"
     X = "x"
     MEAN = "mean"
     VARIANCE = "variance"
     DATASET_SIZE = "dataset_size"
     INF = "inf"
+    INPUT_POOL_SIZE = "input_pool_size"
+    BACKGROUND_REFILL = "background_refill"
     ODE_CSV = "ode_log.csv"
     NETWORK_CSV = "network_log.csv"
     GENERALISATION_ERROR = "generalisation_error"
@@ -140,6 +160,10 @@ class Constants:
     GPU_ID = "gpu_id"
     SWITCH_STEPS = "switch_steps"
     SPLIT_LOGGING = "split_logging"
+    LOG_FORMAT = "log_format"
+    CSV = "csv"
+    NPZ = "npz"
+    CHECKPOINT_QUEUE_SIZE = "checkpoint_queue_size"
     STUDENT_WEIGHTS = "student_weights"
     SAVE_WEIGHT_FREQUENCY = "save_weight_frequency"
     CHECKPOINT_PATH = "checkpoint_path"
@@ -148,6 +172,8 @@ class Constants:
     RESULTS_PATH = "results_path"
     PARALLEL = "parallel"
     SERIAL = "serial"
+    ENSEMBLE = "ensemble"
+    BATCHED = "batched"
     FORGETTING_PLOT = "forgetting_plot.pdf"
     TRANSFER_PLOT = "transfer_plot.pdf"
     PLASMA = "plasma"
@@ -175,6 +201,7 @@ class Constants:
     CONSOLIDATION_TYPE = "consolidation_type"
     EWC = "ewc"
     IMPORTANCE = "importance"
+    FISHER_SAMPLES = "fisher_samples"
     TYPE = "type"
     QUADRATIC = "quadratic"
     SYNAPTIC_INTELLIGENCE = "synaptic_intelligence"
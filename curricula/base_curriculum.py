@@ -1,6 +1,7 @@
 import abc
 import itertools
 
+import numpy as np
 from run import student_teacher_config
 
 
@@ -17,6 +18,12 @@ class BaseCurriculum(abc.ABC):
     def history(self):
         return self._history
 
+    @property
+    def next_switch_step(self):
+        """Task step at which next switch is scheduled, if known in advance
+        (used e.g. to make ODE steps land exactly on switches)."""
+        return np.inf
+
     def __next__(self):
         """Get next index from curriculum."""
         next_index = next(self._curriculum)
@@ -33,6 +33,10 @@ class HardStepsCurriculum(base_curriculum.BaseCurriculum):
         self._next_switch_step = next(self._curriculum_switch_steps)
         super().__init__(config=config)
 
+    @property
+    def next_switch_step(self):
+        return self._next_switch_step
+
     def to_switch(self, task_step: int, error: float) -> bool:
         """Establish whether condition for switching has been met.
 
@@ -11,6 +11,10 @@ class PeriodicCurriculum(base_curriculum.BaseCurriculum):
         self._curriculum_period = config.fixed_period
         super().__init__(config=config)
 
+    @property
+    def next_switch_step(self):
+        return self._curriculum_period
+
     def to_switch(self, task_step: int, error: float) -> bool:
         """Establish whether condition for switching has been met.
 
@@ -1,34 +1,125 @@
+from concurrent import futures
 from typing import Dict
+from typing import Optional
 from typing import Union
 
 import torch
 import torch.distributions as tdist
-from torch.utils.data import DataLoader
 
 import constants
 from data_modules import base_data_module
 
 
-class IIDDataset(torch.utils.data.Dataset):
+class EpochSampler:
+    """Samples batches without replacement from a fixed dataset.
+
+    The dataset is reshuffled at the start of each epoch (one permutation,
+    drawn from the global random state) and batches are contiguous slices
+    of the shuffled dataset; the last batch of an epoch holds the remainder
+    if the dataset size is not a multiple of the batch size.
+    """
+
+    def __init__(self, dataset: torch.Tensor, batch_size: int) -> None:
+        self._dataset = dataset
+        self._batch_size = batch_size
+
+        self._epoch = 0
+        self._shuffled_dataset = None
+        self._position = len(self._dataset)
+
+    @property
+    def epoch(self) -> int:
+        """Number of epochs started."""
+        return self._epoch
+
+    def _start_epoch(self) -> None:
+        permutation = torch.randperm(len(self._dataset))
+        self._shuffled_dataset = self._dataset[permutation]
+        self._position = 0
+        self._epoch += 1
+
+    def get_batch(self) -> torch.Tensor:
+        if self._position == len(self._dataset):
+            self._start_epoch()
+        batch = self._shuffled_dataset[
+            self._position : self._position + self._batch_size
+        ]
+        self._position += len(batch)
+        return batch
+
+
+class GaussianInputPool:
+    """Pool of i.i.d. Gaussian inputs drawn in large blocks.
+
+    Blocks are sampled into two reusable buffers from a dedicated generator
+    seeded with the run seed, so the sequence of inputs is deterministic and
+    independent of the global random state (and of whether blocks are
+    refilled in the background). Batches are views into the current block
+    and are only valid until the next block is taken, i.e. they must be
+    consumed (or copied) before the next call following the end of a block.
+    """
+
     def __init__(
         self,
-        dataset_size: int,
-        distribution: torch.distributions.Normal,
-        input_dimension,
+        batch_size: int,
+        input_dimension: int,
+        mean: Union[int, float],
+        std: Union[int, float],
+        pool_size: int,
+        seed: int,
+        background_refill: bool = False,
     ) -> None:
-        self._dataset_size = dataset_size
-        self._data_distribution = distribution
-        self._input_dimension = input_dimension
+        if pool_size < batch_size:
+            raise ValueError(
+                f"Input pool size {pool_size} smaller than batch size {batch_size}."
+            )
+        self._batch_size = batch_size
+        self._mean = mean
+        self._std = std
 
-        self._fixed_dataset = self._data_distribution.sample(
-            (self._dataset_size, self._input_dimension)
+        # blocks hold a whole number of batches.
+        block_size = (pool_size // batch_size) * batch_size
+        self._buffers = [torch.empty(block_size, input_dimension) for _ in range(2)]
+        self._generator = torch.Generator().manual_seed(seed)
+
+        if background_refill:
+            self._executor = futures.ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = None
+
+        self._current = 0
+        self._position = 0
+        self._fill(self._current)
+        self._pending = self._refill(1 - self._current)
+
+    def _fill(self, index: int) -> None:
+        self._buffers[index].normal_(
+            mean=self._mean, std=self._std, generator=self._generator
         )
 
-    def __len__(self):
-        return self._dataset_size
+    def _refill(self, index: int) -> Optional[futures.Future]:
+        """Fill buffer with next block, in background thread if enabled."""
+        if self._executor is None:
+            return None
+        return self._executor.submit(self._fill, index)
 
-    def __getitem__(self, idx):
-        return self._fixed_dataset[idx]
+    def _next_block(self) -> None:
+        self._current = 1 - self._current
+        if self._pending is None:
+            self._fill(self._current)
+        else:
+            self._pending.result()
+        self._pending = self._refill(1 - self._current)
+        self._position = 0
+
+    def get_batch(self) -> torch.Tensor:
+        if self._position == len(self._buffers[self._current]):
+            self._next_block()
+        batch = self._buffers[self._current][
+            self._position : self._position + self._batch_size
+        ]
+        self._position += self._batch_size
+        return batch
 
 
 class IIDData(base_data_module.BaseData):
@@ -42,6 +133,9 @@ class IIDData(base_data_module.BaseData):
         mean: Union[int, float],
         variance: Union[int, float],
         dataset_size: Union[str, int],
+        input_pool_size: Optional[int] = None,
+        background_refill: bool = False,
+        seed: int = 0,
     ):
         super().__init__(
             train_batch_size=train_batch_size,
@@ -54,12 +148,25 @@ class IIDData(base_data_module.BaseData):
         self._dataset_size = dataset_size
 
         if self._dataset_size != constants.Constants.INF:
-            self._dataset = IIDDataset(
-                dataset_size=self._dataset_size,
-                distribution=self._data_distribution,
+            fixed_dataset = self._data_distribution.sample(
+                (self._dataset_size, self._input_dimension)
+            )
+            self._epoch_sampler = EpochSampler(
+                dataset=fixed_dataset, batch_size=self._train_batch_size
+            )
+        elif input_pool_size is not None:
+            # distribution is parameterised by (mean, std).
+            self._input_pool = GaussianInputPool(
+                batch_size=self._train_batch_size,
                 input_dimension=self._input_dimension,
+                mean=mean,
+                std=variance,
+                pool_size=input_pool_size,
+                seed=seed,
+                background_refill=background_refill,
             )
-            self._reset_data_iterator()
+        else:
+            self._input_pool = None
 
     def get_test_data(self) -> Dict[str, torch.Tensor]:
         """Give fixed test data set (input data only)."""
@@ -80,21 +187,12 @@ class IIDData(base_data_module.BaseData):
         return {constants.Constants.X: batch}
 
     def _get_finite_dataset_batch(self) -> torch.Tensor:
-        try:
-            batch = next(iter(self._data_iterator))
-        except StopIteration:
-            self._reset_data_iterator()
-            batch = next(iter(self._data_iterator))
-        return batch
+        return self._epoch_sampler.get_batch()
 
     def _get_infinite_dataset_batch(self) -> torch.Tensor:
+        if self._input_pool is not None:
+            return self._input_pool.get_batch()
         batch = self._data_distribution.sample(
             (self._train_batch_size, self._input_dimension)
         )
         return batch
-
-    def _reset_data_iterator(self):
-        self._dataloader = DataLoader(
-            self._dataset, batch_size=self._train_batch_size, shuffle=True
-        )
-        self._data_iterator = iter(self._dataloader)
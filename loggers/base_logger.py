@@ -1,12 +1,16 @@
 import abc
 import os
+from typing import Any
+from typing import Dict
 from typing import List
+from typing import Set
 
 import numpy as np
 
 import constants
+from loggers import checkpoint_writer
+from loggers import column_buffer
 from run import student_teacher_config
-from utils import decorators
 from utils import network_configuration
 
 
@@ -27,6 +31,15 @@ class BaseLogger(abc.ABC):
         elif self._run_type == constants.Constants.ODE:
             self._csv_file_name = constants.Constants.ODE_CSV
 
+        # checkpoints are written in background thread if queue size is given.
+        if config.checkpoint_queue_size is None:
+            self._checkpoint_writer = None
+        else:
+            self._checkpoint_writer = checkpoint_writer.CheckpointWriter(
+                queue_size=config.checkpoint_queue_size
+            )
+        self._written_paths: Set[str] = set()
+
         self._setup_loggers()
 
     @abc.abstractmethod
@@ -48,6 +61,17 @@ class BaseLogger(abc.ABC):
         """
         pass
 
+    def write_array_df(self, tag: str, steps: np.ndarray, values: np.ndarray) -> None:
+        """Write a trajectory of (scalar) data to dataframe in one go.
+
+        Args:
+            tag: tag for data to be logged.
+            steps: step counts.
+            values: data to be written, one value per step.
+        """
+        for step, value in zip(steps, values):
+            self.write_scalar_df(tag=tag, step=step, scalar=value)
+
     def log_generalisation_errors(self, step: int, generalisation_errors: List[float]):
         for i, error in enumerate(generalisation_errors):
             self.write_scalar_df(
@@ -61,50 +85,135 @@ class BaseLogger(abc.ABC):
                 scalar=np.log10(error),
             )
 
-    def log_network_configuration(
-        self,
-        step: int,
+    def log_arrays(self, step: int, arrays: Dict[str, np.ndarray]) -> None:
+        """Write arrays (e.g. overlap matrices) at step, logging each entry
+        under a flattened tag e.g. name_i_j (see column_buffer.flat_tags).
+
+        Args:
+            step: current step count.
+            arrays: mapping from names to arrays to be written.
+        """
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            for tag, value in zip(
+                column_buffer.flat_tags(name, array.shape), array.flat
+            ):
+                self.write_scalar_df(tag=tag, step=step, scalar=value)
+
+    def log_array_trajectories(
+        self, steps: np.ndarray, arrays: Dict[str, np.ndarray]
+    ) -> None:
+        """As log_arrays, for arrays at several steps at once (with a
+        leading axis over steps)."""
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            tags = column_buffer.flat_tags(name, array.shape[1:])
+            values = array.reshape(len(steps), len(tags))
+            for k, tag in enumerate(tags):
+                self.write_array_df(tag=tag, steps=steps, values=values[:, k])
+
+    @staticmethod
+    def _network_configuration_arrays(
         network_config: network_configuration.NetworkConfiguration,
-    ):
+    ) -> Dict[str, np.ndarray]:
+        """Arrays of network configuration by name (in order of logging)."""
+        arrays = {}
         for i, head in enumerate(network_config.student_head_weights):
-            for j, weight in enumerate(head):
-                self.write_scalar_df(
-                    tag=f"{constants.Constants.STUDENT_HEAD}_{i}_{constants.Constants.WEIGHT}_{j}",
-                    step=step,
-                    scalar=weight,
-                )
+            arrays[
+                f"{constants.Constants.STUDENT_HEAD}_{i}_{constants.Constants.WEIGHT}"
+            ] = head
         for i, head in enumerate(network_config.teacher_head_weights):
-            for j, weight in enumerate(head):
-                self.write_scalar_df(
-                    tag=f"{constants.Constants.TEACHER_HEAD}_{i}_{constants.Constants.WEIGHT}_{j}",
-                    step=step,
-                    scalar=weight,
-                )
-        for (i, j), overlap_value in np.ndenumerate(
-            network_config.student_self_overlap
-        ):
-            self.write_scalar_df(
-                tag=f"{constants.Constants.STUDENT_SELF}_{constants.Constants.OVERLAP}_{i}_{j}",
-                step=step,
-                scalar=overlap_value,
-            )
+            arrays[
+                f"{constants.Constants.TEACHER_HEAD}_{i}_{constants.Constants.WEIGHT}"
+            ] = head
+        arrays[
+            f"{constants.Constants.STUDENT_SELF}_{constants.Constants.OVERLAP}"
+        ] = network_config.student_self_overlap
         for t, student_teacher_overlap in enumerate(
             network_config.student_teacher_overlaps
         ):
-            for (i, j), overlap_value in np.ndenumerate(student_teacher_overlap):
-                self.write_scalar_df(
-                    tag=f"{constants.Constants.STUDENT_TEACHER}_{t}_{constants.Constants.OVERLAP}_{i}_{j}",
-                    step=step,
-                    scalar=overlap_value,
-                )
+            arrays[
+                f"{constants.Constants.STUDENT_TEACHER}_{t}_"
+                f"{constants.Constants.OVERLAP}"
+            ] = student_teacher_overlap
+        return arrays
+
+    def log_network_configuration(
+        self,
+        step: int,
+        network_config: network_configuration.NetworkConfiguration,
+    ):
+        self.log_arrays(
+            step=step, arrays=self._network_configuration_arrays(network_config)
+        )
+
+    def log_generalisation_error_trajectory(
+        self, steps: np.ndarray, generalisation_errors: List[np.ndarray]
+    ):
+        """As log_generalisation_errors, for errors at several steps at once."""
+        for i, errors in enumerate(generalisation_errors):
+            self.write_array_df(
+                tag=f"{constants.Constants.GENERALISATION_ERROR}_{i}",
+                steps=steps,
+                values=errors,
+            )
+            self.write_array_df(
+                tag=f"{constants.Constants.LOG_GENERALISATION_ERROR}_{i}",
+                steps=steps,
+                values=np.log10(errors),
+            )
+
+    def log_network_configuration_trajectory(
+        self,
+        steps: np.ndarray,
+        network_config: network_configuration.NetworkConfiguration,
+    ):
+        """As log_network_configuration, for a configuration whose arrays
+        carry a leading axis over steps."""
+        self.log_array_trajectories(
+            steps=steps, arrays=self._network_configuration_arrays(network_config)
+        )
 
-    @abc.abstractmethod
-    @decorators.timer
     def checkpoint_df(self) -> None:
         """Merge dataframe with previously saved checkpoint.
 
+        Logged data is taken out of memory and written to disk, either
+        directly or (if enabled) by the background checkpoint writer.
+
         Raises:
             AssertionError: if columns of dataframe to be appended do
             not match previous checkpoints.
+            RuntimeError: if background checkpoint writer failed.
+        """
+        data = self._checkpoint_data()
+        if self._checkpoint_writer is None:
+            self._written_paths.update(self._write_checkpoint(data))
+        else:
+            self._checkpoint_writer.submit(lambda: self._write_checkpoint(data))
+
+    @abc.abstractmethod
+    def _checkpoint_data(self) -> Any:
+        """Take data logged since last checkpoint out of memory
+        (resetting loggers)."""
+        pass
+
+    @abc.abstractmethod
+    def _write_checkpoint(self, data: Any) -> List[str]:
+        """Append data taken at checkpoint to saved logs.
+
+        Returns:
+            paths: paths of files written.
         """
         pass
+
+    def close(self) -> None:
+        """Finish writing checkpoints (e.g. at end of training) and flush
+        written logs to disk.
+
+        Raises:
+            RuntimeError: if background checkpoint writer failed.
+        """
+        if self._checkpoint_writer is not None:
+            self._written_paths.update(self._checkpoint_writer.close())
+        checkpoint_writer.fsync(self._written_paths)
+        self._written_paths = set()
@@ -0,0 +1,71 @@
+import os
+import queue
+import threading
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Set
+
+
+class CheckpointWriter:
+    """Writes checkpoints of logged data in a background thread.
+
+    Writes are submitted as callables (returning the paths written) to a
+    bounded queue, so training only blocks if the writer falls behind by
+    more than queue_size checkpoints. Writes are done in order of submission.
+    If a write fails the writer stops writing (remaining submissions are
+    discarded) and the error is raised on the next submit or on close.
+
+    Args:
+        queue_size: maximum number of pending checkpoints.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._paths: Set[str] = set()
+        self._error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            write = self._queue.get()
+            if write is None:
+                return
+            if self._error is None:
+                try:
+                    self._paths.update(write())
+                except BaseException as error:
+                    self._error = error
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Background checkpoint writer failed.") from self._error
+
+    def submit(self, write: Callable[[], List[str]]) -> None:
+        """Queue write (blocks while queue is full)."""
+        self._raise_if_failed()
+        self._queue.put(write)
+
+    def close(self) -> Set[str]:
+        """Wait for pending writes and stop writer.
+
+        Returns:
+            paths: paths written.
+
+        Raises:
+            RuntimeError: if any write failed.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_if_failed()
+        return self._paths
+
+
+def fsync(paths: Set[str]) -> None:
+    """Flush written files at paths to disk."""
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
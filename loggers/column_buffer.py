@@ -0,0 +1,190 @@
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def flat_tags(name: str, shape: Tuple[int, ...]) -> List[str]:
+    """Tags of entries of array called name, e.g. name_i_j for a matrix,
+    in row major order."""
+    return ["_".join([name] + [str(i) for i in index]) for index in np.ndindex(*shape)]
+
+
+class ColumnBuffer:
+    """Table of scalars logged by (step, tag) held in preallocated arrays.
+
+    Each tag is registered once as a column (in order of registration) and
+    each distinct step gets the next row at the row cursor. Values are
+    written into a NaN initialised array that grows geometrically when rows
+    or columns run out, so writes do not reallocate in steady state. The
+    buffer is reused after each reset (e.g. at checkpoints).
+
+    Whole arrays (e.g. overlap matrices) can be written as blocks of
+    contiguous columns, registered by name and shape on first write; tags
+    of their entries (see flat_tags) are only produced on export.
+    """
+
+    def __init__(self, num_rows: int = 64, num_columns: int = 64) -> None:
+        self._values = np.full((num_rows, num_columns), np.nan)
+        self._steps = np.empty(num_rows, dtype=np.int64)
+
+        self._columns: Dict[str, int] = {}
+        # first column and shape of each block.
+        self._blocks: Dict[str, Tuple[int, Tuple[int, ...]]] = {}
+        self._num_columns = 0
+        # tag of each column, produced on export (None after registrations).
+        self._tags = None
+
+        self._rows: Dict[int, int] = {}
+        self._written = np.zeros(num_columns, dtype=bool)
+        # dtype of first value written to column since last reset
+        # (values are held as float64, e.g. float32 logs are exported as such).
+        self._dtypes: Dict[int, np.dtype] = {}
+        self._num_rows = 0
+
+        # row of most recent step (most writes are to the same step).
+        self._last_step = None
+        self._last_row = None
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def register_tags(self, tags: List[str]) -> None:
+        """Register columns of tags (in order), before any writes."""
+        for tag in tags:
+            self._column(tag)
+
+    def _allocate(self, num_columns: int) -> int:
+        """First of num_columns newly allocated contiguous columns."""
+        column = self._num_columns
+        self._num_columns += num_columns
+        while self._num_columns > self._values.shape[1]:
+            self._values = np.hstack((self._values, np.full_like(self._values, np.nan)))
+            self._written = np.concatenate(
+                (self._written, np.zeros_like(self._written))
+            )
+        self._tags = None
+        return column
+
+    def _column(self, tag: str) -> int:
+        column = self._columns.get(tag)
+        if column is None:
+            column = self._allocate(1)
+            self._columns[tag] = column
+        return column
+
+    def _block(self, name: str, shape: Tuple[int, ...]) -> int:
+        block = self._blocks.get(name)
+        if block is None:
+            block = (self._allocate(int(np.prod(shape))), shape)
+            self._blocks[name] = block
+        elif block[1] != shape:
+            raise ValueError(
+                f"Shape {shape} of {name} does not match previous shape {block[1]}."
+            )
+        return block[0]
+
+    def _row(self, step: int) -> int:
+        if step == self._last_step:
+            return self._last_row
+        row = self._rows.get(step)
+        if row is None:
+            row = self._num_rows
+            if row == len(self._values):
+                self._values = np.vstack(
+                    (self._values, np.full_like(self._values, np.nan))
+                )
+                self._steps = np.concatenate((self._steps, np.empty_like(self._steps)))
+            self._steps[row] = step
+            self._rows[step] = row
+            self._num_rows += 1
+        self._last_step = step
+        self._last_row = row
+        return row
+
+    def write(self, tag: str, step: int, value: float) -> None:
+        column = self._column(tag)
+        # row first, it may reallocate values.
+        row = self._row(step)
+        self._values[row, column] = value
+        if not self._written[column]:
+            self._dtypes[column] = np.result_type(value)
+            self._written[column] = True
+
+    def write_array(self, tag: str, steps: np.ndarray, values: np.ndarray) -> None:
+        column = self._column(tag)
+        rows = [self._row(step) for step in steps]
+        self._values[rows, column] = values
+        if not self._written[column]:
+            self._dtypes[column] = np.result_type(values)
+            self._written[column] = True
+
+    def write_block(self, name: str, step: int, values: np.ndarray) -> None:
+        """Write entries of array called name at step."""
+        values = np.asarray(values)
+        column = self._block(name, values.shape)
+        row = self._row(step)
+        self._values[row, column : column + values.size] = values.ravel()
+        self._set_written(column, values.size, values.dtype)
+
+    def write_block_array(
+        self, name: str, steps: np.ndarray, values: np.ndarray
+    ) -> None:
+        """Write entries of arrays called name at several steps, values
+        having a leading axis over steps."""
+        values = np.asarray(values)
+        column = self._block(name, values.shape[1:])
+        rows = [self._row(step) for step in steps]
+        size = int(np.prod(values.shape[1:]))
+        self._values[rows, column : column + size] = values.reshape(len(rows), size)
+        self._set_written(column, size, values.dtype)
+
+    def _set_written(self, column: int, size: int, dtype: np.dtype) -> None:
+        if not self._written[column]:
+            for c in range(column, column + size):
+                self._dtypes[c] = dtype
+            self._written[column : column + size] = True
+
+    def _column_tags(self) -> List[str]:
+        if self._tags is None:
+            tags = [None] * self._num_columns
+            for tag, column in self._columns.items():
+                tags[column] = tag
+            for name, (column, shape) in self._blocks.items():
+                block_tags = flat_tags(name, shape)
+                tags[column : column + len(block_tags)] = block_tags
+            self._tags = tags
+        return self._tags
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Logged values by tag (tags written since last reset, in order of
+        registration), ordered by step."""
+        rows = np.argsort(self._steps[: self._num_rows], kind="stable")
+        return {
+            tag: self._values[rows, column].astype(self._export_dtype(column))
+            for column, tag in enumerate(self._column_tags())
+            if self._written[column]
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Logged values as dataframe (see to_arrays)."""
+        columns = self.to_arrays()
+        return pd.DataFrame(columns, columns=list(columns.keys()))
+
+    def _export_dtype(self, column: int) -> np.dtype:
+        dtype = self._dtypes[column]
+        if np.issubdtype(dtype, np.floating):
+            return dtype
+        # e.g. integer columns, which may have missing (NaN) rows.
+        return np.float64
+
+    def reset(self) -> None:
+        """Clear logged values, keeping registered tags and allocations."""
+        self._values[: self._num_rows] = np.nan
+        self._written[:] = False
+        self._rows = {}
+        self._num_rows = 0
+        self._last_step = None
+        self._last_row = None
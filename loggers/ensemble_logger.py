@@ -0,0 +1,85 @@
+from typing import List
+
+import numpy as np
+
+from loggers import base_logger
+from utils import network_configuration
+
+
+class EnsembleLogger:
+    """Logger for an ensemble of runs integrated together.
+
+    Holds one logger per ensemble member and distributes batched quantities
+    (leading axis over members) to them, so each member's logs are written
+    exactly as for a single run.
+    """
+
+    def __init__(self, loggers: List[base_logger.BaseLogger]):
+        self._loggers = loggers
+
+    def log_generalisation_errors(
+        self, step: int, generalisation_errors: List[np.ndarray]
+    ):
+        for member, logger in enumerate(self._loggers):
+            logger.log_generalisation_errors(
+                step=step,
+                generalisation_errors=[
+                    errors[member] for errors in generalisation_errors
+                ],
+            )
+
+    def log_network_configuration(
+        self,
+        step: int,
+        network_config: List[network_configuration.NetworkConfiguration],
+    ):
+        for logger, member_network_config in zip(self._loggers, network_config):
+            logger.log_network_configuration(
+                step=step, network_config=member_network_config
+            )
+
+    def log_generalisation_error_trajectory(
+        self, steps: np.ndarray, generalisation_errors: List[np.ndarray]
+    ):
+        for member, logger in enumerate(self._loggers):
+            logger.log_generalisation_error_trajectory(
+                steps=steps,
+                generalisation_errors=[
+                    errors[:, member] for errors in generalisation_errors
+                ],
+            )
+
+    def log_network_configuration_trajectory(
+        self,
+        steps: np.ndarray,
+        network_config: network_configuration.NetworkConfiguration,
+    ):
+        """Arrays of network_config have leading axes (steps, members)."""
+        for member, logger in enumerate(self._loggers):
+            logger.log_network_configuration_trajectory(
+                steps=steps,
+                network_config=network_configuration.NetworkConfiguration(
+                    student_head_weights=[
+                        head[:, member] for head in network_config.student_head_weights
+                    ],
+                    teacher_head_weights=[
+                        head[:, member] for head in network_config.teacher_head_weights
+                    ],
+                    student_self_overlap=network_config.student_self_overlap[:, member],
+                    teacher_self_overlaps=[],
+                    teacher_cross_overlaps=[],
+                    student_teacher_overlaps=[
+                        overlap[:, member]
+                        for overlap in network_config.student_teacher_overlaps
+                    ],
+                ),
+            )
+
+    def checkpoint_df(self) -> None:
+        for logger in self._loggers:
+            logger.checkpoint_df()
+
+    def close(self) -> None:
+        """Close logger of each member (see BaseLogger.close)."""
+        for logger in self._loggers:
+            logger.close()
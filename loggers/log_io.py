@@ -0,0 +1,168 @@
+import glob
+import os
+import zipfile
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# binary logs are stored as a folder of npz shards (one per checkpoint),
+# named after the csv log they replace e.g. network_log/network_log_00000.npz,
+# with one array per logged tag. Split logs (one logical table per tag) are
+# instead stored in a single zip container of npy datasets named after the
+# csv log, e.g. sim/network_log.npz, with one dataset per tag and checkpoint
+# (tag/00000, tag/00001, ...).
+
+
+def shard_folder(log_path: str) -> str:
+    """Folder of binary shards replacing (csv) log at log_path."""
+    return os.path.splitext(log_path)[0]
+
+
+def shard_paths(log_path: str) -> List[str]:
+    """Paths of binary shards of log at log_path, in order of writing."""
+    folder = shard_folder(log_path)
+    return sorted(glob.glob(os.path.join(folder, f"{os.path.basename(folder)}_*.npz")))
+
+
+def write_shard(log_path: str, shard_index: int, columns: Dict[str, np.ndarray]) -> str:
+    """Write one shard of columns of binary log replacing log at log_path.
+
+    Returns:
+        path: path of shard.
+    """
+    folder = shard_folder(log_path)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{os.path.basename(folder)}_{shard_index:05d}.npz")
+    np.savez(path, **columns)
+    return path
+
+
+def store_path(log_path: str) -> str:
+    """Path of single file store replacing per tag (csv) logs named after log_path."""
+    return f"{os.path.splitext(log_path)[0]}.npz"
+
+
+def append_to_store(store_path: str, columns: Dict[str, np.ndarray]) -> None:
+    """Append one chunk (e.g. checkpoint) of values per tag to store at store_path,
+    creating it if necessary. Store is opened once for all tags."""
+    with zipfile.ZipFile(store_path, mode="a") as store:
+        # datasets of chunk i are named tag/{i:05d}.
+        chunk_index = len({os.path.basename(name) for name in store.namelist()})
+        for tag, values in columns.items():
+            with store.open(
+                f"{tag}/{chunk_index:05d}.npy", mode="w", force_zip64=True
+            ) as dataset:
+                np.lib.format.write_array(dataset, np.asarray(values))
+
+
+class StoreReader:
+    """Read access to per tag datasets of single file store (see append_to_store).
+
+    Datasets of a tag are loaded on demand and concatenated over chunks. The
+    store is held open until closed (readers are also context managers).
+
+    Args:
+        store_path: path of store.
+    """
+
+    def __init__(self, store_path: str) -> None:
+        self._store = np.load(store_path)
+        self._datasets: Dict[str, List[str]] = {}
+        # (datasets are in order of writing.)
+        for name in self._store.files:
+            self._datasets.setdefault(name.rsplit("/", 1)[0], []).append(name)
+
+    def keys(self) -> List[str]:
+        return list(self._datasets.keys())
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return np.concatenate([self._store[name] for name in self._datasets[key]])
+
+    def close(self) -> None:
+        """Close store file."""
+        self._store.close()
+
+    def __enter__(self) -> "StoreReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class LogReader:
+    """Read access to a log written either as csv or as binary shards.
+
+    Columns are loaded on demand (and cached), so only the tags that are
+    used are read. Shards are concatenated in order of writing; tags missing
+    from a shard are filled with NaN. Shards are held open until closed
+    (readers are also context managers).
+
+    Args:
+        log_path: path of csv log; if it does not exist, the folder of binary
+        shards corresponding to it is read instead.
+    """
+
+    def __init__(self, log_path: str) -> None:
+        self._log_path = log_path
+        self._csv = os.path.exists(log_path)
+        self._columns: Dict[str, pd.Series] = {}
+
+        if self._csv:
+            self._keys = list(pd.read_csv(log_path, nrows=0).columns)
+        else:
+            self._shards = [np.load(path) for path in shard_paths(log_path)]
+            if not self._shards:
+                raise FileNotFoundError(f"No csv log or binary shards at {log_path}.")
+            self._keys = list(
+                dict.fromkeys(key for shard in self._shards for key in shard.files)
+            )
+            self._shard_lengths = [
+                len(shard[shard.files[0]]) if shard.files else 0
+                for shard in self._shards
+            ]
+
+    def keys(self) -> List[str]:
+        return self._keys
+
+    def __getitem__(self, key: str) -> pd.Series:
+        if key not in self._columns:
+            if key not in self._keys:
+                raise KeyError(key)
+            if self._csv:
+                values = pd.read_csv(self._log_path, usecols=[key])[key].to_numpy()
+            else:
+                values = np.concatenate(
+                    [
+                        shard[key] if key in shard.files else np.full(length, np.nan)
+                        for shard, length in zip(self._shards, self._shard_lengths)
+                    ]
+                )
+            self._columns[key] = pd.Series(values, name=key)
+        return self._columns[key]
+
+    def to_dataframe(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load (selected) columns of log into a dataframe."""
+        if columns is None:
+            columns = self._keys
+        return pd.DataFrame({key: self[key] for key in columns}, columns=columns)
+
+    def close(self) -> None:
+        """Close shard files (columns already loaded remain available)."""
+        if not self._csv:
+            for shard in self._shards:
+                shard.close()
+
+    def __enter__(self) -> "LogReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_log(log_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load (selected) columns of csv or binary log at log_path."""
+    with LogReader(log_path) as reader:
+        return reader.to_dataframe(columns=columns)
@@ -1,11 +1,13 @@
 import os
 from typing import Dict
+from typing import List
 
 import numpy as np
 import pandas as pd
 
 import constants
 from loggers import base_logger
+from loggers import log_io
 from run import student_teacher_config
 from utils import network_configuration
 
@@ -20,6 +22,7 @@ class SplitLogger(base_logger.BaseLogger):
         self._loggers: Dict[str, pd.DataFrame] = {}
         self._logfile_paths: Dict[str, str] = {}
         self._initialisation_network_config = network_config
+        self._log_format = config.log_format
 
         super().__init__(config=config, run_type=run_type)
 
@@ -28,6 +31,10 @@ class SplitLogger(base_logger.BaseLogger):
         os.makedirs(os.path.join(self._checkpoint_path, self._run_type), exist_ok=True)
         self._setup_error_loggers()
         self._setup_overlap_loggers()
+        # binary logs of all tags are kept in single store.
+        self._store_path = log_io.store_path(
+            os.path.join(self._checkpoint_path, self._run_type, self._csv_file_name)
+        )
 
     def _setup_error_loggers(self):
         for i in range(self._num_teachers):
@@ -100,17 +107,48 @@ class SplitLogger(base_logger.BaseLogger):
         """
         self._loggers[tag].at[step, tag] = scalar
 
-    def checkpoint_df(self) -> None:
-        """Merge dataframe with previously saved checkpoint.
+    def write_array_df(self, tag: str, steps: np.ndarray, values: np.ndarray) -> None:
+        """Write a trajectory of (scalar) data to dataframe in one go.
+
+        Args:
+            tag: tag for data to be logged.
+            steps: step counts.
+            values: data to be written, one value per step.
+        """
+        logger = self._loggers[tag]
+        logger = logger.reindex(logger.index.union(steps))
+        logger.loc[steps, tag] = values
+        self._loggers[tag] = logger
+
+    def _checkpoint_data(self) -> Dict[str, pd.DataFrame]:
+        """Take dataframes of each tag out of memory."""
+        loggers = self._loggers
+
+        # reset loggers in memory to empty.
+        self._loggers = {tag: pd.DataFrame() for tag in loggers}
+
+        return loggers
+
+    def _write_checkpoint(self, data: Dict[str, pd.DataFrame]) -> List[str]:
+        """Merge dataframes with previously saved checkpoint.
 
         Raises:
             AssertionError: if columns of dataframe to be appended do
             not match previous checkpoints.
         """
+        if self._log_format == constants.Constants.NPZ:
+            columns = {
+                tag: logger[tag].to_numpy()
+                for tag, logger in data.items()
+                if not logger.empty
+            }
+            if not columns:
+                return []
+            log_io.append_to_store(store_path=self._store_path, columns=columns)
+            return [self._store_path]
+
         for tag, df_path in self._logfile_paths.items():
             # only append header on first checkpoint/save.
             header = not os.path.exists(df_path)
-            self._loggers[tag].to_csv(df_path, mode="a", header=header, index=False)
-
-            # reset loggers in memory to empty.
-            self._loggers[tag] = pd.DataFrame()
+            data[tag].to_csv(df_path, mode="a", header=header, index=False)
+        return list(self._logfile_paths.values())
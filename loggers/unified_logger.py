@@ -1,8 +1,15 @@
 import os
+from typing import Dict
+from typing import List
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
+import constants
 from loggers import base_logger
+from loggers import column_buffer
+from loggers import log_io
 from run import student_teacher_config
 
 
@@ -12,15 +19,38 @@ class UnifiedLogger(base_logger.BaseLogger):
         config: student_teacher_config.StudentTeacherConfiguration,
         run_type: str,
     ):
-        self._logger_df: pd.DataFrame
+        self._logger_buffer: column_buffer.ColumnBuffer
         self._logfile_path: str
+        self._log_format = config.log_format
+
+        # steps logged between checkpoints (buffer grows if exceeded).
+        self._expected_num_rows = (
+            config.checkpoint_frequency
+            // min(config.test_frequency, config.log_frequency)
+            + 1
+        )
 
         super().__init__(config=config, run_type=run_type)
 
     def _setup_loggers(self):
-        """Initialise relevant logging dataframes. Here, single dataframe."""
-        self._logger_df = pd.DataFrame()
+        """Initialise relevant logging buffers. Here, single table of columns
+        (converted to a dataframe at checkpoints)."""
+        self._logger_buffer = column_buffer.ColumnBuffer(
+            num_rows=self._expected_num_rows
+        )
+        self._logger_buffer.register_tags(
+            [
+                f"{prefix}_{i}"
+                for i in range(self._num_teachers)
+                for prefix in [
+                    constants.Constants.GENERALISATION_ERROR,
+                    constants.Constants.LOG_GENERALISATION_ERROR,
+                ]
+            ]
+        )
         self._logfile_path = os.path.join(self._checkpoint_path, self._csv_file_name)
+        # binary logs are appended as new shards.
+        self._shard_index = len(log_io.shard_paths(self._logfile_path))
 
     def write_scalar_df(self, tag: str, step: int, scalar: float) -> None:
         """Write (scalar) data to dataframe.
@@ -33,18 +63,72 @@ class UnifiedLogger(base_logger.BaseLogger):
         Raises:
             AssertionError: if tag provided is not previously defined as a column.
         """
-        self._logger_df.at[step, tag] = scalar
+        self._logger_buffer.write(tag=tag, step=step, value=scalar)
+
+    def write_array_df(self, tag: str, steps: np.ndarray, values: np.ndarray) -> None:
+        """Write a trajectory of (scalar) data to dataframe in one go.
+
+        Args:
+            tag: tag for data to be logged.
+            steps: step counts.
+            values: data to be written, one value per step.
+        """
+        self._logger_buffer.write_array(tag=tag, steps=steps, values=values)
+
+    def log_arrays(self, step: int, arrays: Dict[str, np.ndarray]) -> None:
+        """Write arrays (e.g. overlap matrices) at step as blocks of columns,
+        named per entry only on export.
 
-    def checkpoint_df(self) -> None:
-        """Merge dataframe with previously saved checkpoint.
+        Args:
+            step: current step count.
+            arrays: mapping from names to arrays to be written.
+        """
+        for name, values in arrays.items():
+            self._logger_buffer.write_block(name=name, step=step, values=values)
+
+    def log_array_trajectories(
+        self, steps: np.ndarray, arrays: Dict[str, np.ndarray]
+    ) -> None:
+        """As log_arrays, for arrays at several steps at once (with a
+        leading axis over steps)."""
+        for name, values in arrays.items():
+            self._logger_buffer.write_block_array(name=name, steps=steps, values=values)
+
+    def _checkpoint_data(self) -> Tuple[int, Dict[str, np.ndarray]]:
+        """Take logged columns (and index of shard they are written to)
+        out of buffer."""
+        columns = self._logger_buffer.to_arrays()
+        shard_index = self._shard_index
+        if self._log_format == constants.Constants.NPZ and columns:
+            self._shard_index += 1
+
+        # reset logger in memory to empty.
+        self._logger_buffer.reset()
+
+        return shard_index, columns
+
+    def _write_checkpoint(self, data: Tuple[int, Dict[str, np.ndarray]]) -> List[str]:
+        """Merge columns with previously saved checkpoint.
 
         Raises:
             AssertionError: if columns of dataframe to be appended do
             not match previous checkpoints.
         """
+        shard_index, columns = data
+        if self._log_format == constants.Constants.NPZ:
+            if not columns:
+                return []
+            return [
+                log_io.write_shard(
+                    log_path=self._logfile_path,
+                    shard_index=shard_index,
+                    columns=columns,
+                )
+            ]
+
         # only append header on first checkpoint/save.
         header = not os.path.exists(self._logfile_path)
-        self._logger_df.to_csv(self._logfile_path, mode="a", header=header, index=False)
-
-        # reset logger in memory to empty.
-        self._logger_df = pd.DataFrame()
+        pd.DataFrame(columns, columns=list(columns.keys())).to_csv(
+            self._logfile_path, mode="a", header=header, index=False
+        )
+        return [self._logfile_path]
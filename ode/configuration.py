@@ -2,11 +2,13 @@ import copy
 import itertools
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import numpy as np
 
 from ode.covariance import CovarianceMatrix
+from ode.covariance import check_positive_semi_definite
 from ode.overlaps import CrossOverlap
 from ode.overlaps import SelfOverlap
 
@@ -26,13 +28,38 @@ class StudentTwoTeacherConfiguration:
         h2: np.ndarray,
         th1: np.ndarray,
         th2: np.ndarray,
+        covariance_check_frequency: Optional[int] = None,
     ):
-        self._Q = SelfOverlap(Q, final=False)
-        self._R = CrossOverlap(R, final=False)
-        self._U = CrossOverlap(U, final=False)
-        self._T = SelfOverlap(T, final=True)
-        self._S = SelfOverlap(S, final=True)
-        self._V = SelfOverlap(V, final=True)
+        """
+        Args:
+            covariance_check_frequency: positive semi-definiteness of the full
+            covariance matrix C is checked every covariance_check_frequency
+            updates of C. None switches the check off.
+        """
+        # C = [[Q, R, U], [R^T, T, V], [U^T, V^T, S]] is allocated once;
+        # the overlaps hold views into their blocks so steps update C in place.
+        num_students = Q.shape[0]
+        num_teacher_1 = T.shape[0]
+        dimension = num_students + num_teacher_1 + S.shape[0]
+
+        students = slice(0, num_students)
+        teacher_1 = slice(num_students, num_students + num_teacher_1)
+        teacher_2 = slice(num_students + num_teacher_1, dimension)
+
+        self._C = np.empty((dimension, dimension))
+
+        self._Q = SelfOverlap(Q, final=False, buffer=self._C[students, students])
+        self._R = CrossOverlap(R, final=False, buffer=self._C[students, teacher_1])
+        self._U = CrossOverlap(U, final=False, buffer=self._C[students, teacher_2])
+        self._T = SelfOverlap(T, final=True, buffer=self._C[teacher_1, teacher_1])
+        self._S = SelfOverlap(S, final=True, buffer=self._C[teacher_2, teacher_2])
+        self._V = SelfOverlap(V, final=True, buffer=self._C[teacher_1, teacher_2])
+
+        # lower triangular blocks mirroring R, U (and V), see _mirror_blocks.
+        self._R_transpose = self._C[teacher_1, students]
+        self._U_transpose = self._C[teacher_2, students]
+        self._C[teacher_2, teacher_1] = self._V.values.T
+        self._mirror_blocks()
 
         self._h1 = h1.astype(float)
         self._h2 = h2.astype(float)
@@ -55,6 +82,9 @@ class StudentTwoTeacherConfiguration:
         # self._h1_log = {str(i): [] for i in range(len(h1))}
         # self._h2_log = {str(i): [] for i in range(len(h2))}
 
+        self._covariance_check_frequency = covariance_check_frequency
+        self._C_step_count = 0
+
         self.step_C()
 
     @property
@@ -76,7 +106,8 @@ class StudentTwoTeacherConfiguration:
             for j, index_j in enumerate(indices):
                 covariance[i][j] = self.C[index_i][index_j]
 
-        return CovarianceMatrix(covariance, indices=indices)
+        # validity is checked on the full C in step_C rather than per sub-matrix.
+        return CovarianceMatrix(covariance, indices=indices, check_determinant=False)
 
     # def _log_overlap(self, values: np.ndarray, log: Dict[str, List]):
     #     for (i, j), value in np.ndenumerate(values):
@@ -86,18 +117,50 @@ class StudentTwoTeacherConfiguration:
     #     for i, value in enumerate(values):
     #         log[str(i)].append(value)
 
+    @property
+    def state(self) -> np.ndarray:
+        """Trainable order parameters (Q, R, U, h1, h2) as one flat vector."""
+        return np.concatenate(
+            (
+                self._Q.values.flatten(),
+                self._R.values.flatten(),
+                self._U.values.flatten(),
+                self._h1,
+                self._h2,
+            )
+        )
+
+    def set_state(self, state: np.ndarray) -> None:
+        """Set trainable order parameters from flat vector (see state)."""
+        offset = 0
+        for overlap in [self._Q, self._R, self._U]:
+            size = overlap.values.size
+            overlap.set_values(state[offset : offset + size].reshape(overlap.shape))
+            offset += size
+        for head in [self._h1, self._h2]:
+            head[...] = state[offset : offset + len(head)]
+            offset += len(head)
+        self._mirror_blocks()
+
     @property
     def C(self) -> np.ndarray:
         return self._C
 
+    def _mirror_blocks(self) -> None:
+        """Upper blocks of C are the overlap values themselves, so after Q, R
+        or U change only the (small) R^T and U^T blocks need to be copied."""
+        self._R_transpose[...] = self._R.values.T
+        self._U_transpose[...] = self._U.values.T
+
     def step_C(self):
-        self._C = np.vstack(
-            (
-                np.hstack((self._Q.values, self._R.values, self._U.values)),
-                np.hstack((self._R.values.T, self._T.values, self._V.values)),
-                np.hstack((self._U.values.T, self._V.values, self._S.values)),
-            )
-        )
+        """C is kept up to date in place by the step methods; here it is
+        (periodically) validated."""
+        if (
+            self._covariance_check_frequency is not None
+            and self._C_step_count % self._covariance_check_frequency == 0
+        ):
+            check_positive_semi_definite(self._C)
+        self._C_step_count += 1
 
     @property
     def Q(self) -> SelfOverlap:
@@ -117,6 +180,7 @@ class StudentTwoTeacherConfiguration:
 
     def step_R(self, delta_R: np.ndarray) -> None:
         self._R.step(delta_R)
+        self._mirror_blocks()
         # self._log_overlap(values=self.R.values, log=self._R_log)
 
     # @property
@@ -129,6 +193,7 @@ class StudentTwoTeacherConfiguration:
 
     def step_U(self, delta_U: np.ndarray) -> None:
         self._U.step(delta_U)
+        self._mirror_blocks()
         # self._log_overlap(values=self.U.values, log=self._U_log)
 
     # @property
@@ -206,6 +271,165 @@ class StudentTwoTeacherConfiguration:
         return self._th2
 
 
+class EnsembleStudentTwoTeacherConfiguration:
+    """Configurations of an ensemble of runs stacked along a leading member
+    axis, so that one (vectorised) ODE integrates all members together.
+
+    C of all B members is held as one array of shape (B, n, n), the overlaps
+    are views into its blocks (e.g. R of shape (B, M, K)) and heads are
+    stacked to shape (B, M). State, set_state and step_C are as for
+    StudentTwoTeacherConfiguration with the extra leading axis.
+    """
+
+    def __init__(
+        self,
+        configurations: List[StudentTwoTeacherConfiguration],
+        covariance_check_frequency: Optional[int] = None,
+    ):
+        """
+        Args:
+            configurations: configuration of each member, members must
+            have equal numbers of student and teacher units.
+            covariance_check_frequency: see StudentTwoTeacherConfiguration.
+
+        Raises:
+            ValueError: if numbers of units of members differ.
+        """
+        shapes = {
+            (configuration.R.shape, configuration.U.shape)
+            for configuration in configurations
+        }
+        if len(shapes) != 1:
+            raise ValueError(
+                "Ensemble members must have equal numbers of student and "
+                f"teacher units, got (R, U) shapes {shapes}."
+            )
+
+        num_students, num_teacher_1 = configurations[0].R.shape
+
+        self._students = slice(0, num_students)
+        self._teacher_1 = slice(num_students, num_students + num_teacher_1)
+        self._teacher_2 = slice(num_students + num_teacher_1, None)
+
+        self._C = np.stack([configuration.C for configuration in configurations])
+
+        self._h1 = np.stack([configuration.h1 for configuration in configurations])
+        self._h2 = np.stack([configuration.h2 for configuration in configurations])
+
+        self._th1 = np.stack([configuration.th1 for configuration in configurations])
+        self._th2 = np.stack([configuration.th2 for configuration in configurations])
+
+        self._covariance_check_frequency = covariance_check_frequency
+        self._C_step_count = 0
+
+        self.step_C()
+
+    @property
+    def ensemble_size(self) -> int:
+        return self._C.shape[0]
+
+    @property
+    def configuration(self) -> List[network_configuration.NetworkConfiguration]:
+        """Configuration of each member (values are views into the ensemble)."""
+        return [
+            network_configuration.NetworkConfiguration(
+                student_head_weights=[self._h1[member], self._h2[member]],
+                teacher_head_weights=[self._th1[member], self._th2[member]],
+                student_self_overlap=self.Q[member],
+                teacher_self_overlaps=[self.T[member], self.S[member]],
+                teacher_cross_overlaps=[self.V[member]],
+                student_teacher_overlaps=[self.R[member], self.U[member]],
+            )
+            for member in range(self.ensemble_size)
+        ]
+
+    @property
+    def state(self) -> np.ndarray:
+        """Trainable order parameters (Q, R, U, h1, h2) of each member,
+        flattened to shape (B, P)."""
+        return np.concatenate(
+            (
+                self.Q.reshape(self.ensemble_size, -1),
+                self.R.reshape(self.ensemble_size, -1),
+                self.U.reshape(self.ensemble_size, -1),
+                self._h1,
+                self._h2,
+            ),
+            axis=1,
+        )
+
+    def set_state(self, state: np.ndarray) -> None:
+        """Set trainable order parameters from stack of flat vectors
+        (see state)."""
+        offset = 0
+        for overlap in [self.Q, self.R, self.U]:
+            size = overlap[0].size
+            overlap[...] = state[:, offset : offset + size].reshape(overlap.shape)
+            offset += size
+        for head in [self._h1, self._h2]:
+            head[...] = state[:, offset : offset + head.shape[1]]
+            offset += head.shape[1]
+        self._mirror_blocks()
+
+    @property
+    def C(self) -> np.ndarray:
+        return self._C
+
+    def _mirror_blocks(self) -> None:
+        self._C[:, self._teacher_1, self._students] = np.swapaxes(self.R, 1, 2)
+        self._C[:, self._teacher_2, self._students] = np.swapaxes(self.U, 1, 2)
+
+    def step_C(self):
+        """C is kept up to date in place by set_state; here the C of every
+        member is (periodically) validated."""
+        if (
+            self._covariance_check_frequency is not None
+            and self._C_step_count % self._covariance_check_frequency == 0
+        ):
+            check_positive_semi_definite(self._C)
+        self._C_step_count += 1
+
+    @property
+    def Q(self) -> np.ndarray:
+        return self._C[:, self._students, self._students]
+
+    @property
+    def R(self) -> np.ndarray:
+        return self._C[:, self._students, self._teacher_1]
+
+    @property
+    def U(self) -> np.ndarray:
+        return self._C[:, self._students, self._teacher_2]
+
+    @property
+    def T(self) -> np.ndarray:
+        return self._C[:, self._teacher_1, self._teacher_1]
+
+    @property
+    def S(self) -> np.ndarray:
+        return self._C[:, self._teacher_2, self._teacher_2]
+
+    @property
+    def V(self) -> np.ndarray:
+        return self._C[:, self._teacher_1, self._teacher_2]
+
+    @property
+    def h1(self) -> np.ndarray:
+        return self._h1
+
+    @property
+    def h2(self) -> np.ndarray:
+        return self._h2
+
+    @property
+    def th1(self) -> np.ndarray:
+        return self._th1
+
+    @property
+    def th2(self) -> np.ndarray:
+        return self._th2
+
+
 # class RandomStudentTwoTeacherConfiguration(StudentTwoTeacherConfiguration):
 #     def __init__(
 #         self,
@@ -4,14 +4,45 @@ from typing import Tuple
 import numpy as np
 
 
+def check_positive_semi_definite(matrix: np.ndarray, tolerance: float = 1e-8) -> None:
+    """Check a (full) covariance matrix is positive semi-definite.
+
+    All principal sub-matrices of a positive semi-definite matrix are
+    themselves positive semi-definite, so a single eigenvalue decomposition
+    of the full matrix covers every sub-matrix the integrals are evaluated on.
+
+    Args:
+        matrix: symmetric matrix to check, or stack of such matrices along
+        leading axes (e.g. of an ensemble), each of which is checked.
+        tolerance: negative eigenvalues of magnitude up to tolerance
+        (relative to the largest eigenvalue) are attributed to round-off.
+
+    Raises:
+        AssertionError: if matrix has a significantly negative eigenvalue.
+    """
+    eigenvalues = np.linalg.eigvalsh(matrix)
+    scale = np.maximum(1.0, np.max(np.abs(eigenvalues), axis=-1))
+    if np.any(eigenvalues[..., 0] < -tolerance * scale):
+        raise AssertionError(
+            "Covariance matrix must be positive semi-definite. "
+            f"The matrix {matrix} has minimum eigenvalue {np.min(eigenvalues[..., 0])}."
+        )
+
+
 class CovarianceMatrix:
 
-    def __init__(self, matrix_values: np.ndarray, indices: List[Tuple[str, int]]):
+    def __init__(
+        self,
+        matrix_values: np.ndarray,
+        indices: List[Tuple[str, int]],
+        check_determinant: bool = True,
+    ):
 
         self._matrix = matrix_values.astype(float)
         self._indices = indices
 
-        self._check_determinant_constraint()
+        if check_determinant:
+            self._check_determinant_constraint()
 
     @property
     def matrix(self):
@@ -41,3 +72,50 @@ class CovarianceMatrix:
 
     def __getitem__(self, key: Tuple[int]):
         return self._matrix[key[0]][key[1]]
+
+
+class StackedCovariance:
+    """Stack of covariance matrices indexed like a single CovarianceMatrix.
+
+    Indexing with (i, j) returns the (i, j) entry of every matrix in the stack,
+    so the integral formulas can be evaluated over all matrices in one pass.
+    Values are given either as full matrices of shape (..., n, n) or as the
+    unique entries of shape (..., n(n+1)/2), ordered as in unique_indices.
+    No positive semi-definiteness check is performed.
+    """
+
+    def __init__(self, matrix_values: np.ndarray, dimension: int):
+
+        self._values = np.asarray(matrix_values, dtype=float)
+        self._dimension = dimension
+
+        if self._values.shape[-2:] == (dimension, dimension):
+            self._unique_entry_positions = None
+        elif self._values.shape[-1] == dimension * (dimension + 1) // 2:
+            rows, columns = self.unique_indices(dimension)
+            self._unique_entry_positions = {
+                (row, column): position
+                for position, (row, column) in enumerate(zip(rows, columns))
+            }
+        else:
+            raise ValueError(
+                f"Values of shape {self._values.shape} are neither a stack of "
+                f"{dimension}x{dimension} matrices nor of their unique entries."
+            )
+
+    @staticmethod
+    def unique_indices(dimension: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and column indices of the unique (upper triangular) entries."""
+        return np.triu_indices(dimension)
+
+    @property
+    def shape(self):
+        if self._unique_entry_positions is None:
+            return self._values.shape[:-2]
+        return self._values.shape[:-1]
+
+    def __getitem__(self, key: Tuple[int]):
+        if self._unique_entry_positions is None:
+            return self._values[..., key[0], key[1]]
+        position = self._unique_entry_positions[(min(key), max(key))]
+        return self._values[..., position]
@@ -8,8 +8,14 @@ import numpy as np
 import pandas as pd
 
 from ode.configuration import StudentTwoTeacherConfiguration
+from ode.integral_cache import IntegralCache
 from ode.integrals import Integrals
+from ode.integrators import BaseIntegrator
+from ode.integrators import EulerIntegrator
 from ode.plotter import Plotter
+from ode.trajectory import TrajectoryBuffer
+from ode.trajectory import states_to_network_configuration
+from utils import network_configuration
 
 
 class StudentTeacherODE:
@@ -24,7 +30,14 @@ class StudentTeacherODE:
         train_first_layer: bool,
         train_head_layer: bool,
         frozen_feature: bool,
+        integrator: Optional[BaseIntegrator] = None,
+        expected_num_steps: int = 1000,
     ):
+        """
+        Args:
+            expected_num_steps: number of steps the error logs are
+            preallocated for (they grow if exceeded).
+        """
 
         self._configuration = overlap_configuration
         self._nonlinearity = nonlinearity
@@ -35,6 +48,11 @@ class StudentTeacherODE:
         self._train_first_layer = train_first_layer
         self._train_head_layer = train_head_layer
         self._frozen_feature = frozen_feature
+        self._integrator = integrator or EulerIntegrator()
+        self._expected_num_steps = expected_num_steps
+
+        # dt is the fixed step, or the initial step for adaptive integrators.
+        self._next_timestep = dt
 
         self._frozen = False
         self._num_switches = 0
@@ -59,51 +77,103 @@ class StudentTeacherODE:
             self._i3_fn = Integrals.sigmoid_i3
             self._i4_fn = Integrals.sigmoid_i4
 
+        # integrals evaluated on current C, shared by errors and derivatives.
+        self._integral_cache = IntegralCache()
+
         self._setup_log_data_structures()
 
     def _setup_log_data_structures(self) -> None:
 
         self._time = 0
         self._step_count = 0
-        self._error_1_log = []
-        self._error_2_log = []
+        # largest absolute order parameter derivative at start of last step.
+        self._derivative_norm = np.inf
+        # leading shape of order parameters, e.g. (B,) for an ensemble of
+        # configurations stacked along a member axis, () for one configuration.
+        self._batch_shape = self._configuration.h1.shape[:-1]
+        # errors of both teachers at the start of each step.
+        self._error_log = TrajectoryBuffer(
+            capacity=self._expected_num_steps, record_shape=(2,) + self._batch_shape
+        )
 
         self._task_switch_error_1_log = {}
         self._task_switch_error_2_log = {}
 
-        self._teacher_1_offset = self._configuration.R.shape[0]
+        self._teacher_1_offset = self._configuration.R.shape[-2]
         self._teacher_2_offset = (
-            self._configuration.R.shape[1] + self._configuration.R.shape[0]
+            self._configuration.R.shape[-1] + self._configuration.R.shape[-2]
         )
 
     @property
     def configuration(self) -> StudentTwoTeacherConfiguration:
         return self._configuration.configuration
 
+    @property
+    def state(self) -> np.ndarray:
+        return self._configuration.state
+
+    def configuration_trajectory(
+        self, states: np.ndarray
+    ) -> network_configuration.NetworkConfiguration:
+        """Configuration for a stack of states (..., P) as given by state."""
+        return states_to_network_configuration(
+            states=states,
+            num_students=self._configuration.R.shape[-2],
+            num_teacher_units=[
+                self._configuration.R.shape[-1],
+                self._configuration.U.shape[-1],
+            ],
+            teacher_head_weights=[self._configuration.th1, self._configuration.th2],
+        )
+
+    @property
+    def integral_cache(self) -> IntegralCache:
+        return self._integral_cache
+
+    def _i2(self, indices: List[int]) -> float:
+        # I2 is symmetric in its two indices.
+        return self._integral_cache.get(
+            key=tuple(sorted(indices)),
+            compute=lambda: self._i2_fn(
+                self._configuration.generate_covariance_matrix(indices)
+            ),
+        )
+
+    def _i3(self, indices: List[int]) -> float:
+        return self._integral_cache.get(
+            key=tuple(indices),
+            compute=lambda: self._i3_fn(
+                self._configuration.generate_covariance_matrix(indices)
+            ),
+        )
+
+    def _i4(self, indices: List[int]) -> float:
+        # I4 is symmetric within its first pair and within its second pair.
+        return self._integral_cache.get(
+            key=tuple(sorted(indices[:2]) + sorted(indices[2:])),
+            compute=lambda: self._i4_fn(
+                self._configuration.generate_covariance_matrix(indices)
+            ),
+        )
+
     @property
     def step_count(self):
         return self._step_count
 
     @property
-    def error_1_log(self):
-        return self._error_1_log
+    def error_1_log(self) -> np.ndarray:
+        return self._error_log.records[:, 0]
 
     @property
-    def error_2_log(self):
-        return self._error_2_log
+    def error_2_log(self) -> np.ndarray:
+        return self._error_log.records[:, 1]
 
     @property
-    def current_teacher_error(self) -> float:
-        if self._active_teacher == 0:
-            if self._error_1_log:
-                return self._error_1_log[-1]
-            else:
-                return np.nan
-        elif self._active_teacher == 1:
-            if self._error_2_log:
-                return self._error_2_log[-1]
-            else:
-                return np.nan
+    def current_teacher_error(self) -> Union[float, np.ndarray]:
+        if not len(self._error_log):
+            # (scalar for a single configuration.)
+            return np.full(self._batch_shape, np.nan)[()]
+        return self._error_log.records[-1, self._active_teacher]
 
     @property
     def dr_dt(self) -> np.ndarray:
@@ -119,19 +189,15 @@ class StudentTeacherODE:
         for (i, n), _ in np.ndenumerate(derivative):
             in_derivative = 0
             for m, head_unit in enumerate(teacher_head):
-                cov = self._configuration.generate_covariance_matrix(
+                in_derivative += head_unit * self._i3(
                     [i, self._teacher_1_offset + n, offset + m]
                 )
-                in_derivative += head_unit * self._i3_fn(cov)
             for j, head_unit in enumerate(student_head):
-                cov = self._configuration.generate_covariance_matrix(
+                in_derivative -= head_unit * self._i3(
                     [i, self._teacher_1_offset + n, j]
                 )
-                in_derivative -= head_unit * self._i3_fn(cov)
 
-            derivative[i][n] = (
-                self._dt * self._w_learning_rate * student_head[i] * in_derivative
-            )
+            derivative[i][n] = self._w_learning_rate * student_head[i] * in_derivative
 
         return derivative
 
@@ -149,19 +215,15 @@ class StudentTeacherODE:
         for (i, p), _ in np.ndenumerate(derivative):
             ip_derivative = 0
             for m, head_unit in enumerate(teacher_head):
-                cov = self._configuration.generate_covariance_matrix(
+                ip_derivative += head_unit * self._i3(
                     [i, self._teacher_2_offset + p, offset + m]
                 )
-                ip_derivative += head_unit * self._i3_fn(cov)
             for k, head_unit in enumerate(student_head):
-                cov = self._configuration.generate_covariance_matrix(
-                    [i, self._teacher_2_offset, k]
+                ip_derivative -= head_unit * self._i3(
+                    [i, self._teacher_2_offset + p, k]
                 )
-                ip_derivative -= head_unit * self._i3_fn(cov)
 
-            derivative[i][p] = (
-                self._dt * self._w_learning_rate * student_head[i] * ip_derivative
-            )
+            derivative[i][p] = self._w_learning_rate * student_head[i] * ip_derivative
 
         return derivative
 
@@ -183,45 +245,36 @@ class StudentTeacherODE:
 
                 sum_1 = 0
                 for m, head_unit in enumerate(teacher_head):
-                    cov = self._configuration.generate_covariance_matrix(
-                        [i, k, offset + m]
-                    )
-                    sum_1 += head_unit * student_head[i] * self._i3_fn(cov)
-                    cov = self._configuration.generate_covariance_matrix(
-                        [k, i, offset + m]
-                    )
-                    sum_1 += head_unit * student_head[k] * self._i3_fn(cov)
+                    sum_1 += head_unit * student_head[i] * self._i3([i, k, offset + m])
+                    sum_1 += head_unit * student_head[k] * self._i3([k, i, offset + m])
                 for j, head_unit in enumerate(student_head):
-                    cov = self._configuration.generate_covariance_matrix([i, k, j])
-                    sum_1 -= head_unit * student_head[i] * self._i3_fn(cov)
-                    cov = self._configuration.generate_covariance_matrix([k, i, j])
-                    sum_1 -= head_unit * student_head[k] * self._i3_fn(cov)
+                    sum_1 -= head_unit * student_head[i] * self._i3([i, k, j])
+                    sum_1 -= head_unit * student_head[k] * self._i3([k, i, j])
 
-                ik_derivative += self._dt * self._w_learning_rate * sum_1
+                ik_derivative += self._w_learning_rate * sum_1
 
                 sum_3 = 0
                 for j, head_unit_j in enumerate(student_head):
                     for l, head_unit_l in enumerate(student_head):
-                        cov = self._configuration.generate_covariance_matrix(
-                            [i, k, j, l]
-                        )
-                        sum_3 += head_unit_j * head_unit_l * self._i4_fn(cov)
+                        sum_3 += head_unit_j * head_unit_l * self._i4([i, k, j, l])
                 for m, head_unit_m in enumerate(teacher_head):
                     for n, head_unit_n in enumerate(teacher_head):
-                        cov = self._configuration.generate_covariance_matrix(
-                            [i, k, offset + m, offset + n]
+                        sum_3 += (
+                            head_unit_m
+                            * head_unit_n
+                            * self._i4([i, k, offset + m, offset + n])
                         )
-                        sum_3 += head_unit_m * head_unit_n * self._i4_fn(cov)
                 for m, head_unit_m in enumerate(teacher_head):
                     for j, head_unit_j in enumerate(student_head):
-                        cov = self._configuration.generate_covariance_matrix(
-                            [i, k, j, offset + m]
+                        sum_3 -= (
+                            2
+                            * head_unit_m
+                            * head_unit_j
+                            * self._i4([i, k, j, offset + m])
                         )
-                        sum_3 -= 2 * head_unit_m * head_unit_j * self._i4_fn(cov)
 
                 ik_derivative += (
-                    self._dt
-                    * self._w_learning_rate ** 2
+                    self._w_learning_rate ** 2
                     * student_head[i]
                     * student_head[k]
                     * sum_3
@@ -241,15 +294,13 @@ class StudentTeacherODE:
             for i in range(len(derivative)):
                 i_derivative = 0
                 for m, head_unit in enumerate(self._configuration.th1):
-                    cov = self._configuration.generate_covariance_matrix(
+                    i_derivative += head_unit * self._i2(
                         [i, self._teacher_1_offset + m]
                     )
-                    i_derivative += head_unit * self._i2_fn(cov)
                 for k, head_unit in enumerate(self._configuration.h1):
-                    cov = self._configuration.generate_covariance_matrix([i, k])
-                    i_derivative -= head_unit * self._i2_fn(cov)
+                    i_derivative -= head_unit * self._i2([i, k])
 
-                derivative[i] = self._dt * self._h_learning_rate * i_derivative
+                derivative[i] = self._h_learning_rate * i_derivative
 
         return derivative
 
@@ -260,15 +311,13 @@ class StudentTeacherODE:
             for i in range(len(derivative)):
                 i_derivative = 0
                 for p, head_unit in enumerate(self._configuration.th2):
-                    cov = self._configuration.generate_covariance_matrix(
+                    i_derivative += head_unit * self._i2(
                         [i, self._teacher_2_offset + p]
                     )
-                    i_derivative += head_unit * self._i2_fn(cov)
                 for k, head_unit in enumerate(self._configuration.h2):
-                    cov = self._configuration.generate_covariance_matrix([i, k])
-                    i_derivative -= head_unit * self._i2_fn(cov)
+                    i_derivative -= head_unit * self._i2([i, k])
 
-                derivative[i] = self._dt * self._h_learning_rate * i_derivative
+                derivative[i] = self._h_learning_rate * i_derivative
 
         return derivative
 
@@ -285,39 +334,23 @@ class StudentTeacherODE:
         error = 0
         for i, head_unit_i in enumerate(self._configuration.h1):
             for j, head_unit_j in enumerate(self._configuration.h1):
-                cov = self._configuration.generate_covariance_matrix([i, j])
-                error += 0.5 * head_unit_i * head_unit_j * self._i2_fn(cov)
+                error += 0.5 * head_unit_i * head_unit_j * self._i2([i, j])
         for n, teacher_head_unit_n in enumerate(self._configuration.th1):
             for m, teacher_head_unit_m in enumerate(self._configuration.th1):
-                cov = self._configuration.generate_covariance_matrix(
-                    [self._teacher_1_offset + n, self._teacher_1_offset + m]
-                )
                 error += (
-                    0.5 * teacher_head_unit_n * teacher_head_unit_m * self._i2_fn(cov)
+                    0.5
+                    * teacher_head_unit_n
+                    * teacher_head_unit_m
+                    * self._i2([self._teacher_1_offset + n, self._teacher_1_offset + m])
                 )
         for i, head_unit_i in enumerate(self._configuration.h1):
             for n, teacher_head_unit_n in enumerate(self._configuration.th1):
-                cov = self._configuration.generate_covariance_matrix(
-                    [i, self._teacher_1_offset + n]
+                error -= (
+                    head_unit_i
+                    * teacher_head_unit_n
+                    * self._i2([i, self._teacher_1_offset + n])
                 )
-                error -= head_unit_i * teacher_head_unit_n * self._i2_fn(cov)
-        if error < 0:
-            warnings.warn(
-                "Latest error calculation is negative. This could be due to the learning rate being too high, "
-                "especially close to convergence. Run 'self.error_1_log' or self.error_2_log' to view error logs to this point."
-                "Run self.make_plot(SAVE_PATH) to create plot of errors and overlaps to this point."
-            )
-            import pdb
-
-            pdb.set_trace()
-        if np.isnan(error):
-            warnings.warn(
-                "Latest error calculation is NaN. "
-                "Run 'self.error_1_log' or self.error_2_log' to view error logs to this point."
-            )
-            import pdb
-
-            pdb.set_trace()
+        self._check_error(error)
         return error
 
     @property
@@ -325,37 +358,59 @@ class StudentTeacherODE:
         error = 0
         for i, head_unit_i in enumerate(self._configuration.h2):
             for j, head_unit_j in enumerate(self._configuration.h2):
-                cov = self._configuration.generate_covariance_matrix([i, j])
-                error += 0.5 * head_unit_i * head_unit_j * self._i2_fn(cov)
+                error += 0.5 * head_unit_i * head_unit_j * self._i2([i, j])
         for p, teacher_head_unit_p in enumerate(self._configuration.th2):
             for q, teacher_head_unit_q in enumerate(self._configuration.th2):
-                cov = self._configuration.generate_covariance_matrix(
-                    [self._teacher_2_offset + p, self._teacher_2_offset + q]
-                )
                 error += (
-                    0.5 * teacher_head_unit_p * teacher_head_unit_q * self._i2_fn(cov)
+                    0.5
+                    * teacher_head_unit_p
+                    * teacher_head_unit_q
+                    * self._i2([self._teacher_2_offset + p, self._teacher_2_offset + q])
                 )
         for i, head_unit_i in enumerate(self._configuration.h2):
             for p, teacher_head_unit_p in enumerate(self._configuration.th2):
-                cov = self._configuration.generate_covariance_matrix(
-                    [i, self._teacher_2_offset + p]
+                error -= (
+                    head_unit_i
+                    * teacher_head_unit_p
+                    * self._i2([i, self._teacher_2_offset + p])
                 )
-                error -= head_unit_i * teacher_head_unit_p * self._i2_fn(cov)
-        if error < 0:
+        self._check_error(error)
+        return error
+
+    @staticmethod
+    def _check_error(error: Union[float, np.ndarray]) -> None:
+        """
+        Raises:
+            ValueError: if error of an ensemble member (error with a member
+            axis) is negative or NaN, rather than stopping a (possibly non
+            interactive) batched run in the debugger.
+        """
+        if np.ndim(error):
+            members = np.flatnonzero((error < 0) | np.isnan(error))
+            if members.size:
+                raise ValueError(
+                    "Latest error calculation is negative or NaN for ensemble "
+                    f"members {members.tolist()}. This could be due to the "
+                    "learning rate being too high, especially close to convergence."
+                )
+            return
+        if np.any(error < 0):
             warnings.warn(
                 "Latest error calculation is negative. This could be due to the learning rate being too high, "
                 "especially close to convergence. Run 'self.error_1_log' or self.error_2_log' to view error logs to this point."
                 "Run self.make_plot(SAVE_PATH) to create plot of errors and overlaps to this point."
             )
             import pdb
+
             pdb.set_trace()
-        if np.isnan(error):
+        if np.any(np.isnan(error)):
             warnings.warn(
                 "Latest error calculation is NaN. "
-                "Run 'self.error_1_log' or self.error_2_log' to view error logs to this point.")
+                "Run 'self.error_1_log' or self.error_2_log' to view error logs to this point."
+            )
             import pdb
+
             pdb.set_trace()
-        return error
 
     @property
     def next_switch_step(self):
@@ -365,38 +420,106 @@ class StudentTeacherODE:
     def time(self):
         return self._time
 
-    def step(self):
-        self._time += self._dt
-        self._step_count += 1
-
-        self._configuration.step_C()
-
-        error_1 = self.error_1
-        error_2 = self.error_2
+    @property
+    def derivative_norm(self) -> float:
+        """Largest absolute derivative of the order parameters at the start
+        of the last step."""
+        return self._derivative_norm
 
-        self._error_1_log.append(error_1)
-        self._error_2_log.append(error_2)
+    @property
+    def adaptive(self) -> bool:
+        return self._integrator.adaptive
 
+    @property
+    def derivatives(self) -> np.ndarray:
+        """Time derivatives of order parameters at current C,
+        flattened in the same layout as the configuration state."""
         if self._train_first_layer and not self._frozen:
-            q_delta = self.dq_dt
-            r_delta = self.dr_dt
-            u_delta = self.du_dt
+            q_derivative = self.dq_dt
+            r_derivative = self.dr_dt
+            u_derivative = self.du_dt
         else:
-            q_delta = np.zeros(self._configuration.Q.shape).astype(float)
-            r_delta = np.zeros(self._configuration.R.shape).astype(float)
-            u_delta = np.zeros(self._configuration.U.shape).astype(float)
+            q_derivative = np.zeros(self._configuration.Q.shape).astype(float)
+            r_derivative = np.zeros(self._configuration.R.shape).astype(float)
+            u_derivative = np.zeros(self._configuration.U.shape).astype(float)
         if self._train_head_layer:
-            h1_delta = self.dh1_dt
-            h2_delta = self.dh2_dt
+            h1_derivative = self.dh1_dt
+            h2_derivative = self.dh2_dt
         else:
-            h1_delta = np.zeros(self._configuration.h1.shape).astype(float)
-            h2_delta = np.zeros(self._configuration.h2.shape).astype(float)
-
-        self._configuration.step_Q(q_delta)
-        self._configuration.step_R(r_delta)
-        self._configuration.step_U(u_delta)
-        self._configuration.step_h1(h1_delta)
-        self._configuration.step_h2(h2_delta)
+            h1_derivative = np.zeros(self._configuration.h1.shape).astype(float)
+            h2_derivative = np.zeros(self._configuration.h2.shape).astype(float)
+
+        return np.concatenate(
+            (
+                q_derivative.reshape(self._batch_shape + (-1,)),
+                r_derivative.reshape(self._batch_shape + (-1,)),
+                u_derivative.reshape(self._batch_shape + (-1,)),
+                h1_derivative,
+                h2_derivative,
+            ),
+            axis=-1,
+        )
+
+    def _derivative_fn(self, state: np.ndarray) -> np.ndarray:
+        """Derivatives at an intermediate state of a multi-stage integrator."""
+        self._configuration.set_state(state)
+        self._integral_cache.clear()
+        return self.derivatives
+
+    def step(self, max_timestep: Optional[float] = None) -> float:
+        """Advance order parameters by one integrator step.
+
+        Args:
+            max_timestep: upper bound on the step (e.g. time to the next
+            task switch), so that steps land exactly on such times.
+
+        Returns:
+            timestep: size of step taken.
+        """
+        self._step_count += 1
+
+        self._configuration.step_C()
+        self._integral_cache.clear()
+
+        self._error_log.append(
+            step=self._time, record=np.array([self.error_1, self.error_2])
+        )
+
+        timestep = self._next_timestep
+        if max_timestep is not None:
+            timestep = min(timestep, max_timestep)
+
+        derivatives = self.derivatives
+        self._derivative_norm = np.max(np.abs(derivatives))
+
+        state, timestep, next_timestep = self._integrator.step(
+            derivative_fn=self._derivative_fn,
+            state=self._configuration.state,
+            timestep=timestep,
+            initial_derivative=derivatives,
+        )
+        self._configuration.set_state(state)
+        # C is updated in place with the state, cached integrals are stale.
+        self._integral_cache.clear()
+
+        if self._integrator.adaptive:
+            self._next_timestep = next_timestep
+
+        self._time += timestep
+
+        return timestep
+
+    def skip(self, num_steps: int, timestep: float) -> None:
+        """Advance time by num_steps steps of size timestep without changing
+        the order parameters (e.g. once they have converged), logging the
+        (constant) errors as step would."""
+        # accumulate sequentially, exactly as repeated calls to step would.
+        times = np.cumsum(np.concatenate(([self._time], np.full(num_steps, timestep))))
+        self._error_log.extend(
+            steps=times[:-1], records=np.array([self.error_1, self.error_2])
+        )
+        self._step_count += num_steps
+        self._time = times[-1]
 
     def switch_teacher(self):
         self._active_teacher = int(not self._active_teacher)
@@ -0,0 +1,55 @@
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+
+class IntegralCache:
+    """Memo of integral values keyed by the covariance indices they are
+    evaluated at.
+
+    Values are only valid for a fixed covariance matrix C, so the cache
+    must be cleared whenever C is rebuilt.
+    """
+
+    def __init__(self):
+        self._values: Dict[Tuple[int, ...], float] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Tuple[int, ...], compute: Callable[[], float]) -> float:
+        """Look up integral for key, computing and storing it if absent.
+
+        Args:
+            key: indices of covariance matrix on which integral is evaluated.
+            compute: function evaluating the integral on a cache miss.
+
+        Returns:
+            value: value of the integral.
+        """
+        try:
+            value = self._values[key]
+            self._hits += 1
+        except KeyError:
+            value = compute()
+            self._values[key] = value
+            self._misses += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop all stored values (hit/miss counters are kept)."""
+        self._values = {}
+
+    def reset_counters(self) -> None:
+        self._hits = 0
+        self._misses = 0
@@ -1,12 +1,15 @@
+from typing import Union
+
 import numpy as np
 
 from ode.covariance import CovarianceMatrix
+from ode.covariance import StackedCovariance
 
 
 class Integrals:
 
     @staticmethod
-    def _lambda_0(covariance: CovarianceMatrix):
+    def _lambda_0(covariance: Union[CovarianceMatrix, StackedCovariance]):
         l0 = Integrals._lambda_4(covariance) * covariance[2, 3] \
             - covariance[1, 2] * covariance[1, 3] * (1 + covariance[0, 0]) \
             - covariance[0, 2] * covariance[0, 3] * (1 + covariance[1, 1]) \
@@ -15,7 +18,7 @@ class Integrals:
         return l0
 
     @staticmethod
-    def _lambda_1(covariance: CovarianceMatrix):
+    def _lambda_1(covariance: Union[CovarianceMatrix, StackedCovariance]):
         l1 = Integrals._lambda_4(covariance) * (1 + covariance[2, 2]) \
             - covariance[1, 2] ** 2 * (1 + covariance[0, 0]) \
             - covariance[0, 2] ** 2 * (1 + covariance[1, 1]) \
@@ -23,7 +26,7 @@ class Integrals:
         return l1
 
     @staticmethod
-    def _lambda_2(covariance: CovarianceMatrix):
+    def _lambda_2(covariance: Union[CovarianceMatrix, StackedCovariance]):
         l2 = Integrals._lambda_4(covariance) * (1 + covariance[3, 3]) \
             - covariance[1, 3] ** 2 * (1 + covariance[0, 0]) \
             - covariance[0, 3] ** 2 * (1 + covariance[1, 1]) \
@@ -31,14 +34,14 @@ class Integrals:
         return l2
 
     @staticmethod
-    def _lambda_3(covariance: CovarianceMatrix):
+    def _lambda_3(covariance: Union[CovarianceMatrix, StackedCovariance]):
         l3 = (1 + covariance[0, 0]) \
             * (1 + covariance[2, 2]) \
             - covariance[0, 2] ** 2
         return l3
 
     @staticmethod
-    def _lambda_4(covariance: CovarianceMatrix):
+    def _lambda_4(covariance: Union[CovarianceMatrix, StackedCovariance]):
         l4 = (1 + covariance[0, 0]) \
             * (1 + covariance[1, 1]) \
             - covariance[0, 1] ** 2
@@ -90,3 +93,55 @@ class Integrals:
     @staticmethod
     def relu_i4(covariance: CovarianceMatrix):
         raise NotImplementedError
+
+    # Batched versions of the above. Each takes a stack of covariance matrices,
+    # either full, i.e. shape (M, n, n), or as unique entries, i.e. shape
+    # (M, n(n+1)/2) (see StackedCovariance), and returns the M integral values.
+    # The lambda helpers are shared since they only index and do arithmetic.
+
+    @staticmethod
+    def batch_lambda_0(covariance: np.ndarray) -> np.ndarray:
+        return Integrals._lambda_0(StackedCovariance(covariance, dimension=4))
+
+    @staticmethod
+    def batch_lambda_1(covariance: np.ndarray) -> np.ndarray:
+        return Integrals._lambda_1(StackedCovariance(covariance, dimension=4))
+
+    @staticmethod
+    def batch_lambda_2(covariance: np.ndarray) -> np.ndarray:
+        return Integrals._lambda_2(StackedCovariance(covariance, dimension=4))
+
+    @staticmethod
+    def batch_lambda_3(covariance: np.ndarray) -> np.ndarray:
+        return Integrals._lambda_3(StackedCovariance(covariance, dimension=3))
+
+    @staticmethod
+    def batch_lambda_4(covariance: np.ndarray) -> np.ndarray:
+        return Integrals._lambda_4(StackedCovariance(covariance, dimension=4))
+
+    @staticmethod
+    def batch_sigmoid_i2(covariance: np.ndarray) -> np.ndarray:
+        covariance = StackedCovariance(covariance, dimension=2)
+        nom = covariance[0, 1]
+        den = np.sqrt(1 + covariance[0, 0]) * np.sqrt(1 + covariance[1, 1])
+        return 2 * np.arcsin(nom / den) / np.pi
+
+    @staticmethod
+    def batch_relu_i2(covariance: np.ndarray) -> np.ndarray:
+        return Integrals.relu_i2(StackedCovariance(covariance, dimension=2))
+
+    @staticmethod
+    def batch_sigmoid_i3(covariance: np.ndarray) -> np.ndarray:
+        return Integrals.sigmoid_i3(StackedCovariance(covariance, dimension=3))
+
+    @staticmethod
+    def batch_relu_i3(covariance: np.ndarray) -> np.ndarray:
+        return Integrals.relu_i3(StackedCovariance(covariance, dimension=3))
+
+    @staticmethod
+    def batch_sigmoid_i4(covariance: np.ndarray) -> np.ndarray:
+        return Integrals.sigmoid_i4(StackedCovariance(covariance, dimension=4))
+
+    @staticmethod
+    def batch_relu_i4(covariance: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
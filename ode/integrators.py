@@ -0,0 +1,185 @@
+import abc
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+
+class BaseIntegrator(abc.ABC):
+    """Base class for schemes advancing the order parameters by one step.
+
+    The order parameters are handled as a single flattened state vector and
+    derivative_fn maps a state to its time derivative. States may carry
+    leading batch axes (e.g. an ensemble of ODEs), in which case all members
+    share the same step.
+    """
+
+    # whether the integrator chooses its own step size.
+    adaptive = False
+
+    @abc.abstractmethod
+    def step(
+        self,
+        derivative_fn: Callable[[np.ndarray], np.ndarray],
+        state: np.ndarray,
+        timestep: float,
+        initial_derivative: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, float, float]:
+        """Advance state by (at most) one step.
+
+        Args:
+            derivative_fn: function giving time derivative of a state.
+            state: current state.
+            timestep: size of step to attempt.
+            initial_derivative: derivative at state, if already known.
+
+        Returns:
+            new_state: state after the step.
+            timestep_taken: size of step actually taken.
+            next_timestep: size of step proposed for the next step.
+        """
+        pass
+
+
+class EulerIntegrator(BaseIntegrator):
+    """First order forward Euler."""
+
+    def step(
+        self,
+        derivative_fn: Callable[[np.ndarray], np.ndarray],
+        state: np.ndarray,
+        timestep: float,
+        initial_derivative: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, float, float]:
+        if initial_derivative is None:
+            initial_derivative = derivative_fn(state)
+        return state + timestep * initial_derivative, timestep, timestep
+
+
+class RK4Integrator(BaseIntegrator):
+    """Classical fourth order Runge-Kutta."""
+
+    def step(
+        self,
+        derivative_fn: Callable[[np.ndarray], np.ndarray],
+        state: np.ndarray,
+        timestep: float,
+        initial_derivative: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, float, float]:
+        k1 = initial_derivative
+        if k1 is None:
+            k1 = derivative_fn(state)
+        k2 = derivative_fn(state + 0.5 * timestep * k1)
+        k3 = derivative_fn(state + 0.5 * timestep * k2)
+        k4 = derivative_fn(state + timestep * k3)
+        new_state = state + timestep * (k1 + 2 * k2 + 2 * k3 + k4) / 6
+        return new_state, timestep, timestep
+
+
+class DormandPrinceIntegrator(BaseIntegrator):
+    """Embedded Runge-Kutta 5(4) scheme of Dormand & Prince with adaptive steps.
+
+    Steps are accepted when the difference between the fifth and fourth order
+    solutions is within the given tolerances (component-wise,
+    atol + rtol * |state|, measured in the RMS norm, for every batch member);
+    otherwise the step is retried with a smaller timestep.
+    """
+
+    adaptive = True
+
+    _C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+    _A = [
+        np.array([]),
+        np.array([1 / 5]),
+        np.array([3 / 40, 9 / 40]),
+        np.array([44 / 45, -56 / 15, 32 / 9]),
+        np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+        np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+        np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+    ]
+    # fifth order weights (equal to last row of A, i.e. first same as last).
+    _B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+    # difference between fifth and fourth order weights.
+    _E = np.array(
+        [
+            71 / 57600,
+            0,
+            -71 / 16695,
+            71 / 1920,
+            -17253 / 339200,
+            22 / 525,
+            -1 / 40,
+        ]
+    )
+
+    _SAFETY = 0.9
+    _MIN_FACTOR = 0.2
+    _MAX_FACTOR = 10.0
+
+    def __init__(
+        self,
+        relative_tolerance: float,
+        absolute_tolerance: float,
+        min_timestep: float = 1e-12,
+    ):
+        self._relative_tolerance = relative_tolerance
+        self._absolute_tolerance = absolute_tolerance
+        self._min_timestep = min_timestep
+
+        self._num_rejected_steps = 0
+
+    @property
+    def num_rejected_steps(self) -> int:
+        return self._num_rejected_steps
+
+    def step(
+        self,
+        derivative_fn: Callable[[np.ndarray], np.ndarray],
+        state: np.ndarray,
+        timestep: float,
+        initial_derivative: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, float, float]:
+        k1 = initial_derivative
+        if k1 is None:
+            k1 = derivative_fn(state)
+
+        while True:
+            stages = [k1]
+            for a in self._A[1:]:
+                stage_state = state + timestep * np.tensordot(
+                    a, stages[: len(a)], axes=1
+                )
+                stages.append(derivative_fn(stage_state))
+
+            stages = np.array(stages)
+            # last stage is evaluated at the fifth order solution.
+            new_state = state + timestep * np.tensordot(self._B, stages, axes=1)
+            error_estimate = timestep * np.tensordot(self._E, stages, axes=1)
+
+            scale = self._absolute_tolerance + self._relative_tolerance * np.maximum(
+                np.abs(state), np.abs(new_state)
+            )
+            # worst member of a batch determines the step.
+            error_norm = np.max(
+                np.sqrt(np.mean((error_estimate / scale) ** 2, axis=-1))
+            )
+
+            if error_norm == 0:
+                factor = self._MAX_FACTOR
+            else:
+                factor = min(
+                    self._MAX_FACTOR,
+                    max(self._MIN_FACTOR, self._SAFETY * error_norm ** (-1 / 5)),
+                )
+
+            if error_norm <= 1:
+                return new_state, timestep, timestep * factor
+
+            self._num_rejected_steps += 1
+            timestep = timestep * min(1.0, factor)
+            if timestep < self._min_timestep:
+                raise RuntimeError(
+                    f"Step size {timestep} fell below minimum {self._min_timestep} "
+                    "without meeting error tolerances."
+                )
@@ -0,0 +1,349 @@
+from typing import Optional
+from typing import Union
+
+import numba
+import numpy as np
+
+from ode.configuration import StudentTwoTeacherConfiguration
+from ode.integrators import BaseIntegrator
+from ode.vectorised_dynamics import VectorisedStudentTeacherODE
+
+# nopython kernels evaluating the integrals directly on entries of C
+# (same formulas as ode.integrals). Kernels are cached on disk (in
+# __pycache__, or NUMBA_CACHE_DIR if set) so compilation happens once.
+
+SIGMOID = 0
+RELU = 1
+
+
+@numba.njit(cache=True)
+def _i2(C, nonlinearity, a, b):
+    c00 = C[a, a]
+    c01 = C[a, b]
+    c11 = C[b, b]
+    if nonlinearity == SIGMOID:
+        return 2 * np.arcsin(c01 / (np.sqrt(1 + c00) * np.sqrt(1 + c11))) / np.pi
+    root = np.sqrt(c00 * c11 - c01 ** 2)
+    return (2 * root + np.pi * c01 + 2 * c01 * np.arctan(c01 / root)) / (8 * np.pi)
+
+
+@numba.njit(cache=True)
+def _i3(C, nonlinearity, a, b, c):
+    c00 = C[a, a]
+    c01 = C[a, b]
+    c02 = C[a, c]
+    c12 = C[b, c]
+    c22 = C[c, c]
+    if nonlinearity == SIGMOID:
+        lambda_3 = (1 + c00) * (1 + c22) - c02 ** 2
+        nom = 2 * (c12 * (1 + c00) - c01 * c02)
+        return nom / (np.pi * np.sqrt(lambda_3) * (1 + c00))
+    return (
+        c01 * np.sqrt(c00 * c22 - c02 ** 2) / (2 * np.pi * c00)
+        + c12 * np.arcsin(c02 / np.sqrt(c00 * c22)) / (2 * np.pi)
+        + 0.25 * c12
+    )
+
+
+@numba.njit(cache=True)
+def _i4(C, nonlinearity, a, b, c, d):
+    if nonlinearity != SIGMOID:
+        raise NotImplementedError("I4 is only implemented for sigmoidal activations.")
+    c00 = C[a, a]
+    c01 = C[a, b]
+    c02 = C[a, c]
+    c03 = C[a, d]
+    c11 = C[b, b]
+    c12 = C[b, c]
+    c13 = C[b, d]
+    c22 = C[c, c]
+    c23 = C[c, d]
+    c33 = C[d, d]
+    lambda_4 = (1 + c00) * (1 + c11) - c01 ** 2
+    lambda_0 = (
+        lambda_4 * c23
+        - c12 * c13 * (1 + c00)
+        - c02 * c03 * (1 + c11)
+        + c01 * c02 * c13
+        + c01 * c03 * c12
+    )
+    lambda_1 = (
+        lambda_4 * (1 + c22)
+        - c12 ** 2 * (1 + c00)
+        - c02 ** 2 * (1 + c11)
+        + 2 * c01 * c02 * c12
+    )
+    lambda_2 = (
+        lambda_4 * (1 + c33)
+        - c13 ** 2 * (1 + c00)
+        - c03 ** 2 * (1 + c11)
+        + 2 * c01 * c03 * c13
+    )
+    nom = 4 * np.arcsin(lambda_0 / np.sqrt(lambda_1 * lambda_2))
+    return nom / (np.pi ** 2 * np.sqrt(lambda_4))
+
+
+@numba.njit(cache=True)
+def _signed_units(teacher_head, student_head, offset):
+    """Units entering the error signal of a teacher and their head weights
+    (positive for teacher, negative for student)."""
+    num_teacher_units = len(teacher_head)
+    num_units = num_teacher_units + len(student_head)
+    units = np.empty(num_units, dtype=np.int64)
+    weights = np.empty(num_units)
+    for u in range(num_teacher_units):
+        units[u] = offset + u
+        weights[u] = teacher_head[u]
+    for u in range(len(student_head)):
+        units[num_teacher_units + u] = u
+        weights[num_teacher_units + u] = -student_head[u]
+    return units, weights
+
+
+@numba.njit(cache=True)
+def student_teacher_derivative(
+    C,
+    nonlinearity,
+    teacher_head,
+    student_head,
+    offset,
+    teacher_offset,
+    num_teacher_units,
+    w_learning_rate,
+):
+    units, weights = _signed_units(teacher_head, student_head, offset)
+    derivative = np.zeros((len(student_head), num_teacher_units))
+    for i in range(len(student_head)):
+        for n in range(num_teacher_units):
+            in_derivative = 0.0
+            for u in range(len(units)):
+                in_derivative += weights[u] * _i3(
+                    C, nonlinearity, i, teacher_offset + n, units[u]
+                )
+            derivative[i, n] = w_learning_rate * student_head[i] * in_derivative
+    return derivative
+
+
+@numba.njit(cache=True)
+def student_self_derivative(
+    C, nonlinearity, teacher_head, student_head, offset, w_learning_rate
+):
+    units, weights = _signed_units(teacher_head, student_head, offset)
+    num_students = len(student_head)
+    derivative = np.zeros((num_students, num_students))
+    for i in range(num_students):
+        for k in range(i, num_students):
+            sum_1 = 0.0
+            for u in range(len(units)):
+                sum_1 += weights[u] * (
+                    student_head[i] * _i3(C, nonlinearity, i, k, units[u])
+                    + student_head[k] * _i3(C, nonlinearity, k, i, units[u])
+                )
+            sum_3 = 0.0
+            for c in range(len(units)):
+                for d in range(len(units)):
+                    sum_3 += (
+                        weights[c]
+                        * weights[d]
+                        * _i4(C, nonlinearity, i, k, units[c], units[d])
+                    )
+            ik_derivative = (
+                w_learning_rate * sum_1
+                + w_learning_rate ** 2 * student_head[i] * student_head[k] * sum_3
+            )
+            derivative[i, k] = ik_derivative
+            derivative[k, i] = ik_derivative
+    return derivative
+
+
+@numba.njit(cache=True)
+def head_derivative(
+    C, nonlinearity, teacher_head, student_head, offset, h_learning_rate
+):
+    units, weights = _signed_units(teacher_head, student_head, offset)
+    derivative = np.zeros(len(student_head))
+    for i in range(len(student_head)):
+        i_derivative = 0.0
+        for u in range(len(units)):
+            i_derivative += weights[u] * _i2(C, nonlinearity, i, units[u])
+        derivative[i] = h_learning_rate * i_derivative
+    return derivative
+
+
+@numba.njit(cache=True)
+def error(C, nonlinearity, teacher_head, student_head, offset):
+    units, weights = _signed_units(teacher_head, student_head, offset)
+    value = 0.0
+    for c in range(len(units)):
+        for d in range(len(units)):
+            value += weights[c] * weights[d] * _i2(C, nonlinearity, units[c], units[d])
+    return 0.5 * value
+
+
+@numba.njit(cache=True)
+def derivatives(
+    C,
+    nonlinearity,
+    teacher_head,
+    student_head,
+    offset,
+    active_teacher,
+    num_teacher_1_units,
+    num_teacher_2_units,
+    w_learning_rate,
+    h_learning_rate,
+    train_first_layer,
+    train_head_layer,
+):
+    """All order parameter derivatives, flattened in the configuration state
+    layout (Q, R, U, h1, h2)."""
+    num_students = len(student_head)
+    teacher_1_offset = num_students
+    teacher_2_offset = num_students + num_teacher_1_units
+
+    q_size = num_students * num_students
+    r_size = num_students * num_teacher_1_units
+    u_size = num_students * num_teacher_2_units
+
+    derivative = np.zeros(q_size + r_size + u_size + 2 * num_students)
+
+    if train_first_layer:
+        derivative[:q_size] = student_self_derivative(
+            C, nonlinearity, teacher_head, student_head, offset, w_learning_rate
+        ).flatten()
+        derivative[q_size : q_size + r_size] = student_teacher_derivative(
+            C,
+            nonlinearity,
+            teacher_head,
+            student_head,
+            offset,
+            teacher_1_offset,
+            num_teacher_1_units,
+            w_learning_rate,
+        ).flatten()
+        derivative[
+            q_size + r_size : q_size + r_size + u_size
+        ] = student_teacher_derivative(
+            C,
+            nonlinearity,
+            teacher_head,
+            student_head,
+            offset,
+            teacher_2_offset,
+            num_teacher_2_units,
+            w_learning_rate,
+        ).flatten()
+    if train_head_layer:
+        head_start = q_size + r_size + u_size + active_teacher * num_students
+        derivative[head_start : head_start + num_students] = head_derivative(
+            C, nonlinearity, teacher_head, student_head, offset, h_learning_rate
+        )
+    return derivative
+
+
+class JITStudentTeacherODE(VectorisedStudentTeacherODE):
+    """Student-teacher ODE with order parameter derivatives evaluated by
+    nopython (numba) kernels operating directly on C and the head vectors."""
+
+    def __init__(
+        self,
+        overlap_configuration: StudentTwoTeacherConfiguration,
+        nonlinearity: str,
+        w_learning_rate: float,
+        h_learning_rate: float,
+        dt: Union[float, int],
+        soft_committee: bool,
+        train_first_layer: bool,
+        train_head_layer: bool,
+        frozen_feature: bool,
+        integrator: Optional[BaseIntegrator] = None,
+        expected_num_steps: int = 1000,
+    ):
+        super().__init__(
+            overlap_configuration=overlap_configuration,
+            nonlinearity=nonlinearity,
+            w_learning_rate=w_learning_rate,
+            h_learning_rate=h_learning_rate,
+            dt=dt,
+            soft_committee=soft_committee,
+            train_first_layer=train_first_layer,
+            train_head_layer=train_head_layer,
+            frozen_feature=frozen_feature,
+            integrator=integrator,
+            expected_num_steps=expected_num_steps,
+        )
+
+        if nonlinearity == "relu":
+            self._nonlinearity_code = RELU
+        elif (nonlinearity == "sigmoid") or (nonlinearity == "scaled_erf"):
+            self._nonlinearity_code = SIGMOID
+
+    @property
+    def derivatives(self) -> np.ndarray:
+        teacher_head, student_head, offset = self._active_heads()
+        return derivatives(
+            self._configuration.C,
+            self._nonlinearity_code,
+            teacher_head,
+            student_head,
+            offset,
+            self._active_teacher,
+            self._num_teacher_1_units,
+            self._num_teacher_2_units,
+            self._w_learning_rate,
+            self._h_learning_rate,
+            self._train_first_layer and not self._frozen,
+            self._train_head_layer,
+        )
+
+    def _student_teacher_derivative(
+        self, teacher_offset: int, num_teacher_units: int
+    ) -> np.ndarray:
+        teacher_head, student_head, offset = self._active_heads()
+        return student_teacher_derivative(
+            self._configuration.C,
+            self._nonlinearity_code,
+            teacher_head,
+            student_head,
+            offset,
+            teacher_offset,
+            num_teacher_units,
+            self._w_learning_rate,
+        )
+
+    @property
+    def dq_dt(self) -> np.ndarray:
+        teacher_head, student_head, offset = self._active_heads()
+        return student_self_derivative(
+            self._configuration.C,
+            self._nonlinearity_code,
+            teacher_head,
+            student_head,
+            offset,
+            self._w_learning_rate,
+        )
+
+    def _head_derivative(
+        self, teacher_head: np.ndarray, student_head: np.ndarray, offset: int
+    ) -> np.ndarray:
+        return head_derivative(
+            self._configuration.C,
+            self._nonlinearity_code,
+            teacher_head,
+            student_head,
+            offset,
+            self._h_learning_rate,
+        )
+
+    def _error(
+        self, teacher_head: np.ndarray, student_head: np.ndarray, offset: int
+    ) -> float:
+        value = error(
+            self._configuration.C,
+            self._nonlinearity_code,
+            teacher_head,
+            student_head,
+            offset,
+        )
+        self._check_error(value)
+        return value
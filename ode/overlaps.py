@@ -1,6 +1,7 @@
 from abc import ABC
 from abc import abstractmethod
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import numpy as np
@@ -8,8 +9,22 @@ import numpy as np
 
 class Overlap(ABC):
 
-    def __init__(self, initial_values: np.ndarray, final: bool):
-        self._overlap_values = initial_values.astype(float)
+    def __init__(
+        self,
+        initial_values: np.ndarray,
+        final: bool,
+        buffer: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            buffer: optional (float) array to hold the overlap values, e.g. a
+            view into a block of a larger matrix. Steps then update it in place.
+        """
+        if buffer is None:
+            self._overlap_values = initial_values.astype(float)
+        else:
+            buffer[...] = initial_values
+            self._overlap_values = buffer
         self._timestep = 0
         self._final = final
 
@@ -33,6 +48,13 @@ class Overlap(ABC):
         self._timestep += 1
         self._overlap_values += value_change
 
+    def set_values(self, values: np.ndarray) -> None:
+
+        if self._final:
+            raise TypeError("Cannot set values of a final Overlap.")
+
+        self._overlap_values[...] = values
+
     @property
     def shape(self):
         return self._overlap_values.shape
@@ -40,8 +62,13 @@ class Overlap(ABC):
 
 class SelfOverlap(Overlap):
 
-    def __init__(self, initial_values: np.ndarray, final: bool):
-        super().__init__(initial_values, final)
+    def __init__(
+        self,
+        initial_values: np.ndarray,
+        final: bool,
+        buffer: Optional[np.ndarray] = None,
+    ):
+        super().__init__(initial_values, final, buffer)
 
     def __getitem__(self, indices: List[Tuple[str, int]]):
         # symmetric
@@ -50,8 +77,13 @@ class SelfOverlap(Overlap):
 
 class CrossOverlap(Overlap):
 
-    def __init__(self, initial_values: np.ndarray, final: bool):
-        super().__init__(initial_values, final)
+    def __init__(
+        self,
+        initial_values: np.ndarray,
+        final: bool,
+        buffer: Optional[np.ndarray] = None,
+    ):
+        super().__init__(initial_values, final, buffer)
 
     def __getitem__(self, indices: List[Tuple[str, int]]):
         # student index first
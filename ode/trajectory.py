@@ -0,0 +1,121 @@
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+from utils import network_configuration
+
+
+class TrajectoryBuffer:
+    """Preallocated, contiguous store for a trajectory of fixed shape records.
+
+    Records are appended row by row into a NumPy array of shape
+    (capacity, *record_shape), together with the step each was recorded at.
+    Should the capacity be exceeded (e.g. adaptive steps) the buffer doubles.
+    """
+
+    def __init__(self, capacity: int, record_shape: Tuple[int, ...] = ()):
+        self._steps = np.empty(max(1, capacity))
+        self._records = np.empty((max(1, capacity),) + tuple(record_shape))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._steps)
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Steps of stored records (view)."""
+        return self._steps[: self._size]
+
+    @property
+    def records(self) -> np.ndarray:
+        """Stored records, shape (len, *record_shape) (view)."""
+        return self._records[: self._size]
+
+    def append(self, step: float, record: np.ndarray) -> None:
+        if self._size == self.capacity:
+            self._grow()
+        self._steps[self._size] = step
+        self._records[self._size] = record
+        self._size += 1
+
+    def extend(self, steps: np.ndarray, records: np.ndarray) -> None:
+        """Append several records at once (records broadcast against steps,
+        e.g. a single record repeated)."""
+        num_records = len(steps)
+        while self._size + num_records > self.capacity:
+            self._grow()
+        self._steps[self._size : self._size + num_records] = steps
+        self._records[self._size : self._size + num_records] = records
+        self._size += num_records
+
+    def _grow(self) -> None:
+        steps = np.empty(2 * self.capacity)
+        records = np.empty((2 * self.capacity,) + self._records.shape[1:])
+        steps[: self._size] = self._steps[: self._size]
+        records[: self._size] = self._records[: self._size]
+        self._steps = steps
+        self._records = records
+
+    def clear(self) -> None:
+        """Empty the buffer, keeping its memory."""
+        self._size = 0
+
+
+def states_to_network_configuration(
+    states: np.ndarray,
+    num_students: int,
+    num_teacher_units: List[int],
+    teacher_head_weights: List[np.ndarray],
+) -> network_configuration.NetworkConfiguration:
+    """Unflatten a stack of order parameter states into a network configuration
+    whose arrays carry the same leading (e.g. time) axes.
+
+    Args:
+        states: array of shape (..., P) in the configuration state layout
+        (Q, R, U, h1, h2 flattened).
+        num_students: number of student hidden units.
+        num_teacher_units: number of hidden units of each teacher.
+        teacher_head_weights: (constant) head weights of each teacher,
+        broadcast along the leading axes.
+
+    Returns:
+        network_config: configuration of stacked arrays (teacher self and
+        cross overlaps are not part of the state and are left empty).
+    """
+    leading_shape = states.shape[:-1]
+    student_self_overlap = states[..., : num_students ** 2].reshape(
+        leading_shape + (num_students, num_students)
+    )
+    offset = num_students ** 2
+
+    student_teacher_overlaps = []
+    for num_units in num_teacher_units:
+        size = num_students * num_units
+        student_teacher_overlaps.append(
+            states[..., offset : offset + size].reshape(
+                leading_shape + (num_students, num_units)
+            )
+        )
+        offset += size
+
+    student_head_weights = []
+    for _ in num_teacher_units:
+        student_head_weights.append(states[..., offset : offset + num_students])
+        offset += num_students
+
+    return network_configuration.NetworkConfiguration(
+        student_head_weights=student_head_weights,
+        teacher_head_weights=[
+            np.broadcast_to(head, leading_shape + head.shape[-1:])
+            for head in teacher_head_weights
+        ],
+        student_self_overlap=student_self_overlap,
+        teacher_self_overlaps=[],
+        teacher_cross_overlaps=[],
+        student_teacher_overlaps=student_teacher_overlaps,
+    )
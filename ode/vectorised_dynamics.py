@@ -0,0 +1,274 @@
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from ode.configuration import EnsembleStudentTwoTeacherConfiguration
+from ode.configuration import StudentTwoTeacherConfiguration
+from ode.covariance import StackedCovariance
+from ode.dynamics import StudentTeacherODE
+from ode.integrals import Integrals
+from ode.integrators import BaseIntegrator
+
+
+class VectorisedStudentTeacherODE(StudentTeacherODE):
+    """Student-teacher ODE with vectorised order parameter derivatives.
+
+    Rather than building one covariance matrix per term, all 2-, 3- and 4-index
+    sub-covariances required for a derivative are gathered from C with a single
+    fancy indexing operation and the batched integrals are evaluated over the stack.
+    Results agree with StudentTeacherODE up to floating point error.
+
+    The configuration may also be an ensemble of configurations stacked along a
+    leading member axis (EnsembleStudentTwoTeacherConfiguration), in which case
+    sub-covariances, heads, derivatives and errors all carry that axis and every
+    member is integrated in the same step.
+    """
+
+    def __init__(
+        self,
+        overlap_configuration: Union[
+            StudentTwoTeacherConfiguration, EnsembleStudentTwoTeacherConfiguration
+        ],
+        nonlinearity: str,
+        w_learning_rate: float,
+        h_learning_rate: float,
+        dt: Union[float, int],
+        soft_committee: bool,
+        train_first_layer: bool,
+        train_head_layer: bool,
+        frozen_feature: bool,
+        integrator: Optional[BaseIntegrator] = None,
+        expected_num_steps: int = 1000,
+    ):
+        super().__init__(
+            overlap_configuration=overlap_configuration,
+            nonlinearity=nonlinearity,
+            w_learning_rate=w_learning_rate,
+            h_learning_rate=h_learning_rate,
+            dt=dt,
+            soft_committee=soft_committee,
+            train_first_layer=train_first_layer,
+            train_head_layer=train_head_layer,
+            frozen_feature=frozen_feature,
+            integrator=integrator,
+            expected_num_steps=expected_num_steps,
+        )
+
+        if nonlinearity == "relu":
+            self._batch_i2_fn = Integrals.batch_relu_i2
+            self._batch_i3_fn = Integrals.batch_relu_i3
+            self._batch_i4_fn = Integrals.batch_relu_i4
+        elif (nonlinearity == "sigmoid") or (nonlinearity == "scaled_erf"):
+            self._batch_i2_fn = Integrals.batch_sigmoid_i2
+            self._batch_i3_fn = Integrals.batch_sigmoid_i3
+            self._batch_i4_fn = Integrals.batch_sigmoid_i4
+
+        self._num_students = self._configuration.R.shape[-2]
+        self._num_teacher_1_units = self._configuration.R.shape[-1]
+        self._num_teacher_2_units = self._configuration.U.shape[-1]
+
+    def _sub_covariances(self, indices: np.ndarray) -> np.ndarray:
+        """Gather stacked sub-covariance matrices from C.
+
+        Args:
+            indices: integer array of shape (..., n) where the last axis
+            holds the unit indices of one sub-covariance.
+
+        Returns:
+            covariances: unique entries of the sub-covariances, array of
+            shape (*batch, ..., n(n+1)/2) with the leading (member) axes of C.
+        """
+        rows, columns = StackedCovariance.unique_indices(indices.shape[-1])
+        return self._configuration.C[..., indices[..., rows], indices[..., columns]]
+
+    @staticmethod
+    def _weighted_sum(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Sum over last axis of values weighted by unit weights, for an
+        ensemble the weights of each member (leading axis) are broadcast over
+        the intermediate axes of its values."""
+        if weights.ndim == 1:
+            return values @ weights
+        return np.einsum("b...c,bc->b...", values, weights)
+
+    @staticmethod
+    def _index_grid(*index_sets: np.ndarray) -> np.ndarray:
+        """Cartesian product of index sets, stacked along the last axis."""
+        return np.stack(np.meshgrid(*index_sets, indexing="ij"), axis=-1)
+
+    def _active_heads(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        if self._active_teacher == 0:
+            return (
+                self._configuration.th1,
+                self._configuration.h1,
+                self._teacher_1_offset,
+            )
+        else:
+            return (
+                self._configuration.th2,
+                self._configuration.h2,
+                self._teacher_2_offset,
+            )
+
+    def _signed_units(
+        self, teacher_head: np.ndarray, student_head: np.ndarray, offset: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Units entering the error signal of a teacher together with
+        their head weights (positive for teacher, negative for student)."""
+        indices = np.concatenate(
+            (
+                offset + np.arange(teacher_head.shape[-1]),
+                np.arange(student_head.shape[-1]),
+            )
+        )
+        weights = np.concatenate((teacher_head, -student_head), axis=-1)
+        return indices, weights
+
+    def _student_teacher_derivative(
+        self, teacher_offset: int, num_teacher_units: int
+    ) -> np.ndarray:
+        teacher_head, student_head, offset = self._active_heads()
+        unit_indices, unit_weights = self._signed_units(
+            teacher_head=teacher_head, student_head=student_head, offset=offset
+        )
+        indices = self._index_grid(
+            np.arange(self._num_students),
+            teacher_offset + np.arange(num_teacher_units),
+            unit_indices,
+        )
+        i3 = self._batch_i3_fn(self._sub_covariances(indices))
+        return (
+            self._w_learning_rate
+            * student_head[..., None]
+            * self._weighted_sum(i3, unit_weights)
+        )
+
+    @property
+    def dr_dt(self) -> np.ndarray:
+        return self._student_teacher_derivative(
+            teacher_offset=self._teacher_1_offset,
+            num_teacher_units=self._num_teacher_1_units,
+        )
+
+    @property
+    def du_dt(self) -> np.ndarray:
+        return self._student_teacher_derivative(
+            teacher_offset=self._teacher_2_offset,
+            num_teacher_units=self._num_teacher_2_units,
+        )
+
+    @property
+    def dq_dt(self) -> np.ndarray:
+        teacher_head, student_head, offset = self._active_heads()
+        unit_indices, unit_weights = self._signed_units(
+            teacher_head=teacher_head, student_head=student_head, offset=offset
+        )
+        num_units = len(unit_indices)
+
+        # derivative is symmetric, only compute upper triangle.
+        i_upper, k_upper = np.triu_indices(self._num_students)
+        num_pairs = len(i_upper)
+
+        ik = np.stack((i_upper, k_upper), axis=-1)
+
+        ikc = np.concatenate(
+            (
+                np.broadcast_to(ik[:, None, :], (num_pairs, num_units, 2)),
+                np.broadcast_to(unit_indices[None, :, None], (num_pairs, num_units, 1)),
+            ),
+            axis=-1,
+        )
+        kic = ikc[..., [1, 0, 2]]
+        i3_ik = self._batch_i3_fn(self._sub_covariances(ikc))
+        i3_ki = self._batch_i3_fn(self._sub_covariances(kic))
+
+        sum_1 = student_head[..., i_upper] * self._weighted_sum(
+            i3_ik, unit_weights
+        ) + student_head[..., k_upper] * self._weighted_sum(i3_ki, unit_weights)
+
+        cd = self._index_grid(unit_indices, unit_indices)
+        ikcd = np.concatenate(
+            (
+                np.broadcast_to(
+                    ik[:, None, None, :], (num_pairs, num_units, num_units, 2)
+                ),
+                np.broadcast_to(cd[None], (num_pairs, num_units, num_units, 2)),
+            ),
+            axis=-1,
+        )
+        i4 = self._batch_i4_fn(self._sub_covariances(ikcd))
+        sum_3 = np.einsum("...pcd,...c,...d->...p", i4, unit_weights, unit_weights)
+
+        upper_derivative = self._w_learning_rate * sum_1 + (
+            self._w_learning_rate ** 2
+            * student_head[..., i_upper]
+            * student_head[..., k_upper]
+            * sum_3
+        )
+
+        derivative = np.zeros(self._configuration.Q.shape).astype(float)
+        derivative[..., i_upper, k_upper] = upper_derivative
+        derivative[..., k_upper, i_upper] = upper_derivative
+
+        return derivative
+
+    def _head_derivative(
+        self, teacher_head: np.ndarray, student_head: np.ndarray, offset: int
+    ) -> np.ndarray:
+        unit_indices, unit_weights = self._signed_units(
+            teacher_head=teacher_head, student_head=student_head, offset=offset
+        )
+        indices = self._index_grid(np.arange(self._num_students), unit_indices)
+        i2 = self._batch_i2_fn(self._sub_covariances(indices))
+        return self._h_learning_rate * self._weighted_sum(i2, unit_weights)
+
+    @property
+    def dh1_dt(self):
+        if self._train_head_layer and self._active_teacher == 0:
+            return self._head_derivative(
+                teacher_head=self._configuration.th1,
+                student_head=self._configuration.h1,
+                offset=self._teacher_1_offset,
+            )
+        return np.zeros(self._configuration.h1.shape).astype(float)
+
+    @property
+    def dh2_dt(self):
+        if self._train_head_layer and self._active_teacher == 1:
+            return self._head_derivative(
+                teacher_head=self._configuration.th2,
+                student_head=self._configuration.h2,
+                offset=self._teacher_2_offset,
+            )
+        return np.zeros(self._configuration.h2.shape).astype(float)
+
+    def _error(
+        self, teacher_head: np.ndarray, student_head: np.ndarray, offset: int
+    ) -> Union[float, np.ndarray]:
+        unit_indices, unit_weights = self._signed_units(
+            teacher_head=teacher_head, student_head=student_head, offset=offset
+        )
+        indices = self._index_grid(unit_indices, unit_indices)
+        i2 = self._batch_i2_fn(self._sub_covariances(indices))
+        error = (0.5 * unit_weights[..., None, :] @ i2 @ unit_weights[..., None])[
+            ..., 0, 0
+        ]
+        self._check_error(error)
+        return error
+
+    @property
+    def error_1(self):
+        return self._error(
+            teacher_head=self._configuration.th1,
+            student_head=self._configuration.h1,
+            offset=self._teacher_1_offset,
+        )
+
+    @property
+    def error_2(self):
+        return self._error(
+            teacher_head=self._configuration.th2,
+            student_head=self._configuration.h2,
+            offset=self._teacher_2_offset,
+        )
@@ -1,11 +1,13 @@
 import os
 from typing import Dict
 from typing import List
+from typing import Union
 
 import numpy as np
 import pandas as pd
 
 import constants
+from loggers import log_io
 from plotters import base_plotter
 
 
@@ -13,7 +15,8 @@ class SplitPlotter(base_plotter.BasePlotter):
     """Class for plotting generalisation errors, overlaps etc.
 
     For case when logging is done in 'split' fashion
-    i.e. one dataframe per logging tag.
+    i.e. one dataframe per logging tag (csv file per tag or
+    single binary store of datasets per tag).
     """
 
     def __init__(
@@ -52,19 +55,28 @@ class SplitPlotter(base_plotter.BasePlotter):
         datasets without loading into memory--this is done piecewise later.
         """
         if self._ode_data_folder is not None:
-            self._ode_log_file_paths = {
-                path.split(f"_{constants.Constants.ODE_CSV}")[0]: os.path.join(
-                    self._ode_data_folder, path
-                )
-                for path in os.listdir(self._ode_data_folder)
-            }
+            self._ode_log_file_paths = self._get_log_file_paths(
+                data_folder=self._ode_data_folder,
+                csv_file_name=constants.Constants.ODE_CSV,
+            )
         if self._network_data_folder is not None:
-            self._network_log_file_paths = {
-                path.split(f"_{constants.Constants.NETWORK_CSV}")[0]: os.path.join(
-                    self._network_data_folder, path
-                )
-                for path in os.listdir(self._network_data_folder)
-            }
+            self._network_log_file_paths = self._get_log_file_paths(
+                data_folder=self._network_data_folder,
+                csv_file_name=constants.Constants.NETWORK_CSV,
+            )
+
+    def _get_log_file_paths(
+        self, data_folder: str, csv_file_name: str
+    ) -> Union[log_io.StoreReader, Dict[str, str]]:
+        """Mapping from tags to their logs, either datasets of single
+        (binary) store or paths to csv file per tag."""
+        store_path = log_io.store_path(os.path.join(data_folder, csv_file_name))
+        if os.path.exists(store_path):
+            return log_io.StoreReader(store_path)
+        return {
+            path.split(f"_{csv_file_name}")[0]: os.path.join(data_folder, path)
+            for path in os.listdir(data_folder)
+        }
 
     def make_plots(self) -> None:
         """Orchestration method for plotting ode logs, network logs, or both."""
@@ -93,6 +105,15 @@ class SplitPlotter(base_plotter.BasePlotter):
                 ),
             )
 
+        if self._ode_data_folder is not None and isinstance(
+            self._ode_log_file_paths, log_io.StoreReader
+        ):
+            self._ode_log_file_paths.close()
+        if self._network_data_folder is not None and isinstance(
+            self._network_log_file_paths, log_io.StoreReader
+        ):
+            self._network_log_file_paths.close()
+
     def _make_plot(
         self,
         data: Dict[str, List[str]],
@@ -157,6 +178,8 @@ class SplitPlotter(base_plotter.BasePlotter):
             file_path_map = self._ode_log_file_paths
         elif data_type == constants.Constants.SIM:
             file_path_map = self._network_log_file_paths
+        if isinstance(file_path_map, log_io.StoreReader):
+            return {key: file_path_map[key] for key in keys}
         data = {
             key: pd.read_csv(file_path_map[key]).to_numpy().flatten() for key in keys
         }
@@ -1,10 +1,8 @@
 import os
 from typing import Dict
-from typing import Union
-
-import pandas as pd
 
 import constants
+from loggers import log_io
 from plotters import base_plotter
 
 
@@ -46,14 +44,15 @@ class UnifiedPlotter(base_plotter.BasePlotter):
         )
 
     def _setup_data(self):
-        """Setup data from relevant dataframes.
+        """Setup data from relevant logs (csv or binary).
 
-        Here, in the unified case, full dataset is loaded into memory.
+        Here, in the unified case, columns are loaded into memory
+        as they are first plotted.
         """
         if self._ode_logger_path is not None:
-            self._ode_logger = pd.read_csv(self._ode_logger_path)
+            self._ode_logger = log_io.LogReader(self._ode_logger_path)
         if self._network_logger_path is not None:
-            self._network_logger = pd.read_csv(self._network_logger_path)
+            self._network_logger = log_io.LogReader(self._network_logger_path)
 
     def make_plots(self) -> None:
         """Orchestration method for plotting ode logs, network logs, or both."""
@@ -80,16 +79,21 @@ class UnifiedPlotter(base_plotter.BasePlotter):
                 ),
             )
 
+        if self._ode_logger_path is not None:
+            self._ode_logger.close()
+        if self._network_logger_path is not None:
+            self._network_logger.close()
+
     def _make_plot(
         self,
-        data: Dict[str, Union[pd.DataFrame, Dict[str, pd.DataFrame]]],
+        data: Dict[str, log_io.LogReader],
         save_path: str,
     ) -> None:
         """Make plots for a set of results (e.g. ode or network or both).
 
         Args:
             data: mapping from type of results (ode, network etc.)
-            to dataframes with results.
+            to logs with results.
             save_path: path to save the plot.
         """
         # can use arbitrary dataframe since columns will be the same.
@@ -1,6 +1,6 @@
 import abc
 import constants
-import copy
+from typing import Dict
 
 import torch
 from torch import nn
@@ -12,17 +12,57 @@ class BaseRegulariser(abc.ABC):
         self._importance = importance
         self._device = device 
 
-        self._previous_task_parameters = []
+        # penalty of all previous tasks, sum_t omega_t * (theta - theta_t) ** 2,
+        # over flattened shared (non-head) parameters theta, is kept expanded as
+        # (A * theta ** 2 - 2 * B * theta).sum() + C with running sums
+        # A = sum_t omega_t, B = sum_t omega_t * theta_t and
+        # C = sum_t (omega_t * theta_t ** 2).sum() (exact for signed
+        # importances e.g. of SI, where A may vanish).
+        self._penalised_parameters = None
+        self._importance_sum = None
+        self._weighted_anchor_sum = None
+        self._penalty_offset = 0
 
-    def _store_previous_task_parameters(self):
-        """Store the parameters from before task switches.
+    def _consolidate_previous_task(
+        self, student: nn.Module, parameter_importances: Dict[str, torch.Tensor]
+    ):
+        """Add penalty of task before switch, quadratic in the deviation from
+        current parameters weighted by their importances, to running
+        combination of penalties of previous tasks.
         """
-        previous_task_paramters = {}
-        for n, param in copy.deepcopy(self._params).items():
-            previous_task_paramters[n] = param.data.to(self._device)
+        named_parameters = [
+            (n, param) for n, param in student.named_parameters() if "heads" not in n
+        ]
+        self._penalised_parameters = [param for _, param in named_parameters]
+
+        with torch.no_grad():
+            anchor = torch.cat(
+                [param.flatten() for _, param in named_parameters]
+            ).to(self._device)
+            parameter_importance = torch.cat(
+                [parameter_importances[n].flatten() for n, _ in named_parameters]
+            ).to(self._device)
+
+            weighted_anchor = parameter_importance * anchor
+            if self._importance_sum is None:
+                self._importance_sum = parameter_importance
+                self._weighted_anchor_sum = weighted_anchor
+            else:
+                self._importance_sum = self._importance_sum + parameter_importance
+                self._weighted_anchor_sum = self._weighted_anchor_sum + weighted_anchor
+            self._penalty_offset += (weighted_anchor * anchor).sum().item()
 
-        self._previous_task_parameters.append(previous_task_paramters)
-        
+    def penalty(self, student: nn.Module):
+        parameters = torch.cat(
+            [param.flatten() for param in self._penalised_parameters]
+        )
+        return self._importance * (
+            (
+                (self._importance_sum * parameters - 2 * self._weighted_anchor_sum)
+                * parameters
+            ).sum()
+            + self._penalty_offset
+        )
 
     @abc.abstractmethod
     def compute_first_task_importance(
@@ -36,6 +76,3 @@ class BaseRegulariser(abc.ABC):
     ):
         pass 
 
-    @abc.abstractmethod
-    def penalty(self, student: nn.Module):
-        pass
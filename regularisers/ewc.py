@@ -2,7 +2,7 @@
 
 https://github.com/moskomule/ewc.pytorch
 """
-import copy
+from typing import Optional
 
 import constants
 
@@ -14,6 +14,26 @@ from regularisers import base_regulariser
 
 
 class EWC(base_regulariser.BaseRegulariser):
+    def __init__(
+        self,
+        importance: float,
+        device: str,
+        fisher_samples: Optional[int] = None,
+        chunk_size: int = 1024,
+    ):
+        """
+        Args:
+            importance: strength of penalty.
+            device: device of networks.
+            fisher_samples: number of test samples over which Fisher
+            information is averaged (all if None).
+            chunk_size: number of samples per batched forward / backward
+            pass in Fisher computation.
+        """
+        super().__init__(importance=importance, device=device)
+        self._fisher_samples = fisher_samples
+        self._chunk_size = chunk_size
+
     def compute_first_task_importance(
         self,
         student: nn.Module,
@@ -35,48 +55,80 @@ class EWC(base_regulariser.BaseRegulariser):
         self._params = {
             n: p for n, p in self._student.named_parameters() if "heads" not in n
         }
-        self._store_previous_task_parameters()
 
         self._precision_matrices = self._diag_fisher()
+        self._consolidate_previous_task(
+            student=self._student, parameter_importances=self._precision_matrices
+        )
 
     def _diag_fisher(self):
+        """Diagonal of empirical Fisher information, i.e. squared gradients of
+        the loss on each sample averaged over samples.
+
+        Per sample gradients of each (linear) hidden layer are outer products
+        of the gradient wrt the layer output and the layer input, so squared
+        gradients summed over a chunk of samples are a product of the squared
+        output gradients and squared inputs of the chunk.
+        """
         # to compute Fischer on previous task, switch heads
         self._student.signal_task_boundary(new_task=self._previous_teacher_index)
 
-        precision_matrices = {}
+        precision_matrices = {
+            n: torch.zeros_like(param.data) for n, param in self._params.items()
+        }
+        parameter_names = {id(param): n for n, param in self._params.items()}
 
-        for n, param in copy.deepcopy(self._params).items():
-            param.data.zero_()
-            precision_matrices[n] = param.data.to(self._device)
+        layers = [
+            layer
+            for layer in self._student.layers
+            if any(param.requires_grad for param in layer.parameters())
+        ]
+        layer_inputs = []
+        layer_outputs = []
 
-        self._student.eval()
-        for data in self._dataset:
-            self._student.zero_grad()
-            output = self._student(data)
-            label = self._previous_teacher(data)
-            loss = self._loss_function(output, label)
-            loss.backward()
+        def store_input_output(module, input, output):
+            layer_inputs.append(input[0])
+            layer_outputs.append(output)
+
+        hooks = [layer.register_forward_hook(store_input_output) for layer in layers]
+
+        dataset = self._dataset[: self._fisher_samples]
 
-            for n, param in self._student.named_parameters():
-                if "heads" not in n:
-                    precision_matrices[n].data += param.grad.data ** 2 / len(
-                        self._dataset
-                    )
+        self._student.eval()
+        for data in dataset.split(self._chunk_size):
+            # no trained hidden weights, Fisher information is zero.
+            if not layers:
+                break
+            layer_inputs.clear()
+            layer_outputs.clear()
 
-        precision_matrices = {n: param for n, param in precision_matrices.items()}
+            output = self._student(data)
+            with torch.no_grad():
+                label = self._previous_teacher(data)
+            # loss is averaged over samples, scale to sum of per sample losses.
+            loss = len(data) * self._loss_function(output, label)
+            output_gradients = torch.autograd.grad(loss, layer_outputs)
+
+            with torch.no_grad():
+                for layer, layer_input, output_gradient in zip(
+                    layers, layer_inputs, output_gradients
+                ):
+                    squared_output_gradient = output_gradient ** 2
+                    if layer.weight.requires_grad:
+                        precision_matrices[
+                            parameter_names[id(layer.weight)]
+                        ] += squared_output_gradient.t().mm(layer_input ** 2) / len(
+                            dataset
+                        )
+                    if layer.bias is not None and layer.bias.requires_grad:
+                        precision_matrices[
+                            parameter_names[id(layer.bias)]
+                        ] += squared_output_gradient.sum(0) / len(dataset)
+
+        for hook in hooks:
+            hook.remove()
 
         # return back head
         self._student.signal_task_boundary(new_task=self._new_teacher_index)
 
         return precision_matrices
-
-    def penalty(self, student: nn.Module):
-        loss = 0
-        for n, param in student.named_parameters():
-            if "heads" not in n:
-                _loss = (
-                    self._precision_matrices[n]
-                    * (param - self._previous_task_parameters[0][n]) ** 2
-                )
-                loss += _loss.sum()
-        return self._importance * loss
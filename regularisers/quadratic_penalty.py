@@ -19,13 +19,9 @@ class QuadraticPenalty(base_regulariser.BaseRegulariser):
         loss_function,
         data_module,
     ):
-        self._params = {n: p for n, p in student.named_parameters() if "heads" not in n}
-        self._store_previous_task_parameters()
-
-    def penalty(self, student: nn.Module):
-        loss = 0
-        for n, param in student.named_parameters():
-            if "heads" not in n:
-                _loss = (param - self._previous_task_parameters[0][n]) ** 2
-                loss += _loss.sum()
-        return self._importance * loss
\ No newline at end of file
+        self._consolidate_previous_task(
+            student=student,
+            parameter_importances={
+                n: torch.ones_like(p) for n, p in student.named_parameters()
+            },
+        )
@@ -0,0 +1,324 @@
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import torch
+import torch.nn as nn
+from constants import Constants
+from curricula import threshold_curriculum
+from run import network_runner
+from utils import network_configuration
+
+
+class BatchedNetworkRunner:
+    """Runner training the networks of several runs (e.g. seeds) together.
+
+    Weights of all students (and teachers) are stacked along a leading member
+    axis and each training step is a single batched forward / backward pass.
+    The students of the member runners hold views into the stacked weights,
+    so testing, logging and checkpointing are done by each member exactly as
+    in a single run. Each member draws its data from its own random number
+    stream, so it sees the same data as it would in an independent run.
+
+    Members must share network shapes, activation, forward scalings,
+    training length, logging frequencies and curriculum (e.g. seeds of one
+    configuration); learning rates may differ.
+    """
+
+    def __init__(self, runners: List[network_runner.NetworkRunner]) -> None:
+        self._runners = runners
+        self._check_runners()
+
+        self._student_weights = self._stack(
+            [runner._student.layers[0].weight for runner in runners]
+        )
+        self._student_head_weights = self._stack(
+            [
+                torch.stack([head.weight.data for head in runner._student.heads])
+                for runner in runners
+            ]
+        )
+        for member, runner in enumerate(runners):
+            runner._student.layers[0].weight.data = self._student_weights.detach()[
+                member
+            ]
+            for head_index, head in enumerate(runner._student.heads):
+                head.weight.data = self._student_head_weights.detach()[
+                    member, head_index
+                ]
+
+        teachers = [runner._teachers.teachers for runner in runners]
+        self._teacher_weights = [
+            torch.stack([teacher.layers[0].weight.data for teacher in member_teachers])
+            for member_teachers in zip(*teachers)
+        ]
+        self._teacher_head_weights = [
+            torch.stack([teacher.head.weight.data for teacher in member_teachers])
+            for member_teachers in zip(*teachers)
+        ]
+
+        self._learning_rates = [self._get_learning_rates(runner) for runner in runners]
+        self._learning_rate_tensors = {}
+        # parameter objects of each member (requires_grad marks frozen weights).
+        self._member_parameters = [
+            (
+                runner._student.layers[0].weight,
+                [head.weight for head in runner._student.heads],
+            )
+            for runner in runners
+        ]
+
+        # state of (cpu) random number generator of each member.
+        self._rng_states = []
+
+    @staticmethod
+    def _stack(tensors: List[torch.Tensor]) -> torch.Tensor:
+        with torch.no_grad():
+            stacked = torch.stack([tensor.data for tensor in tensors])
+        return stacked.requires_grad_()
+
+    def _check_runners(self) -> None:
+        """Establish members can be trained together.
+
+        Raises:
+            ValueError: if a member's configuration is not supported or
+            differs from the others where it must be shared.
+        """
+        lead = self._runners[0]
+        lead_student = lead._student
+
+        for runner in self._runners:
+            student = runner._student
+            if (
+                len(student.layers) != 1
+                or student.layers[0].bias is not None
+                or student._apply_nonlinearity_on_output
+                or student._classification_output
+                or not isinstance(runner._loss_function, nn.MSELoss)
+            ):
+                raise ValueError(
+                    "Batched training requires regression networks with a single "
+                    "hidden layer, no biases and linear outputs."
+                )
+            if runner._consolidation_module is not None:
+                raise ValueError("Batched training does not support consolidation.")
+            if isinstance(runner._curriculum, threshold_curriculum.ThresholdCurriculum):
+                raise ValueError(
+                    "Batched training requires switches independent of the error."
+                )
+            for group in runner._optimiser.param_groups:
+                if group["momentum"] or group["weight_decay"]:
+                    raise ValueError("Batched training requires plain SGD.")
+
+            if (
+                type(student) != type(lead_student)
+                or student.layers[0].weight.shape != lead_student.layers[0].weight.shape
+                or len(student.heads) != len(lead_student.heads)
+                or student._nonlinearity != lead_student._nonlinearity
+                or student._forward_hidden_scaling
+                != lead_student._forward_hidden_scaling
+                or student._forward_scaling != lead_student._forward_scaling
+                or type(runner._curriculum) != type(lead._curriculum)
+                or runner._total_training_steps != lead._total_training_steps
+                or runner._test_frequency != lead._test_frequency
+                or runner._checkpoint_frequency != lead._checkpoint_frequency
+                or runner._log_frequency != lead._log_frequency
+                or runner._device != lead._device
+            ):
+                raise ValueError(
+                    "Members of batched training must share network shapes, "
+                    "activation, scalings, curriculum and training schedule."
+                )
+            for teacher, lead_teacher in zip(
+                runner._teachers.teachers, lead._teachers.teachers
+            ):
+                if (
+                    teacher.layers[0].weight.shape
+                    != lead_teacher.layers[0].weight.shape
+                    or teacher.layers[0].bias is not None
+                    or teacher._forward_hidden_scaling
+                    != lead_teacher._forward_hidden_scaling
+                    or teacher._forward_scaling != lead_teacher._forward_scaling
+                ):
+                    raise ValueError(
+                        "Members of batched training must share teacher shapes "
+                        "and scalings, teachers may not have biases."
+                    )
+
+    @staticmethod
+    def _get_learning_rates(
+        runner: network_runner.NetworkRunner,
+    ) -> Tuple[Optional[float], List[Optional[float]]]:
+        """Learning rates of hidden and head weights in the member's
+        optimiser (None where weights are not trained)."""
+        learning_rates = {
+            id(parameter): group["lr"]
+            for group in runner._optimiser.param_groups
+            for parameter in group["params"]
+        }
+        hidden_learning_rate = learning_rates.get(id(runner._student.layers[0].weight))
+        head_learning_rates = [
+            learning_rates.get(id(head.weight)) for head in runner._student.heads
+        ]
+        return hidden_learning_rate, head_learning_rates
+
+    def get_network_configurations(
+        self,
+    ) -> List[network_configuration.NetworkConfiguration]:
+        """Macroscopic configuration of the networks of each member."""
+        return [runner.get_network_configuration() for runner in self._runners]
+
+    def train(self):
+        """Training orchestration."""
+        for runner in self._runners:
+            runner._setup_training()
+            self._rng_states.append(torch.get_rng_state())
+
+        lead = self._runners[0]
+
+        while lead._total_step_count < lead._total_training_steps:
+            teacher_indices = [next(runner._curriculum) for runner in self._runners]
+            if len(set(teacher_indices)) != 1:
+                raise ValueError("Members of batched training must share curriculum.")
+
+            self._train_on_teacher(teacher_index=teacher_indices[0])
+
+        for runner in self._runners:
+            runner._logger.checkpoint_df()
+            runner._logger.close()
+
+    def _train_on_teacher(self, teacher_index: int):
+        """One phase of training (wrt one teacher) of all members."""
+        for runner in self._runners:
+            runner._start_task(teacher_index=teacher_index)
+        task_step_count = 0
+
+        lead = self._runners[0]
+
+        while lead._total_step_count < lead._total_training_steps:
+
+            latest_task_generalisation_errors = [
+                runner._pre_step(
+                    teacher_index=teacher_index, task_step_count=task_step_count
+                )
+                for runner in self._runners
+            ]
+
+            self._training_step(teacher_index=teacher_index)
+
+            task_step_count += 1
+
+            to_switch = [
+                runner._curriculum.to_switch(task_step=task_step_count, error=error)
+                for runner, error in zip(
+                    self._runners, latest_task_generalisation_errors
+                )
+            ]
+            if all(to_switch):
+                break
+            if any(to_switch):
+                raise ValueError("Members of batched training must share curriculum.")
+
+    def _get_batch(self, member: int) -> torch.Tensor:
+        """Training batch of a member, drawn from its own random stream."""
+        torch.set_rng_state(self._rng_states[member])
+        batch = self._runners[member]._data_module.get_batch()
+        self._rng_states[member] = torch.get_rng_state()
+        return batch[Constants.X]
+
+    def _member_learning_rates(
+        self, head_index: int
+    ) -> Tuple[Optional[torch.Tensor], Optional[torch.Tensor]]:
+        """Per member learning rates of the current step (zero where weights
+        are frozen), or None if no member trains the weights."""
+        hidden_learning_rates = []
+        head_learning_rates = []
+        for (hidden_weight, head_weights), (
+            hidden_learning_rate,
+            member_head_learning_rates,
+        ) in zip(self._member_parameters, self._learning_rates):
+            head_learning_rate = member_head_learning_rates[head_index]
+            hidden_learning_rates.append(
+                hidden_learning_rate
+                if hidden_learning_rate is not None and hidden_weight.requires_grad
+                else 0.0
+            )
+            head_learning_rates.append(
+                head_learning_rate
+                if head_learning_rate is not None
+                and head_weights[head_index].requires_grad
+                else 0.0
+            )
+
+        # learning rates only change with task switches / feature freezing.
+        key = (tuple(hidden_learning_rates), tuple(head_learning_rates))
+        if key not in self._learning_rate_tensors:
+            device = self._student_weights.device
+            self._learning_rate_tensors[key] = (
+                torch.tensor(hidden_learning_rates, device=device).view(-1, 1, 1)
+                if any(hidden_learning_rates)
+                else None,
+                torch.tensor(head_learning_rates, device=device).view(-1, 1, 1)
+                if any(head_learning_rates)
+                else None,
+            )
+        return self._learning_rate_tensors[key]
+
+    def _training_step(self, teacher_index: int):
+        """Perform single training step of all members."""
+        for runner in self._runners:
+            runner._save_weights()
+
+        lead_student = self._runners[0]._student
+        lead_teacher = self._runners[0]._teachers.teachers[teacher_index]
+        nonlinear_function = lead_student._nonlinear_function
+        head_index = lead_student.current_teacher
+
+        batch_input = torch.stack(
+            [self._get_batch(member) for member in range(len(self._runners))]
+        ).to(self._student_weights.device)
+
+        # forward through student networks
+        hidden = nonlinear_function(
+            lead_student._forward_hidden_scaling
+            * torch.bmm(batch_input, self._student_weights.transpose(1, 2))
+        )
+        student_output = lead_student._forward_scaling * torch.bmm(
+            hidden, self._student_head_weights[:, head_index].transpose(1, 2)
+        )
+
+        # forward through teacher networks
+        with torch.no_grad():
+            teacher_hidden = nonlinear_function(
+                lead_teacher._forward_hidden_scaling
+                * torch.bmm(
+                    batch_input, self._teacher_weights[teacher_index].transpose(1, 2)
+                )
+            )
+            teacher_output = lead_teacher._forward_scaling * torch.bmm(
+                teacher_hidden,
+                self._teacher_head_weights[teacher_index].transpose(1, 2),
+            )
+
+        # members are independent, gradient of summed losses is per member.
+        loss = 0.5 * ((student_output - teacher_output) ** 2).mean(dim=(1, 2))
+        loss.sum().backward()
+
+        hidden_learning_rates, head_learning_rates = self._member_learning_rates(
+            head_index=head_index
+        )
+
+        with torch.no_grad():
+            if hidden_learning_rates is not None:
+                self._student_weights -= (
+                    hidden_learning_rates * self._student_weights.grad
+                )
+            if head_learning_rates is not None:
+                self._student_head_weights[:, head_index] -= (
+                    head_learning_rates * self._student_head_weights.grad[:, head_index]
+                )
+        self._student_weights.grad = None
+        self._student_head_weights.grad = None
+
+        for runner in self._runners:
+            runner._end_step()
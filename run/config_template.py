@@ -5,13 +5,36 @@ from config_manager import config_template
 
 class ConfigTemplate:
 
+    _dormand_prince_template = config_template.Template(
+        fields=[
+            config_field.Field(
+                name=constants.Constants.RELATIVE_TOLERANCE,
+                types=[float, int],
+                requirements=[lambda x: x > 0],
+            ),
+            config_field.Field(
+                name=constants.Constants.ABSOLUTE_TOLERANCE,
+                types=[float, int],
+                requirements=[lambda x: x > 0],
+            ),
+        ],
+        level=[constants.Constants.ODE_RUN, constants.Constants.DORMAND_PRINCE],
+        dependent_variables=[constants.Constants.INTEGRATOR],
+        dependent_variables_required_values=[[constants.Constants.DORMAND_PRINCE]],
+    )
+
     _ode_template = config_template.Template(
         fields=[
             config_field.Field(
                 name=constants.Constants.IMPLEMENTATION,
                 types=[str],
                 requirements=[
-                    lambda x: x in [constants.Constants.CPP, constants.Constants.PYTHON]
+                    lambda x: x
+                    in [
+                        constants.Constants.CPP,
+                        constants.Constants.PYTHON,
+                        constants.Constants.JIT,
+                    ]
                 ],
             ),
             config_field.Field(
@@ -19,7 +42,38 @@ class ConfigTemplate:
                 types=[float, int],
                 requirements=[lambda x: x > 0],
             ),
+            config_field.Field(
+                name=constants.Constants.ENGINE,
+                types=[str],
+                requirements=[
+                    lambda x: x
+                    in [constants.Constants.LOOP, constants.Constants.VECTORISED]
+                ],
+            ),
+            config_field.Field(
+                name=constants.Constants.COVARIANCE_CHECK_FREQUENCY,
+                types=[int, type(None)],
+                requirements=[lambda x: x is None or x > 0],
+            ),
+            config_field.Field(
+                name=constants.Constants.INTEGRATOR,
+                types=[str],
+                requirements=[
+                    lambda x: x
+                    in [
+                        constants.Constants.EULER,
+                        constants.Constants.RK4,
+                        constants.Constants.DORMAND_PRINCE,
+                    ]
+                ],
+            ),
+            config_field.Field(
+                name=constants.Constants.STEADY_STATE_TOLERANCE,
+                types=[float, int, type(None)],
+                requirements=[lambda x: x is None or x > 0],
+            ),
         ],
+        nested_templates=[_dormand_prince_template],
         level=[constants.Constants.ODE_RUN],
         dependent_variables=[constants.Constants.ODE_SIMULATION],
         dependent_variables_required_values=[[True]],
@@ -90,6 +144,11 @@ class ConfigTemplate:
                 name=constants.Constants.IMPORTANCE,
                 types=[int, float],
             ),
+            config_field.Field(
+                name=constants.Constants.FISHER_SAMPLES,
+                types=[int, type(None)],
+                requirements=[lambda x: x is None or x > 0],
+            ),
         ],
         level=[constants.Constants.TRAINING, constants.Constants.CONSOLIDATION],
     )
@@ -139,6 +198,14 @@ class ConfigTemplate:
                 types=[list],
                 requirements=[lambda x: all(isinstance(y, int) for y in x)],
             ),
+            config_field.Field(
+                name=constants.Constants.GRADIENT_ENGINE,
+                types=[str],
+                requirements=[
+                    lambda x: x
+                    in [constants.Constants.AUTOGRAD, constants.Constants.MANUAL]
+                ],
+            ),
         ],
         nested_templates=[_consolidation_template],
         level=[constants.Constants.TRAINING],
@@ -160,6 +227,15 @@ class ConfigTemplate:
                 types=[str, int],
                 requirements=[lambda x: x == constants.Constants.INF or x > 0],
             ),
+            config_field.Field(
+                name=constants.Constants.INPUT_POOL_SIZE,
+                types=[int, type(None)],
+                requirements=[lambda x: x is None or x > 0],
+            ),
+            config_field.Field(
+                name=constants.Constants.BACKGROUND_REFILL,
+                types=[bool],
+            ),
         ],
         level=[constants.Constants.DATA, constants.Constants.IID_GAUSSIAN],
         dependent_variables=[constants.Constants.INPUT_SOURCE],
@@ -235,6 +311,18 @@ class ConfigTemplate:
                 types=[bool],
             ),
             config_field.Field(name=constants.Constants.SPLIT_LOGGING, types=[bool]),
+            config_field.Field(
+                name=constants.Constants.LOG_FORMAT,
+                types=[str],
+                requirements=[
+                    lambda x: x in [constants.Constants.CSV, constants.Constants.NPZ]
+                ],
+            ),
+            config_field.Field(
+                name=constants.Constants.CHECKPOINT_QUEUE_SIZE,
+                types=[int, type(None)],
+                requirements=[lambda x: x is None or x > 0],
+            ),
         ],
         level=[constants.Constants.LOGGING],
     )
@@ -251,6 +339,14 @@ class ConfigTemplate:
                 types=[int],
                 requirements=[lambda x: x > 0],
             ),
+            config_field.Field(
+                name=constants.Constants.ERROR_EVALUATION,
+                types=[str],
+                requirements=[
+                    lambda x: x
+                    in [constants.Constants.MONTE_CARLO, constants.Constants.ANALYTIC]
+                ],
+            ),
             config_field.Field(
                 name=constants.Constants.OVERLAP_FREQUENCY,
                 types=[int],
@@ -42,9 +42,16 @@ class CoreRunner:
                 config=self._config, network_configuration=network_configuration
             )
 
+    @property
+    def network_simulation_runner(self) -> network_runner.NetworkRunner:
+        return self._network_simulation_runner
+
     def run(self):
         if self._config.network_simulation:
             self._network_simulation_runner.train()
+        self.run_ode()
+
+    def run_ode(self):
         if self._config.ode_simulation:
             self._ode_simulation_runner.run()
 
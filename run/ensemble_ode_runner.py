@@ -0,0 +1,166 @@
+from typing import List
+
+import numpy as np
+
+import constants
+from curricula import base_curriculum
+from curricula import threshold_curriculum
+from loggers import ensemble_logger
+from ode import configuration
+from ode import vectorised_dynamics
+from run import ode_runner
+from run import student_teacher_config
+from utils import network_configuration
+
+
+class EnsembleODERunner(ode_runner.ODERunner):
+    """Runner integrating the ODEs of several runs (e.g. points of a sweep
+    over teacher-teacher overlaps) together in one batched loop.
+
+    Each member has its own configuration, and logs are written to its
+    checkpoint path exactly as for a single ODERunner. Integration settings
+    (timestep, integrator, curriculum, learning rate etc.) must be shared and
+    are taken from the first configuration. Members are integrated with the
+    vectorised engine over configurations stacked along a member axis.
+    """
+
+    # configuration fields that must be equal for all members.
+    _SHARED_FIELDS = [
+        constants.Constants.IMPLEMENTATION,
+        constants.Constants.ENGINE,
+        constants.Constants.INTEGRATOR,
+        constants.Constants.RELATIVE_TOLERANCE,
+        constants.Constants.ABSOLUTE_TOLERANCE,
+        constants.Constants.TIMESTEP,
+        constants.Constants.LEARNING_RATE,
+        constants.Constants.STUDENT_NONLINEARITY,
+        constants.Constants.SOFT_COMMITTEE,
+        constants.Constants.TRAIN_HIDDEN_LAYERS,
+        constants.Constants.TRAIN_HEAD_LAYER,
+        constants.Constants.INPUT_DIMENSION,
+        constants.Constants.TOTAL_TRAINING_STEPS,
+        constants.Constants.NUM_TEACHERS,
+        constants.Constants.STOPPING_CONDITION,
+        constants.Constants.FIXED_PERIOD,
+        constants.Constants.SWITCH_STEPS,
+        constants.Constants.INTERLEAVE_PERIOD,
+        constants.Constants.INTERLEAVE_DURATION,
+        constants.Constants.CHECKPOINT_FREQUENCY,
+        constants.Constants.LOG_FREQUENCY,
+        constants.Constants.LOG_OVERLAPS,
+        constants.Constants.COVARIANCE_CHECK_FREQUENCY,
+        constants.Constants.STEADY_STATE_TOLERANCE,
+    ]
+
+    def __init__(
+        self,
+        configs: List[student_teacher_config.StudentTeacherConfiguration],
+        network_configurations: List[network_configuration.NetworkConfiguration],
+    ) -> None:
+        self._configs = configs
+        self._network_configurations = network_configurations
+
+        self._check_configs()
+
+        super().__init__(
+            config=configs[0], network_configuration=network_configurations
+        )
+
+    def _check_configs(self) -> None:
+        """Establish members can be integrated together.
+
+        Raises:
+            ValueError: if a member's configuration differs from the first
+            where it must be shared.
+        """
+        lead = self._configs[0]
+        for config in self._configs[1:]:
+            differing = [
+                field
+                for field in self._SHARED_FIELDS
+                if getattr(config, field) != getattr(lead, field)
+            ]
+            if differing:
+                raise ValueError(
+                    "Members of ensemble ODE runs must share integration settings, "
+                    f"curriculum and training schedule; {differing} differ."
+                )
+
+    def _setup_logger(
+        self,
+        config: student_teacher_config.StudentTeacherConfiguration,
+        network_configuration: List[network_configuration.NetworkConfiguration],
+    ) -> ensemble_logger.EnsembleLogger:
+        loggers = [
+            super(EnsembleODERunner, self)._setup_logger(
+                config=member_config, network_configuration=member_network_config
+            )
+            for member_config, member_network_config in zip(
+                self._configs, network_configuration
+            )
+        ]
+        return ensemble_logger.EnsembleLogger(loggers=loggers)
+
+    def _setup_curriculum(self) -> base_curriculum.BaseCurriculum:
+        """Initialise curriculum object shared by all members.
+
+        Raises:
+            ValueError: if curriculum depends on the error of a member.
+        """
+        curriculum = super()._setup_curriculum()
+        if isinstance(curriculum, threshold_curriculum.ThresholdCurriculum):
+            raise ValueError(
+                "Ensemble ODE runs require switches independent of the error, "
+                f"stopping condition {self._config.stopping_condition} is not "
+                "supported."
+            )
+        return curriculum
+
+    def run(self):
+        if self._config.implementation == constants.Constants.PYTHON:
+            self._run_python_ode(
+                network_configuration=self._network_configurations,
+                timestep=self._config.timestep,
+            )
+        else:
+            raise ValueError(
+                f"Implementation type {self._config.implementation} not supported "
+                "for ensemble runs."
+            )
+        self._logger.close()
+
+    def _run_python_ode(
+        self,
+        network_configuration: List[network_configuration.NetworkConfiguration],
+        timestep: float,
+    ):
+        ode_configuration = configuration.EnsembleStudentTwoTeacherConfiguration(
+            configurations=[
+                self._setup_ode_configuration(
+                    network_configuration=member_network_config
+                )
+                for member_network_config in network_configuration
+            ],
+            covariance_check_frequency=self._config.covariance_check_frequency,
+        )
+
+        time = self._config.total_training_steps / self._config.input_dimension
+
+        ode = vectorised_dynamics.VectorisedStudentTeacherODE(
+            overlap_configuration=ode_configuration,
+            nonlinearity=self._config.student_nonlinearity,
+            w_learning_rate=self._config.learning_rate,
+            h_learning_rate=self._config.learning_rate,
+            dt=timestep,
+            soft_committee=self._config.soft_committee,
+            train_first_layer=self._config.train_hidden_layers,
+            train_head_layer=self._config.train_head_layer,
+            frozen_feature=False,
+            integrator=self._setup_integrator(),
+            expected_num_steps=int(np.ceil(time / timestep)) + 1,
+        )
+
+        if ode.adaptive:
+            self._integrate_adaptive(ode=ode, time=time, timestep=timestep)
+        else:
+            self._integrate_fixed_step(ode=ode, time=time, timestep=timestep)
@@ -10,13 +10,16 @@ from typing import Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import torch
 from matplotlib import cm
 
 import constants
+from loggers import log_io
+from run import batched_network_runner
 from run import config_template
 from run import core_runner
+from run import ensemble_ode_runner
+from run import network_runner
 from run import student_teacher_config
 from run.config_changes import ConfigChange
 from utils import experiment_utils
@@ -32,7 +35,10 @@ def get_args() -> argparse.Namespace:
         "--mode",
         metavar="-M",
         default="parallel",
-        help="run in 'parallel' or 'serial'",
+        help=(
+            "run in 'parallel', 'serial', 'ensemble' (ODEs of all runs batched) "
+            "or 'batched' (networks of all seeds of a config change batched)"
+        ),
     )
     parser.add_argument("--config", metavar="-C", default="config.yaml")
     parser.add_argument("--seeds", metavar="-S", default="[0]")
@@ -142,15 +148,100 @@ def serial_run(
             )
 
 
-def single_run(
+def ensemble_run(
+    base_configuration: student_teacher_config.StudentTeacherConfiguration,
+    seeds: List[int],
+    config_changes: Dict[str, List[Tuple[str, Any]]],
+    experiment_path: str,
+    results_folder: str,
+    timestamp: str,
+):
+    """Integrate the ODEs of all runs together in one batched loop.
+
+    Initial configurations are still generated from the networks of each run;
+    network simulations are not performed in this mode.
+
+    Raises:
+        ValueError: if network simulations are requested.
+    """
+    if base_configuration.network_simulation:
+        raise ValueError(
+            "Network simulations are not performed in ensemble mode, "
+            "set network_simulation to False."
+        )
+
+    configs = []
+    network_configurations = []
+
+    for run_name, changes in config_changes.items():
+        for seed in seeds:
+            config = get_run_config(
+                base_configuration=base_configuration,
+                seed=seed,
+                results_folder=results_folder,
+                timestamp=timestamp,
+                run_name=run_name,
+                config_change=changes,
+            )
+            config.save_configuration(folder_path=config.checkpoint_path)
+            network_configurations.append(
+                network_runner.initial_network_configuration(config=config)
+            )
+            configs.append(config)
+
+    runner = ensemble_ode_runner.EnsembleODERunner(
+        configs=configs, network_configurations=network_configurations
+    )
+    runner.run()
+
+
+def batched_run(
+    base_configuration: student_teacher_config.StudentTeacherConfiguration,
+    seeds: List[int],
+    config_changes: Dict[str, List[Tuple[str, Any]]],
+    experiment_path: str,
+    results_folder: str,
+    timestamp: str,
+):
+    """Train the networks of all seeds of each config change together
+    (stacked weights, batched matmuls) in one process; ODEs (if any) are
+    then run for each seed as in a single run.
+    """
+    for run_name, changes in config_changes.items():
+        print(f"{run_name}")
+        runners = [
+            core_runner.CoreRunner(
+                config=get_run_config(
+                    base_configuration=base_configuration,
+                    seed=seed,
+                    results_folder=results_folder,
+                    timestamp=timestamp,
+                    run_name=run_name,
+                    config_change=changes,
+                )
+            )
+            for seed in seeds
+        ]
+
+        if base_configuration.network_simulation:
+            batched_network_runner.BatchedNetworkRunner(
+                runners=[runner.network_simulation_runner for runner in runners]
+            ).train()
+
+        for runner in runners:
+            runner.run_ode()
+            runner.post_process()
+
+
+def get_run_config(
     base_configuration: student_teacher_config.StudentTeacherConfiguration,
     run_name: str,
     seed: int,
     results_folder: str,
-    experiment_path: str,
     timestamp: str,
     config_change: List[Tuple[str, Any]],
-):
+) -> student_teacher_config.StudentTeacherConfiguration:
+    """Configuration of a single run (with random seeds set accordingly)."""
     config = copy.deepcopy(base_configuration)
 
     experiment_utils.set_random_seeds(seed)
@@ -171,27 +262,58 @@ def single_run(
     config.add_property(constants.Constants.EXPERIMENT_TIMESTAMP, timestamp)
     config.add_property(constants.Constants.CHECKPOINT_PATH, checkpoint_path)
 
+    return config
+
+
+def single_run(
+    base_configuration: student_teacher_config.StudentTeacherConfiguration,
+    run_name: str,
+    seed: int,
+    results_folder: str,
+    experiment_path: str,
+    timestamp: str,
+    config_change: List[Tuple[str, Any]],
+):
+    config = get_run_config(
+        base_configuration=base_configuration,
+        seed=seed,
+        results_folder=results_folder,
+        timestamp=timestamp,
+        run_name=run_name,
+        config_change=config_change,
+    )
+
     r = core_runner.CoreRunner(config=config)
 
     r.run()
     r.post_process()
 
 
-def get_dfs(folder: str, seeds: List[int], file_name: str) -> Dict[str, List[pd.DataFrame]]:
+def get_dfs(
+    folder: str, seeds: List[int], file_name: str
+) -> Dict[str, List[log_io.LogReader]]:
+    """Readers of logs of each index and seed; columns are only loaded
+    as they are indexed, readers should be closed after use."""
     dfs = {}
     indices = [index for index in os.listdir(folder) if not index.startswith(".")]
     for index in indices:
         index_dfs = []
         for seed in seeds:
             df_path = os.path.join(folder, index, str(seed), file_name)
-            index_dfs.append(pd.read_csv(df_path))
+            index_dfs.append(log_io.LogReader(df_path))
         dfs[index] = index_dfs
     return dfs
 
 
+def close_dfs(dfs: Dict[str, List[log_io.LogReader]]) -> None:
+    for index_dfs in dfs.values():
+        for df in index_dfs:
+            df.close()
+
+
 def generalisation_error_figs(
-    ode_dfs: List[pd.DataFrame], 
-    network_dfs: List[pd.DataFrame], 
+    ode_dfs: List[log_io.LogReader], 
+    network_dfs: List[log_io.LogReader], 
     indices: List[str], 
     num_steps: int, 
     seeds: List[int]
@@ -280,7 +402,7 @@ def generalisation_error_figs(
 
 
 def cross_section_figs(
-    dfs: List[pd.DataFrame],
+    dfs: List[log_io.LogReader],
     indices: List[str],
     seeds: List[int],
     switch_step: int,
@@ -361,7 +483,7 @@ def cross_section_figs(
 
 
 def rate_figs(
-    dfs: List[pd.DataFrame],
+    dfs: List[log_io.LogReader],
     indices: List[str],
     switch_step: int,
     seeds: List[int],
@@ -509,6 +631,11 @@ def summary_plot(
         dfs=dfs, indices=indices, switch_step=switch_step, seeds=seeds, num_points=200
     )
 
+    if ode_dfs is not None:
+        close_dfs(ode_dfs)
+    if network_dfs is not None:
+        close_dfs(network_dfs)
+
 
 if __name__ == "__main__":
 
@@ -539,6 +666,24 @@ if __name__ == "__main__":
             results_folder=results_folder,
             timestamp=timestamp,
         )
+    elif args.mode == constants.Constants.BATCHED:
+        batched_run(
+            base_configuration=base_configuration,
+            config_changes=args.config_changes,
+            seeds=seeds,
+            experiment_path=experiment_path,
+            results_folder=results_folder,
+            timestamp=timestamp,
+        )
+    elif args.mode == constants.Constants.ENSEMBLE:
+        ensemble_run(
+            base_configuration=base_configuration,
+            config_changes=args.config_changes,
+            seeds=seeds,
+            experiment_path=experiment_path,
+            results_folder=results_folder,
+            timestamp=timestamp,
+        )
 
     if not args.skip_summary:
         summary_plot(
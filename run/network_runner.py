@@ -31,9 +31,124 @@ from teachers.ensembles import base_teacher_ensemble
 from teachers.ensembles import both_rotation_ensemble
 from teachers.ensembles import feature_rotation_ensemble
 from teachers.ensembles import readout_rotation_ensemble
+from utils import analytic_errors
 from utils import decorators
+from utils import event_schedule
 from utils import experiment_utils
 from utils import network_configuration
+from utils import overlap_tracker
+
+
+def setup_teachers(
+    config: student_teacher_config.StudentTeacherConfiguration,
+) -> base_teacher_ensemble.BaseTeacherEnsemble:
+    """Initialise teacher object containing teacher networks."""
+    forward_scaling = (
+        1 / np.sqrt(config.teacher_hidden_layers[0])
+        if config.scale_teacher_forward_by_hidden
+        else 1.0
+    )
+    base_arguments = {
+        Constants.INPUT_DIMENSION: config.input_dimension,
+        Constants.HIDDEN_DIMENSIONS: config.teacher_hidden_layers,
+        Constants.OUTPUT_DIMENSION: config.output_dimension,
+        Constants.BIAS: config.teacher_bias_parameters,
+        Constants.NUM_TEACHERS: config.num_teachers,
+        Constants.LOSS_TYPE: config.loss_type,
+        Constants.NONLINEARITY: config.student_nonlinearity,
+        Constants.SCALE_HIDDEN_LR: config.scale_hidden_lr,
+        Constants.FORWARD_SCALING: forward_scaling,
+        Constants.UNIT_NORM_TEACHER_HEAD: config.unit_norm_teacher_head,
+        Constants.INITIALISATION_STD: config.teacher_initialisation_std,
+    }
+    if config.teacher_configuration == Constants.FEATURE_ROTATION:
+        teachers_class = feature_rotation_ensemble.FeatureRotationTeacherEnsemble
+        additional_arguments = {
+            Constants.ROTATION_MAGNITUDE: config.feature_rotation_magnitude
+        }
+    elif config.teacher_configuration == Constants.READOUT_ROTATION:
+        teachers_class = readout_rotation_ensemble.ReadoutRotationTeacherEnsemble
+        additional_arguments = {
+            Constants.ROTATION_MAGNITUDE: config.readout_rotation_magnitude,
+            Constants.FEATURE_COPY_PERCENTAGE: config.feature_copy_percentage,
+        }
+    elif config.teacher_configuration == Constants.BOTH_ROTATION:
+        teachers_class = both_rotation_ensemble.BothRotationTeacherEnsemble
+        additional_arguments = {
+            Constants.FEATURE_ROTATION_ALPHA: config.feature_rotation_alpha,
+            Constants.READOUT_ROTATION_ALPHA: config.readout_rotation_alpha,
+        }
+    else:
+        raise ValueError(
+            f"Teacher configuration '{config.teacher_configuration}' not recognised."
+        )
+
+    teachers = teachers_class(**base_arguments, **additional_arguments)
+
+    if config.save_teacher_weights:
+        save_path = os.path.join(
+            config.checkpoint_path, Constants.TEACHER_WEIGHT_SAVE_PATH
+        )
+        teachers.save_all_teacher_weights(save_path=save_path)
+
+    return teachers
+
+
+def setup_student(
+    config: student_teacher_config.StudentTeacherConfiguration,
+    teachers: base_teacher_ensemble.BaseTeacherEnsemble,
+) -> base_student.BaseStudent:
+    """Initialise object containing student network."""
+    if config.learner_configuration == Constants.CONTINUAL:
+        student_class = continual_student.ContinualStudent
+    elif config.learner_configuration == Constants.META:
+        student_class = meta_student.MetaStudent
+    else:
+        raise ValueError(
+            f"Learner type '{config.learning_configuration}' not recognised"
+        )
+
+    teacher_features_copy = (
+        None
+        if config.teacher_features_copy is None
+        else copy.deepcopy(teachers.teachers[config.teacher_features_copy].layers)
+    )
+
+    return student_class(
+        input_dimension=config.input_dimension,
+        hidden_dimensions=config.student_hidden_layers,
+        output_dimension=config.output_dimension,
+        bias=config.student_bias_parameters,
+        soft_committee=config.soft_committee,
+        num_teachers=config.num_teachers,
+        loss_type=config.loss_type,
+        learning_rate=config.learning_rate,
+        scale_head_lr=config.scale_head_lr,
+        scale_hidden_lr=config.scale_hidden_lr,
+        scale_forward_by_hidden=config.scale_student_forward_by_hidden,
+        nonlinearity=config.student_nonlinearity,
+        freeze_features=config.freeze_features,
+        train_hidden_layers=config.train_hidden_layers,
+        train_head_layer=config.train_head_layer,
+        initialise_outputs=config.initialise_student_outputs,
+        apply_nonlinearity_on_output=config.apply_nonlinearity_on_output,
+        symmetric_initialisation=config.symmetric_student_initialisation,
+        initialisation_std=config.student_initialisation_std,
+        teacher_features_copy=teacher_features_copy,
+    )
+
+
+def initial_network_configuration(
+    config: student_teacher_config.StudentTeacherConfiguration,
+) -> network_configuration.NetworkConfiguration:
+    """Macroscopic configuration of the initial networks of a run (as set up by
+    NetworkRunner), without setting up the rest of the run (e.g. as input to
+    ODE runs only)."""
+    teachers = setup_teachers(config=config)
+    student = setup_student(config=config, teachers=teachers)
+    return overlap_tracker.OverlapTracker(
+        student=student, teachers=teachers, input_dimension=config.input_dimension
+    ).network_configuration()
 
 
 class NetworkRunner:
@@ -62,158 +177,58 @@ class NetworkRunner:
         self._total_training_steps = config.total_training_steps
         self._log_frequency = config.log_frequency
         self._test_frequency = config.test_frequency
+        self._error_evaluation = config.error_evaluation
+        self._gradient_engine = config.gradient_engine
+        self._nonlinearity = config.student_nonlinearity
         self._total_step_count = 0
         self._log_overlaps = config.log_overlaps
+        self._print_frequency = 500
 
         # initialise student, teachers, logger_module,
         # data_module, loss_module, torch optimiser, and curriculum object
         self._teachers = self._setup_teachers(config=config)
         self._student = self._setup_student(config=config)
+        self._overlap_tracker = overlap_tracker.OverlapTracker(
+            student=self._student,
+            teachers=self._teachers,
+            input_dimension=config.input_dimension,
+        )
         self._logger = self._setup_logger(config=config)
         self._data_module = self._setup_data(config=config)
         self._loss_function = self._setup_loss(config=config)
         self._optimiser = self._setup_optimiser(config=config)
         self._curriculum = self._setup_curriculum(config=config)
         self._consolidation_module = self._setup_consolidation(config=config)
+        self._analytic_error_scalings = self._setup_error_evaluation(config=config)
+        self._check_gradient_engine(config=config)
 
         self._manage_network_devices()
 
+        if isinstance(
+            self._consolidation_module, synaptic_intelligence.SynapticIntelligence
+        ):
+            self._student.track_path_integral()
+
     def get_network_configuration(self) -> network_configuration.NetworkConfiguration:
         """Get macroscopic configuration of networks in terms of order parameters.
 
         Used for both logging purposes and as input to ODE runner.
         """
-        with torch.no_grad():
-            student_head_weights = [
-                head.weight.data.cpu().numpy().flatten() for head in self._student.heads
-            ]
-            teacher_head_weights = [
-                teacher.head.weight.data.cpu().numpy().flatten()
-                for teacher in self._teachers.teachers
-            ]
-            student_self_overlap = self._student.self_overlap.cpu().numpy()
-            teacher_self_overlaps = [
-                teacher.self_overlap.cpu().numpy()
-                for teacher in self._teachers.teachers
-            ]
-            teacher_cross_overlaps = [
-                o.cpu().numpy() for o in self._teachers.cross_overlaps
-            ]
-            student_layer = self._student.layers[0].weight.data
-            student_teacher_overlaps = [
-                student_layer.mm(teacher.layers[0].weight.data.t()).cpu().numpy()
-                / self._input_dimension
-                for teacher in self._teachers.teachers
-            ]
-
-        return network_configuration.NetworkConfiguration(
-            student_head_weights=student_head_weights,
-            teacher_head_weights=teacher_head_weights,
-            student_self_overlap=student_self_overlap,
-            teacher_self_overlaps=teacher_self_overlaps,
-            teacher_cross_overlaps=teacher_cross_overlaps,
-            student_teacher_overlaps=student_teacher_overlaps,
-        )
+        return self._overlap_tracker.network_configuration()
 
     @decorators.timer
     def _setup_teachers(
         self, config: student_teacher_config.StudentTeacherConfiguration
     ) -> base_teacher_ensemble.BaseTeacherEnsemble:
         """Initialise teacher object containing teacher networks."""
-        forward_scaling = (
-            1 / np.sqrt(config.teacher_hidden_layers[0])
-            if config.scale_teacher_forward_by_hidden
-            else 1.0
-        )
-        base_arguments = {
-            Constants.INPUT_DIMENSION: config.input_dimension,
-            Constants.HIDDEN_DIMENSIONS: config.teacher_hidden_layers,
-            Constants.OUTPUT_DIMENSION: config.output_dimension,
-            Constants.BIAS: config.teacher_bias_parameters,
-            Constants.NUM_TEACHERS: config.num_teachers,
-            Constants.LOSS_TYPE: config.loss_type,
-            Constants.NONLINEARITY: config.student_nonlinearity,
-            Constants.SCALE_HIDDEN_LR: config.scale_hidden_lr,
-            Constants.FORWARD_SCALING: forward_scaling,
-            Constants.UNIT_NORM_TEACHER_HEAD: config.unit_norm_teacher_head,
-            Constants.INITIALISATION_STD: config.teacher_initialisation_std,
-        }
-        if config.teacher_configuration == Constants.FEATURE_ROTATION:
-            teachers_class = feature_rotation_ensemble.FeatureRotationTeacherEnsemble
-            additional_arguments = {
-                Constants.ROTATION_MAGNITUDE: config.feature_rotation_magnitude
-            }
-        elif config.teacher_configuration == Constants.READOUT_ROTATION:
-            teachers_class = readout_rotation_ensemble.ReadoutRotationTeacherEnsemble
-            additional_arguments = {
-                Constants.ROTATION_MAGNITUDE: config.readout_rotation_magnitude,
-                Constants.FEATURE_COPY_PERCENTAGE: config.feature_copy_percentage,
-            }
-        elif config.teacher_configuration == Constants.BOTH_ROTATION:
-            teachers_class = both_rotation_ensemble.BothRotationTeacherEnsemble
-            additional_arguments = {
-                Constants.FEATURE_ROTATION_ALPHA: config.feature_rotation_alpha,
-                Constants.READOUT_ROTATION_ALPHA: config.readout_rotation_alpha,
-            }
-        else:
-            raise ValueError(
-                f"Teacher configuration '{config.teacher_configuration}' not recognised."
-            )
-
-        teachers = teachers_class(**base_arguments, **additional_arguments)
-
-        if config.save_teacher_weights:
-            save_path = os.path.join(
-                config.checkpoint_path, Constants.TEACHER_WEIGHT_SAVE_PATH
-            )
-            teachers.save_all_teacher_weights(save_path=save_path)
-
-        return teachers
+        return setup_teachers(config=config)
 
     @decorators.timer
     def _setup_student(
         self, config: student_teacher_config.StudentTeacherConfiguration
     ) -> base_student.BaseStudent:
         """Initialise object containing student network."""
-        if config.learner_configuration == Constants.CONTINUAL:
-            student_class = continual_student.ContinualStudent
-        elif config.learner_configuration == Constants.META:
-            student_class = meta_student.MetaStudent
-        else:
-            raise ValueError(
-                f"Learner type '{config.learning_configuration}' not recognised"
-            )
-
-        teacher_features_copy = (
-            None
-            if config.teacher_features_copy is None
-            else copy.deepcopy(
-                self._teachers.teachers[config.teacher_features_copy].layers
-            )
-        )
-
-        return student_class(
-            input_dimension=config.input_dimension,
-            hidden_dimensions=config.student_hidden_layers,
-            output_dimension=config.output_dimension,
-            bias=config.student_bias_parameters,
-            soft_committee=config.soft_committee,
-            num_teachers=config.num_teachers,
-            loss_type=config.loss_type,
-            learning_rate=config.learning_rate,
-            scale_head_lr=config.scale_head_lr,
-            scale_hidden_lr=config.scale_hidden_lr,
-            scale_forward_by_hidden=config.scale_student_forward_by_hidden,
-            nonlinearity=config.student_nonlinearity,
-            freeze_features=config.freeze_features,
-            train_hidden_layers=config.train_hidden_layers,
-            train_head_layer=config.train_head_layer,
-            initialise_outputs=config.initialise_student_outputs,
-            apply_nonlinearity_on_output=config.apply_nonlinearity_on_output,
-            symmetric_initialisation=config.symmetric_student_initialisation,
-            initialisation_std=config.student_initialisation_std,
-            teacher_features_copy=teacher_features_copy,
-        )
+        return setup_student(config=config, teachers=self._teachers)
 
     @decorators.timer
     def _setup_logger(
@@ -245,6 +260,9 @@ class NetworkRunner:
                 mean=config.mean,
                 variance=config.variance,
                 dataset_size=config.dataset_size,
+                input_pool_size=config.input_pool_size,
+                background_refill=config.background_refill,
+                seed=config.seed,
             )
         else:
             raise ValueError(
@@ -297,7 +315,9 @@ class NetworkRunner:
             consolidation_module = None
         elif config.consolidation_type == Constants.EWC:
             consolidation_module = ewc.EWC(
-                importance=config.importance, device=self._device
+                importance=config.importance,
+                device=self._device,
+                fisher_samples=config.fisher_samples,
             )
         elif config.consolidation_type == Constants.QUADRATIC:
             consolidation_module = quadratic_penalty.QuadraticPenalty(
@@ -313,6 +333,96 @@ class NetworkRunner:
             )
         return consolidation_module
 
+    @decorators.timer
+    def _setup_error_evaluation(
+        self, config: student_teacher_config.StudentTeacherConfiguration
+    ) -> Dict[str, float]:
+        """Check configuration admits the chosen generalisation error
+        evaluation and, for analytic evaluation, get the scalings relating
+        the overlaps to statistics of the network outputs.
+
+        Raises:
+            ValueError: if error evaluation is not recognised or analytic
+            evaluation is not possible for the configuration.
+        """
+        if config.error_evaluation == Constants.MONTE_CARLO:
+            return {}
+        if config.error_evaluation != Constants.ANALYTIC:
+            raise ValueError(
+                f"Error evaluation {config.error_evaluation} not recognised."
+            )
+
+        if config.input_source != Constants.IID_GAUSSIAN or config.mean != 0:
+            raise ValueError(
+                "Analytic generalisation errors require zero mean iid_gaussian inputs."
+            )
+        if config.student_nonlinearity not in [
+            Constants.SCALED_ERF,
+            Constants.LINEAR,
+        ]:
+            raise ValueError(
+                "Analytic generalisation errors are not implemented for "
+                f"nonlinearity {config.student_nonlinearity}."
+            )
+        if (
+            config.loss_type != Constants.REGRESSION
+            or config.student_bias_parameters
+            or config.teacher_bias_parameters
+            or config.apply_nonlinearity_on_output
+            or len(config.student_hidden_layers) != 1
+            or len(config.teacher_hidden_layers) != 1
+            or config.output_dimension != 1
+        ):
+            raise ValueError(
+                "Analytic generalisation errors require regression networks with "
+                "a single hidden layer and output, no biases and linear outputs."
+            )
+
+        forward_hidden_scaling = (
+            1 / np.sqrt(config.input_dimension) if config.scale_hidden_lr else 1.0
+        )
+        # inputs are sampled with standard deviation config.variance.
+        return {
+            "covariance_scaling": config.variance ** 2
+            * forward_hidden_scaling ** 2
+            * config.input_dimension,
+            "student_forward_scaling": 1 / config.student_hidden_layers[0]
+            if config.scale_student_forward_by_hidden
+            else 1.0,
+            "teacher_forward_scaling": 1 / np.sqrt(config.teacher_hidden_layers[0])
+            if config.scale_teacher_forward_by_hidden
+            else 1.0,
+        }
+
+    def _check_gradient_engine(
+        self, config: student_teacher_config.StudentTeacherConfiguration
+    ) -> None:
+        """Check configuration admits the chosen gradient engine.
+
+        Raises:
+            ValueError: if gradient engine is not recognised or hand derived
+            gradients are not implemented for the configuration.
+        """
+        if config.gradient_engine == Constants.AUTOGRAD:
+            return
+        if config.gradient_engine != Constants.MANUAL:
+            raise ValueError(
+                f"Gradient engine {config.gradient_engine} not recognised."
+            )
+        if (
+            config.consolidation_type is not None
+            or config.loss_type != Constants.REGRESSION
+            or config.loss_function != Constants.MSE
+            or config.student_bias_parameters
+            or config.apply_nonlinearity_on_output
+            or len(config.student_hidden_layers) != 1
+        ):
+            raise ValueError(
+                "Manual gradients require mse regression with single hidden layer "
+                "students without biases or output nonlinearity, and no "
+                "consolidation."
+            )
+
     @decorators.timer
     def _setup_optimiser(
         self, config: student_teacher_config.StudentTeacherConfiguration
@@ -327,6 +437,7 @@ class NetworkRunner:
         self._student.to(device=self._device)
         for teacher in self._teachers.teachers:
             teacher.to(device=self._device)
+        self._overlap_tracker.to(device=self._device)
 
     def _compute_loss(
         self, prediction: torch.Tensor, target: torch.Tensor
@@ -345,22 +456,55 @@ class NetworkRunner:
 
     @decorators.timer
     def _setup_training(self):
-        """Prepare runner for training, including constructing a test dataset.
+        """Prepare runner for training, including constructing a test dataset
+        (for monte carlo error evaluation).
         This method must be called before training loop is called.
         """
         # different configurations make different number of calls to rng
         # reset seeds before training to ensure data is the same.
         experiment_utils.set_random_seeds(self._seed)
 
+        # errors are computed from overlaps, no test set is needed.
+        if self._error_evaluation == Constants.ANALYTIC:
+            return
+
         self._test_data_inputs = self._data_module.get_test_data()[Constants.X].to(
             self._device
         )
         self._test_teacher_outputs = self._teachers.forward_all(self._test_data_inputs)
 
+    def _setup_event_schedule(self) -> Union[None, event_schedule.EventSchedule]:
+        """Schedule of steps with tests, logs, checkpoints etc. (and task
+        switches), between which training steps are run uninterrupted.
+
+        Returns:
+            schedule: event schedule, or None if switches depend on the
+            training (e.g. on generalisation error) and cannot be scheduled.
+        """
+        if not isinstance(
+            self._curriculum,
+            (
+                hard_steps_curriculum.HardStepsCurriculum,
+                periodic_curriculum.PeriodicCurriculum,
+            ),
+        ):
+            return None
+        periods = [
+            self._checkpoint_frequency,
+            self._test_frequency,
+            self._print_frequency,
+        ]
+        if self._log_overlaps:
+            periods.append(self._log_frequency)
+        return event_schedule.EventSchedule(
+            periods=periods, total_steps=self._total_training_steps
+        )
+
     def train(self):
         """Training orchestration."""
 
         self._setup_training()
+        self._event_schedule = self._setup_event_schedule()
 
         while self._total_step_count < self._total_training_steps:
             teacher_index = next(self._curriculum)
@@ -370,17 +514,94 @@ class NetworkRunner:
             first_task = False
 
         self._logger.checkpoint_df()
+        self._logger.close()
 
     def _train_on_teacher(self, teacher_index: int):
         """One phase of training (wrt one teacher)."""
-        self._student.signal_task_boundary(new_task=teacher_index)
+        consolidation_module = self._start_task(teacher_index=teacher_index)
+
+        if self._event_schedule is not None:
+            self._train_on_teacher_in_chunks(
+                teacher_index=teacher_index, consolidation_module=consolidation_module
+            )
+            return
+
         task_step_count = 0
-        generalisation_errors = self._compute_generalisation_errors()
+
+        while self._total_step_count < self._total_training_steps:
+
+            latest_task_generalisation_error = self._pre_step(
+                teacher_index=teacher_index, task_step_count=task_step_count
+            )
+
+            self._training_step(
+                teacher_index=teacher_index, consolidation_module=consolidation_module
+            )
+
+            task_step_count += 1
+
+            if self._curriculum.to_switch(
+                task_step=task_step_count, error=latest_task_generalisation_error
+            ):
+                break
+
+    def _train_on_teacher_in_chunks(
+        self, teacher_index: int, consolidation_module: Union[None, ewc.EWC]
+    ):
+        """As _train_on_teacher, with training steps between scheduled events
+        run as uninterrupted chunks."""
+        task_start_step = self._total_step_count
+        switch_step = self._curriculum.next_switch_step
+        if switch_step != np.inf:
+            self._event_schedule.add(task_start_step + switch_step)
+
+        while self._total_step_count < self._total_training_steps:
+
+            latest_task_generalisation_error = self._pre_step(
+                teacher_index=teacher_index,
+                task_step_count=self._total_step_count - task_start_step,
+            )
+
+            next_event_step = self._event_schedule.next_event(self._total_step_count)
+            self._train_chunk(
+                teacher_index=teacher_index,
+                consolidation_module=consolidation_module,
+                num_steps=next_event_step - self._total_step_count,
+            )
+
+            if self._curriculum.to_switch(
+                task_step=self._total_step_count - task_start_step,
+                error=latest_task_generalisation_error,
+            ):
+                break
+
+    def _train_chunk(
+        self,
+        teacher_index: int,
+        consolidation_module: Union[None, ewc.EWC],
+        num_steps: int,
+    ):
+        """Perform training steps with no events in between."""
+        for _ in range(num_steps):
+            self._training_step(
+                teacher_index=teacher_index, consolidation_module=consolidation_module
+            )
+
+    def _start_task(self, teacher_index: int) -> Union[None, ewc.EWC]:
+        """Signal new task to student, log errors at task start and set up
+        consolidation of previous task (if any).
+
+        Returns:
+            consolidation_module: module giving penalty to add to loss, or
+            None if there is no previous task to consolidate.
+        """
+        self._student.signal_task_boundary(new_task=teacher_index)
+        self._generalisation_errors = self._compute_generalisation_errors()
         self._logger.log_generalisation_errors(
             step=self._total_step_count,
-            generalisation_errors=generalisation_errors,
+            generalisation_errors=self._generalisation_errors,
         )
-        timer = time.time()
+        self._timer = time.time()
 
         if self._consolidation_module is not None and len(self._curriculum.history) > 1:
             previous_teacher_index = self._curriculum.history[-2]
@@ -396,67 +617,65 @@ class NetworkRunner:
         else:
             consolidation_module = None
 
-        while self._total_step_count < self._total_training_steps:
+        return consolidation_module
 
-            if (
-                self._total_step_count % self._checkpoint_frequency == 0
-                and self._total_step_count != 0
-            ):
-                self._logger.checkpoint_df()
+    def _pre_step(self, teacher_index: int, task_step_count: int) -> float:
+        """Checkpoint, test and log as due before a training step.
 
-            if self._total_step_count % self._test_frequency == 0:
-                generalisation_errors = self._compute_generalisation_errors()
-                self._logger.log_generalisation_errors(
-                    step=self._total_step_count,
-                    generalisation_errors=generalisation_errors,
-                )
-            if self._log_overlaps and self._total_step_count % self._log_frequency == 0:
-                self._logger.log_network_configuration(
-                    step=self._total_step_count,
-                    network_config=self.get_network_configuration(),
-                )
+        Returns:
+            latest_task_generalisation_error: most recent generalisation
+            error with respect to current teacher.
+        """
+        if (
+            self._total_step_count % self._checkpoint_frequency == 0
+            and self._total_step_count != 0
+        ):
+            self._logger.checkpoint_df()
+
+        if self._total_step_count % self._test_frequency == 0:
+            self._generalisation_errors = self._compute_generalisation_errors()
+            self._logger.log_generalisation_errors(
+                step=self._total_step_count,
+                generalisation_errors=self._generalisation_errors,
+            )
+        if self._log_overlaps and self._total_step_count % self._log_frequency == 0:
+            self._logger.log_network_configuration(
+                step=self._total_step_count,
+                network_config=self.get_network_configuration(),
+            )
 
-            if self._total_step_count % 500 == 0:
+        if self._total_step_count % self._print_frequency == 0:
+            print(
+                f"Generalisation errors @ step {self._total_step_count} "
+                f"({task_step_count}'th step training on teacher {teacher_index}): "
+            )
+            if self._total_step_count != 0:
                 print(
-                    f"Generalisation errors @ step {self._total_step_count} "
-                    f"({task_step_count}'th step training on teacher {teacher_index}): "
+                    f"Time for last {self._print_frequency} steps: "
+                    f"{time.time() - self._timer}"
                 )
-                if self._total_step_count != 0:
-                    print(f"Time for last 500 steps: {time.time() - timer}")
-                    timer = time.time()
-                for i, error in enumerate(generalisation_errors):
-                    print(f"    Teacher {i}: {error}\n")
-
-            latest_task_generalisation_error = generalisation_errors[teacher_index]
-
-            self._training_step(
-                teacher_index=teacher_index, consolidation_module=consolidation_module
-            )
-
-            task_step_count += 1
+                self._timer = time.time()
+            for i, error in enumerate(self._generalisation_errors):
+                print(f"    Teacher {i}: {error}\n")
 
-            if self._curriculum.to_switch(
-                task_step=task_step_count, error=latest_task_generalisation_error
-            ):
-                break
+        return self._generalisation_errors[teacher_index]
 
     def _training_step(
         self, teacher_index: int, consolidation_module: Union[None, ewc.EWC]
     ):
         """Perform single training step."""
-
-        if self._save_weight_frequency is not None:
-            if self._total_step_count % self._save_weight_frequency == 0:
-                self._student.save_weights(
-                    save_path=os.path.join(
-                        self._checkpoint_path,
-                        f"{Constants.STUDENT_WEIGHTS}_{self._total_step_count}",
-                    )
-                )
+        self._save_weights()
 
         batch = self._data_module.get_batch()
         batch_input = batch[Constants.X].to(self._device)
 
+        if self._gradient_engine == Constants.MANUAL:
+            with torch.no_grad():
+                teacher_output = self._teachers.forward(teacher_index, batch_input)
+            self._student.sgd_step(x=batch_input, target=teacher_output)
+            self._end_step()
+            return
+
         # forward through student network
         student_output = self._student.forward(batch_input)
 
@@ -473,13 +692,35 @@ class NetworkRunner:
         loss.backward()
         self._optimiser.step()
 
+        self._end_step()
+        self._student.append_to_path_integral_contributions()
+
+    def _save_weights(self) -> None:
+        """Save student weights if due at current step."""
+        if self._save_weight_frequency is not None:
+            if self._total_step_count % self._save_weight_frequency == 0:
+                self._student.save_weights(
+                    save_path=os.path.join(
+                        self._checkpoint_path,
+                        f"{Constants.STUDENT_WEIGHTS}_{self._total_step_count}",
+                    )
+                )
+
+    def _end_step(self) -> None:
+        """Advance step count (and feature freezing schedule of student)."""
         self._total_step_count += 1
 
         self._student.signal_step(step=self._total_step_count)
-        self._student.append_to_path_integral_contributions()
 
     def _compute_generalisation_errors(self) -> List[float]:
         """Compute test errors for student with respect to all teachers."""
+        if self._error_evaluation == Constants.ANALYTIC:
+            return analytic_errors.iid_gaussian_generalisation_errors(
+                network_config=self.get_network_configuration(),
+                nonlinearity=self._nonlinearity,
+                **self._analytic_error_scalings,
+            )
+
         self._student.eval()
 
         generalisation_errors = []
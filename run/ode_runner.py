@@ -1,5 +1,6 @@
 from typing import Any
 from typing import Dict
+from typing import Tuple
 
 import numpy as np
 
@@ -13,6 +14,9 @@ from loggers import split_logger
 from loggers import unified_logger
 from ode import configuration
 from ode import dynamics
+from ode import integrators
+from ode import trajectory
+from ode import vectorised_dynamics
 from run import student_teacher_config
 from utils import network_configuration
 
@@ -20,6 +24,10 @@ from utils import network_configuration
 class ODERunner:
     """Runner for ode simulations."""
 
+    # tolerance (in steps) within which a task step counts as a switch step
+    # (and, for adaptive integrators, a grid point as reached).
+    _SWITCH_TOLERANCE = 1e-6
+
     def __init__(
         self,
         config: student_teacher_config.StudentTeacherConfiguration,
@@ -29,20 +37,32 @@ class ODERunner:
         self._network_configuration = network_configuration
 
         self._curriculum = self._setup_curriculum()
+        # whether order parameter derivatives have exceeded steady_state_tolerance
+        # since the start of the current task (see _num_steady_steps).
+        self._steady_state_armed = False
 
-        if self._config.implementation == constants.Constants.PYTHON:
-            self._logger = self._setup_logger()
+        if self._config.implementation in [
+            constants.Constants.PYTHON,
+            constants.Constants.JIT,
+        ]:
+            self._logger = self._setup_logger(
+                config=self._config, network_configuration=self._network_configuration
+            )
 
-    def _setup_logger(self) -> base_logger.BaseLogger:
-        if self._config.split_logging:
+    def _setup_logger(
+        self,
+        config: student_teacher_config.StudentTeacherConfiguration,
+        network_configuration: network_configuration.NetworkConfiguration,
+    ) -> base_logger.BaseLogger:
+        if config.split_logging:
             logger = split_logger.SplitLogger(
-                config=self._config,
+                config=config,
                 run_type=constants.Constants.ODE,
-                network_config=self._network_configuration,
+                network_config=network_configuration,
             )
         else:
             logger = unified_logger.UnifiedLogger(
-                config=self._config,
+                config=config,
                 run_type=constants.Constants.ODE,
             )
         return logger
@@ -66,14 +86,37 @@ class ODERunner:
             )
         return curriculum
 
+    def _setup_integrator(self) -> integrators.BaseIntegrator:
+        """Initialise scheme used to step order parameters forward in time.
+
+        Raises:
+            ValueError: if integrator type is not recognised.
+        """
+        if self._config.integrator == constants.Constants.EULER:
+            integrator = integrators.EulerIntegrator()
+        elif self._config.integrator == constants.Constants.RK4:
+            integrator = integrators.RK4Integrator()
+        elif self._config.integrator == constants.Constants.DORMAND_PRINCE:
+            integrator = integrators.DormandPrinceIntegrator(
+                relative_tolerance=self._config.relative_tolerance,
+                absolute_tolerance=self._config.absolute_tolerance,
+            )
+        else:
+            raise ValueError(f"Integrator {self._config.integrator} not recognised.")
+        return integrator
+
     def run(self):
         if self._config.implementation == constants.Constants.CPP:
             self._run_cpp_ode()
-        elif self._config.implementation == constants.Constants.PYTHON:
+        elif self._config.implementation in [
+            constants.Constants.PYTHON,
+            constants.Constants.JIT,
+        ]:
             self._run_python_ode(
                 network_configuration=self._network_configuration,
                 timestep=self._config.timestep,
             )
+            self._logger.close()
         else:
             raise ValueError(
                 f"Implementation type {self._config.implementation} not recognised."
@@ -82,18 +125,26 @@ class ODERunner:
     def _run_cpp_ode(self):
         raise NotImplementedError
 
+    def _setup_ode_configuration(
+        self, network_configuration: network_configuration.NetworkConfiguration
+    ) -> configuration.StudentTwoTeacherConfiguration:
+        return configuration.StudentTwoTeacherConfiguration(
+            Q=network_configuration.student_self_overlap,
+            R=network_configuration.student_teacher_overlaps[0],
+            U=network_configuration.student_teacher_overlaps[1],
+            T=network_configuration.teacher_self_overlaps[0],
+            S=network_configuration.teacher_self_overlaps[1],
+            V=network_configuration.teacher_cross_overlaps[0],
+            h1=network_configuration.student_head_weights[0],
+            h2=network_configuration.student_head_weights[1],
+            th1=network_configuration.teacher_head_weights[0],
+            th2=network_configuration.teacher_head_weights[1],
+            covariance_check_frequency=self._config.covariance_check_frequency,
+        )
+
     def _run_python_ode(self, network_configuration: Dict[str, Any], timestep: float):
-        ode_configuration = configuration.StudentTwoTeacherConfiguration(
-            Q=self._network_configuration.student_self_overlap,
-            R=self._network_configuration.student_teacher_overlaps[0],
-            U=self._network_configuration.student_teacher_overlaps[1],
-            T=self._network_configuration.teacher_self_overlaps[0],
-            S=self._network_configuration.teacher_self_overlaps[1],
-            V=self._network_configuration.teacher_cross_overlaps[0],
-            h1=self._network_configuration.student_head_weights[0],
-            h2=self._network_configuration.student_head_weights[1],
-            th1=self._network_configuration.teacher_head_weights[0],
-            th2=self._network_configuration.teacher_head_weights[1],
+        ode_configuration = self._setup_ode_configuration(
+            network_configuration=self._network_configuration
         )
 
         # curriculum = (
@@ -105,7 +156,19 @@ class ODERunner:
 
         time = self._config.total_training_steps / self._config.input_dimension
 
-        ode = dynamics.StudentTeacherODE(
+        if self._config.implementation == constants.Constants.JIT:
+            # numba is only required (and kernels compiled) for jit runs.
+            from ode import jit_dynamics
+
+            ode_class = jit_dynamics.JITStudentTeacherODE
+        elif self._config.engine == constants.Constants.LOOP:
+            ode_class = dynamics.StudentTeacherODE
+        elif self._config.engine == constants.Constants.VECTORISED:
+            ode_class = vectorised_dynamics.VectorisedStudentTeacherODE
+        else:
+            raise ValueError(f"ODE engine {self._config.engine} not recognised.")
+
+        ode = ode_class(
             overlap_configuration=ode_configuration,
             nonlinearity=self._config.student_nonlinearity,
             w_learning_rate=self._config.learning_rate,
@@ -115,35 +178,321 @@ class ODERunner:
             train_first_layer=self._config.train_hidden_layers,
             train_head_layer=self._config.train_head_layer,
             frozen_feature=False,
+            integrator=self._setup_integrator(),
+            expected_num_steps=int(np.ceil(time / timestep)) + 1,
+        )
+
+        if ode.adaptive:
+            self._integrate_adaptive(ode=ode, time=time, timestep=timestep)
+        else:
+            self._integrate_fixed_step(ode=ode, time=time, timestep=timestep)
+
+        # ode.save_to_csv(save_path=self._config.checkpoint_path)
+        # ode.make_plot(
+        #     save_path=self._config.checkpoint_path,
+        #     total_time=self._config.total_training_steps,
+        # )
+
+    def _step_ode(self, ode: dynamics.StudentTeacherODE, time: float, task_steps):
+        """Switch teacher if due, then take one step of the ode, capped so as
+        to land exactly on the next scheduled switch (and, for adaptive
+        integrators, the end time).
+
+        Returns:
+            time_step: ode time advanced.
+            task_steps: updated number of steps on current task.
+        """
+        if self._curriculum.to_switch(
+            task_step=task_steps, error=ode.current_teacher_error
+        ):
+            ode.switch_teacher()
+            task_steps = 0
+            self._steady_state_armed = False
+
+        next_switch_step = self._curriculum.next_switch_step
+        time_to_switch = (next_switch_step - task_steps) / self._config.input_dimension
+
+        max_timestep = time_to_switch
+        if ode.adaptive:
+            max_timestep = min(max_timestep, time - ode.time)
+
+        time_step = ode.step(max_timestep=max_timestep)
+
+        step_increment = time_step * self._config.input_dimension
+        # snap onto switch step so curriculum equality check is not
+        # thrown off by floating point accumulation.
+        if task_steps + step_increment >= next_switch_step - self._SWITCH_TOLERANCE:
+            task_steps = next_switch_step
+        else:
+            task_steps += step_increment
+
+        return time_step, task_steps
+
+    def _setup_trajectories(
+        self, ode: dynamics.StudentTeacherODE, time: float, timestep: float
+    ) -> Tuple[trajectory.TrajectoryBuffer, trajectory.TrajectoryBuffer]:
+        """Preallocate buffers holding errors (every step) and order parameter
+        states (every log_frequency steps) until the next checkpoint."""
+        steps_per_record = (timestep / time) * self._config.total_training_steps
+        records_per_checkpoint = (
+            min(self._config.checkpoint_frequency, self._config.total_training_steps)
+            / steps_per_record
+        )
+        error_trajectory = trajectory.TrajectoryBuffer(
+            capacity=int(np.ceil(records_per_checkpoint)) + 1,
+            record_shape=np.shape(ode.current_teacher_error) + (2,),
+        )
+        overlap_trajectory = trajectory.TrajectoryBuffer(
+            capacity=int(
+                np.ceil(
+                    records_per_checkpoint
+                    * steps_per_record
+                    / self._config.log_frequency
+                )
+            )
+            + 1,
+            record_shape=ode.state.shape,
+        )
+        return error_trajectory, overlap_trajectory
+
+    def _checkpoint_trajectories(
+        self,
+        ode: dynamics.StudentTeacherODE,
+        error_trajectory: trajectory.TrajectoryBuffer,
+        overlap_trajectory: trajectory.TrajectoryBuffer,
+    ) -> None:
+        """Write buffered trajectories to the logger in bulk and checkpoint."""
+        if len(error_trajectory):
+            errors = error_trajectory.records
+            self._logger.log_generalisation_error_trajectory(
+                steps=error_trajectory.steps,
+                generalisation_errors=[errors[..., 0], errors[..., 1]],
+            )
+        if len(overlap_trajectory):
+            self._logger.log_network_configuration_trajectory(
+                steps=overlap_trajectory.steps,
+                network_config=ode.configuration_trajectory(overlap_trajectory.records),
+            )
+        error_trajectory.clear()
+        overlap_trajectory.clear()
+        self._logger.checkpoint_df()
+
+    def _num_steady_steps(
+        self,
+        ode: dynamics.StudentTeacherODE,
+        time: float,
+        timestep: float,
+        steps: float,
+        task_steps: float,
+    ) -> int:
+        """Number of steps that can be skipped because the order parameters
+        have converged (all derivatives below steady_state_tolerance).
+
+        Skips stop short of the step reaching the next switch or the end of
+        the run (taken as usual) and of the next checkpoint. Only used with
+        fixed step integrators, adaptive ones lengthen their steps at steady
+        state anyway.
+
+        The detector is only armed once the derivatives have exceeded the
+        tolerance within the current task, so that the plateau at the start
+        of a task (e.g. from small initial weights) is not mistaken for
+        convergence. Consequently tasks along which the derivatives stay
+        below the tolerance throughout are integrated in full.
+        """
+        tolerance = self._config.steady_state_tolerance
+        if tolerance is None:
+            return 0
+        if ode.derivative_norm >= tolerance:
+            # (derivative norm is infinite before the first step.)
+            if np.isfinite(ode.derivative_norm):
+                self._steady_state_armed = True
+            return 0
+        if not self._steady_state_armed:
+            return 0
+
+        step_increment = timestep * self._config.input_dimension
+        next_checkpoint = (
+            steps // self._config.checkpoint_frequency + 1
+        ) * self._config.checkpoint_frequency
+
+        num_steps = min(
+            np.ceil(
+                (
+                    self._curriculum.next_switch_step
+                    - self._SWITCH_TOLERANCE
+                    - task_steps
+                )
+                / step_increment
+            )
+            - 1,
+            np.ceil((time - ode.time) / timestep) - 1,
+            np.floor((next_checkpoint - steps) / step_increment),
+        )
+        return int(max(num_steps, 0))
+
+    def _skip_steady_state(
+        self,
+        ode: dynamics.StudentTeacherODE,
+        num_steps: int,
+        time: float,
+        timestep: float,
+        steps: float,
+        task_steps: float,
+        error_trajectory: trajectory.TrajectoryBuffer,
+        overlap_trajectory: trajectory.TrajectoryBuffer,
+    ) -> Tuple[float, float]:
+        """Advance over num_steps steps at steady state, filling the
+        trajectories with the constant errors and overlaps.
+
+        Returns:
+            steps: updated number of steps.
+            task_steps: updated number of steps on current task.
+        """
+        # accumulate sequentially, exactly as the stepping loop would.
+        skipped_steps = np.cumsum(
+            np.concatenate(
+                (
+                    [steps],
+                    np.full(
+                        num_steps,
+                        (timestep / time) * self._config.total_training_steps,
+                    ),
+                )
+            )
+        )
+        task_steps = np.cumsum(
+            np.concatenate(
+                (
+                    [task_steps],
+                    np.full(num_steps, timestep * self._config.input_dimension),
+                )
+            )
+        )[-1]
+
+        ode.skip(num_steps=num_steps, timestep=timestep)
+
+        error_trajectory.extend(
+            steps=skipped_steps[:-1],
+            records=np.stack((ode.error_1, ode.error_2), axis=-1),
+        )
+        if self._config.log_overlaps:
+            overlap_steps = skipped_steps[:-1][
+                skipped_steps[:-1] % self._config.log_frequency == 0
+            ]
+            overlap_trajectory.extend(steps=overlap_steps, records=ode.state)
+
+        return skipped_steps[-1], task_steps
+
+    def _integrate_fixed_step(
+        self, ode: dynamics.StudentTeacherODE, time: float, timestep: float
+    ):
+        error_trajectory, overlap_trajectory = self._setup_trajectories(
+            ode=ode, time=time, timestep=timestep
         )
 
         steps = 0
         task_steps = 0
         while ode.time < time:
             if steps % self._config.checkpoint_frequency == 0 and steps != 0:
-                self._logger.checkpoint_df()
+                self._checkpoint_trajectories(
+                    ode=ode,
+                    error_trajectory=error_trajectory,
+                    overlap_trajectory=overlap_trajectory,
+                )
+
+            num_steady_steps = self._num_steady_steps(
+                ode=ode,
+                time=time,
+                timestep=timestep,
+                steps=steps,
+                task_steps=task_steps,
+            )
+            if num_steady_steps:
+                steps, task_steps = self._skip_steady_state(
+                    ode=ode,
+                    num_steps=num_steady_steps,
+                    time=time,
+                    timestep=timestep,
+                    steps=steps,
+                    task_steps=task_steps,
+                    error_trajectory=error_trajectory,
+                    overlap_trajectory=overlap_trajectory,
+                )
+                continue
 
-            if self._curriculum.to_switch(
-                task_step=task_steps, error=ode.current_teacher_error
-            ):
-                ode.switch_teacher()
-                task_steps = 0
+            time_step, task_steps = self._step_ode(
+                ode=ode, time=time, task_steps=task_steps
+            )
 
-            ode.step()
-            self._logger.log_generalisation_errors(
-                step=steps, generalisation_errors=[ode.error_1, ode.error_2]
+            error_trajectory.append(
+                step=steps, record=np.stack((ode.error_1, ode.error_2), axis=-1)
             )
             if self._config.log_overlaps and steps % self._config.log_frequency == 0:
-                self._logger.log_network_configuration(
-                    step=steps, network_config=ode.configuration
+                overlap_trajectory.append(step=steps, record=ode.state)
+            steps += (time_step / time) * self._config.total_training_steps
+
+        self._checkpoint_trajectories(
+            ode=ode,
+            error_trajectory=error_trajectory,
+            overlap_trajectory=overlap_trajectory,
+        )
+
+    def _integrate_adaptive(
+        self, ode: dynamics.StudentTeacherODE, time: float, timestep: float
+    ):
+        """Integrate with adaptive step sizes. Logs are written on the
+        uniform grid given by timestep (as with the fixed step integrators);
+        errors are linearly interpolated between the end points of each step,
+        overlaps are those at the end of the step containing the grid point.
+        """
+        error_trajectory, overlap_trajectory = self._setup_trajectories(
+            ode=ode, time=time, timestep=timestep
+        )
+
+        grid_spacing = (timestep / time) * self._config.total_training_steps
+
+        steps = 0
+        task_steps = 0
+        grid_index = 0
+        while ode.time < time:
+            time_step, task_steps = self._step_ode(
+                ode=ode, time=time, task_steps=task_steps
+            )
+            end_steps = steps + (time_step / time) * self._config.total_training_steps
+
+            # errors at start of step are logged by the ode as it steps.
+            start_errors = np.stack((ode.error_1_log[-1], ode.error_2_log[-1]), axis=-1)
+            end_errors = np.stack((ode.error_1, ode.error_2), axis=-1)
+
+            # tolerance so grid points are not lost to floating point error.
+            while grid_index * grid_spacing <= end_steps + self._SWITCH_TOLERANCE:
+                grid_step = grid_index * grid_spacing
+                if (
+                    grid_step != 0
+                    and grid_step % self._config.checkpoint_frequency == 0
+                ):
+                    self._checkpoint_trajectories(
+                        ode=ode,
+                        error_trajectory=error_trajectory,
+                        overlap_trajectory=overlap_trajectory,
+                    )
+
+                fraction = min(1, (grid_step - steps) / (end_steps - steps))
+                error_trajectory.append(
+                    step=grid_step,
+                    record=start_errors + fraction * (end_errors - start_errors),
                 )
-            steps += (timestep / time) * self._config.total_training_steps
-            task_steps += (timestep / time) * self._config.total_training_steps
+                if (
+                    self._config.log_overlaps
+                    and grid_step % self._config.log_frequency == 0
+                ):
+                    overlap_trajectory.append(step=grid_step, record=ode.state)
+                grid_index += 1
 
-        self._logger.checkpoint_df()
+            steps = end_steps
 
-        # ode.save_to_csv(save_path=self._config.checkpoint_path)
-        # ode.make_plot(
-        #     save_path=self._config.checkpoint_path,
-        #     total_time=self._config.total_training_steps,
-        # )
+        self._checkpoint_trajectories(
+            ode=ode,
+            error_trajectory=error_trajectory,
+            overlap_trajectory=overlap_trajectory,
+        )
@@ -4,8 +4,6 @@ from typing import List
 from typing import Optional
 from typing import Union
 
-import copy
-
 import numpy as np
 import torch
 import torch.nn as nn
@@ -63,6 +61,12 @@ class BaseStudent(base_network.BaseNetwork, abc.ABC):
         self._num_teachers = num_teachers
         self._learning_rate = learning_rate
 
+        # learning rates and forward scalings entering hand derived updates.
+        self._hidden_update_scaling = learning_rate * forward_hidden_scaling
+        self._head_update_scaling = (
+            learning_rate * self._head_lr_scaling * forward_scaling
+        )
+
         self._num_switches = -1
 
         # set to 0 by default
@@ -84,8 +88,8 @@ class BaseStudent(base_network.BaseNetwork, abc.ABC):
         if teacher_features_copy is not None:
             self._manually_initialise_student(teacher_features_copy)
 
-        # for synaptic intelligence
-        self._pre_update_shared_parameters = {n: copy.deepcopy(param) for n, param in self.named_parameters() if "head" not in n}
+        # for synaptic intelligence (enabled by track_path_integral)
+        self._track_path_integral = False
         self._path_integral_contributions = []
 
     @property
@@ -102,7 +106,42 @@ class BaseStudent(base_network.BaseNetwork, abc.ABC):
 
     @property
     def previous_task_path_integral_contributions(self):
-        return self._path_integral_contributions[self._num_switches - 1]
+        return {
+            n: contribution.view_as(param)
+            for (n, param), contribution in zip(
+                self._shared_parameters,
+                self._path_integral_contributions[self._num_switches - 1].split(
+                    self._shared_parameter_sizes
+                ),
+            )
+        }
+
+    def track_path_integral(self) -> None:
+        """Keep path integral contributions of the shared (non-head)
+        parameters at each step, as needed by synaptic intelligence.
+
+        Parameters before each update and the contributions of each task are
+        held in flat preallocated tensors, so must be called once the student
+        is on its device.
+        """
+        self._track_path_integral = True
+        self._shared_parameters = [
+            (n, param) for n, param in self.named_parameters() if "head" not in n
+        ]
+        self._shared_parameter_sizes = [
+            param.numel() for _, param in self._shared_parameters
+        ]
+        with torch.no_grad():
+            self._pre_update_shared_parameters = torch.cat(
+                [param.flatten() for _, param in self._shared_parameters]
+            )
+        self._pre_update_shared_parameter_views = [
+            pre_update.view_as(param)
+            for pre_update, (_, param) in zip(
+                self._pre_update_shared_parameters.split(self._shared_parameter_sizes),
+                self._shared_parameters,
+            )
+        ]
 
     def save_weights(self, save_path: str) -> None:
         """Save weights of student."""
@@ -126,7 +165,19 @@ class BaseStudent(base_network.BaseNetwork, abc.ABC):
     def signal_task_boundary(self, new_task: int) -> None:
         """Alert student to teacher change."""
         self._num_switches += 1
-        self._path_integral_contributions.append({n: torch.zeros_like(param) for n, param in self.named_parameters()  if "head" not in n})
+        if self._track_path_integral:
+            self._path_integral_contributions.append(
+                torch.zeros_like(self._pre_update_shared_parameters)
+            )
+            self._path_integral_contribution_views = [
+                contribution.view_as(param)
+                for contribution, (_, param) in zip(
+                    self._path_integral_contributions[-1].split(
+                        self._shared_parameter_sizes
+                    ),
+                    self._shared_parameters,
+                )
+            ]
         self._signal_task_boundary(new_task=new_task)
 
     def _get_next_freeze_feature_toggle(self) -> Union[int, float]:
@@ -195,6 +246,43 @@ class BaseStudent(base_network.BaseNetwork, abc.ABC):
         y = [self._forward_scaling * x for x in task_outputs]
         return y
 
+    def sgd_step(self, x: torch.Tensor, target: torch.Tensor) -> None:
+        """One step of SGD on 0.5 * mean squared error with hand derived
+        gradients (no autograd). Equivalent to the torch optimiser step on
+        the parameters of get_trainable_parameters for regression students
+        with a single hidden layer, no biases and linear outputs.
+
+        Only the current head is updated; weights with requires_grad off
+        (frozen heads, frozen features) are left unchanged.
+
+        Args:
+            x: batch of inputs.
+            target: teacher outputs on x.
+        """
+        with torch.no_grad():
+            weight = self._layers[0].weight
+            head = self._heads[self._current_teacher].weight
+
+            preactivation = self._forward_hidden_scaling * x.mm(weight.t())
+            activation = self._nonlinear_function(preactivation)
+            output = self._forward_scaling * activation.mm(head.t())
+
+            # derivative of loss wrt output (loss is mean over all elements).
+            output_gradient = (output - target) / target.numel()
+
+            train_hidden = self._train_hidden_layers and weight.requires_grad
+            if train_hidden:
+                preactivation_gradient = (
+                    self._forward_scaling
+                    * output_gradient.mm(head)
+                    * self._nonlinear_derivative(preactivation)
+                )
+
+            if self._train_head_layer and head.requires_grad:
+                head -= self._head_update_scaling * output_gradient.t().mm(activation)
+            if train_hidden:
+                weight -= self._hidden_update_scaling * preactivation_gradient.t().mm(x)
+
     def _threshold(self, y: torch.Tensor) -> torch.Tensor:
         """Apply sigmoid threshold."""
         return torch.sigmoid(y)
@@ -210,11 +298,19 @@ class BaseStudent(base_network.BaseNetwork, abc.ABC):
                 i * weights_dim : (i + 1) * weights_dim
             ] = weights[0].weight.data
 
-    def append_to_path_integral_contributions(self):        
-        grads = {n: p.grad for n, p in self.named_parameters() if "head" not in n}
-        diffs = {n: (p - self._pre_update_shared_parameters[n]).detach() for n, p in self.named_parameters() if "head" not in n}
-
-        for n in self._path_integral_contributions[self._num_switches].keys():  
-            self._path_integral_contributions[self._num_switches][n] += diffs[n] * grads[n]
-
-        self._pre_update_shared_parameters = {n: copy.deepcopy(param) for n, param in self.named_parameters() if "head" not in n}
+    def append_to_path_integral_contributions(self):
+        """Add (parameter change) * (gradient) of last update to contributions
+        of current task (no-op unless track_path_integral was called)."""
+        if not self._track_path_integral:
+            return
+        with torch.no_grad():
+            for (_, param), pre_update, contribution in zip(
+                self._shared_parameters,
+                self._pre_update_shared_parameter_views,
+                self._path_integral_contribution_views,
+            ):
+                if param.grad is not None:
+                    # pre_update becomes -(parameter change).
+                    pre_update.sub_(param)
+                    contribution.addcmul_(pre_update, param.grad, value=-1)
+                pre_update.copy_(param)
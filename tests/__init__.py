@@ -1,5 +1,14 @@
-from . import components_tests
-from . import models_tests
-from . import experiment_tests
-
-__all__ = ["components_tests", "models_tests", "experiment_tests"]
+# test packages are not imported eagerly, so that packages whose requirements
+# are not installed can be left out of collection (see conftest).
+__all__ = [
+    "components_tests",
+    "data_modules_tests",
+    "models_tests",
+    "experiment_tests",
+    "loggers_tests",
+    "ode_tests",
+    "regularisers_tests",
+    "run_tests",
+    "students_tests",
+    "utils_tests",
+]
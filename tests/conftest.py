@@ -0,0 +1,17 @@
+import importlib.util
+
+# legacy test packages, written against the former experiments package (not
+# part of this tree); they are left out of collection while it is missing.
+LEGACY_TEST_PACKAGES = ["components_tests", "experiment_tests", "models_tests"]
+
+collect_ignore = (
+    LEGACY_TEST_PACKAGES if importlib.util.find_spec("experiments") is None else []
+)
+
+
+def pytest_report_header(config):
+    if collect_ignore:
+        return (
+            "experiments package not installed, not collected: "
+            f"{', '.join(collect_ignore)}"
+        )
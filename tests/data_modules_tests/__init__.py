@@ -0,0 +1,3 @@
+from . import iid_data_test
+
+__all__ = ["iid_data_test"]
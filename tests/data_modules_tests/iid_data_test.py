@@ -0,0 +1,124 @@
+import unittest
+
+import numpy as np
+import torch
+
+import constants
+from data_modules import iid_data
+
+BATCH_SIZE = 4
+INPUT_DIMENSION = 10
+# (pool is not a multiple of the batch size; blocks hold 3 batches.)
+POOL_SIZE = 14
+
+
+def make_pool(**changes) -> iid_data.GaussianInputPool:
+    arguments = dict(
+        batch_size=BATCH_SIZE,
+        input_dimension=INPUT_DIMENSION,
+        mean=0,
+        std=1,
+        pool_size=POOL_SIZE,
+        seed=0,
+    )
+    arguments.update(changes)
+    return iid_data.GaussianInputPool(**arguments)
+
+
+def draw(pool: iid_data.GaussianInputPool, num_batches: int) -> torch.Tensor:
+    # batches are views into the pool, copied before the next draw.
+    return torch.stack([pool.get_batch().clone() for _ in range(num_batches)])
+
+
+class GaussianInputPoolTest(unittest.TestCase):
+    def test_batches(self):
+        batches = draw(make_pool(), num_batches=10)
+        self.assertEqual(batches.shape, (10, BATCH_SIZE, INPUT_DIMENSION))
+        # each refilled block holds new inputs.
+        self.assertEqual(len(torch.unique(batches.reshape(-1))), batches.numel())
+
+    def test_statistics(self):
+        batches = draw(make_pool(mean=1.5, std=2, pool_size=1000), num_batches=2500)
+        np.testing.assert_allclose(batches.mean().item(), 1.5, atol=0.02)
+        np.testing.assert_allclose(batches.std().item(), 2, atol=0.02)
+
+    def test_seed(self):
+        reference = draw(make_pool(), num_batches=10)
+        torch.manual_seed(1)
+        np.testing.assert_array_equal(draw(make_pool(), num_batches=10), reference)
+        self.assertFalse(torch.equal(draw(make_pool(seed=1), 10), reference))
+
+    def test_background_refill(self):
+        """Inputs do not depend on whether blocks are refilled in background."""
+        np.testing.assert_array_equal(
+            draw(make_pool(background_refill=True), num_batches=10),
+            draw(make_pool(), num_batches=10),
+        )
+
+    def test_small_pool(self):
+        with self.assertRaises(ValueError):
+            make_pool(pool_size=BATCH_SIZE - 1)
+
+
+class IIDDataTest(unittest.TestCase):
+    def test_input_pool(self):
+        data_module = iid_data.IIDData(
+            train_batch_size=BATCH_SIZE,
+            test_batch_size=100,
+            input_dimension=INPUT_DIMENSION,
+            mean=0,
+            variance=1,
+            dataset_size=constants.Constants.INF,
+            input_pool_size=POOL_SIZE,
+            seed=0,
+        )
+        np.testing.assert_array_equal(
+            torch.stack(
+                [
+                    data_module.get_batch()[constants.Constants.X].clone()
+                    for _ in range(10)
+                ]
+            ),
+            draw(make_pool(), num_batches=10),
+        )
+
+
+class EpochSamplerTest(unittest.TestCase):
+    def test_epochs(self):
+        """Each epoch visits every example exactly once."""
+        dataset = torch.arange(10.0).reshape(10, 1)
+        sampler = iid_data.EpochSampler(dataset=dataset, batch_size=4)
+        for epoch in range(1, 4):
+            batches = [sampler.get_batch() for _ in range(3)]
+            self.assertEqual(sampler.epoch, epoch)
+            # (last batch of an epoch holds the remainder.)
+            self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+            np.testing.assert_array_equal(
+                torch.cat(batches).flatten().sort().values, dataset.flatten()
+            )
+
+    def test_reshuffle(self):
+        dataset = torch.arange(100.0).reshape(100, 1)
+        sampler = iid_data.EpochSampler(dataset=dataset, batch_size=100)
+        self.assertFalse(torch.equal(sampler.get_batch(), sampler.get_batch()))
+
+    def test_finite_dataset(self):
+        data_module = iid_data.IIDData(
+            train_batch_size=BATCH_SIZE,
+            test_batch_size=100,
+            input_dimension=INPUT_DIMENSION,
+            mean=0,
+            variance=1,
+            dataset_size=2 * BATCH_SIZE,
+        )
+        epoch = torch.cat(
+            [data_module.get_batch()[constants.Constants.X] for _ in range(2)]
+        )
+        self.assertEqual(epoch.shape, (2 * BATCH_SIZE, INPUT_DIMENSION))
+        next_epoch = torch.cat(
+            [data_module.get_batch()[constants.Constants.X] for _ in range(2)]
+        )
+        # same examples, in a new order.
+        np.testing.assert_array_equal(
+            next_epoch[:, 0].sort().values, epoch[:, 0].sort().values
+        )
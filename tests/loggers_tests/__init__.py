@@ -0,0 +1,5 @@
+from . import checkpoint_writer_test
+from . import column_buffer_test
+from . import log_io_test
+
+__all__ = ["checkpoint_writer_test", "column_buffer_test", "log_io_test"]
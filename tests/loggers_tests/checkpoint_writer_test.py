@@ -0,0 +1,51 @@
+import unittest
+
+from loggers import checkpoint_writer
+
+
+class CheckpointWriterTest(unittest.TestCase):
+    def setUp(self):
+        self._written = []
+
+    def _write(self, path: str):
+        def write():
+            self._written.append(path)
+            return [path]
+
+        return write
+
+    @staticmethod
+    def _fail():
+        raise OSError("disk full")
+
+    def test_writes(self):
+        """Writes are done in order of submission, and their paths returned."""
+        writer = checkpoint_writer.CheckpointWriter(queue_size=2)
+        paths = [f"checkpoint_{i}" for i in range(10)]
+        for path in paths + paths[:2]:
+            writer.submit(self._write(path))
+        self.assertEqual(writer.close(), set(paths))
+        self.assertEqual(self._written, paths + paths[:2])
+
+    def test_failure(self):
+        """A failed write is raised on close, and later writes are discarded."""
+        writer = checkpoint_writer.CheckpointWriter(queue_size=2)
+        writer.submit(self._write("checkpoint_0"))
+        writer.submit(self._fail)
+        writer.submit(self._write("checkpoint_1"))
+        with self.assertRaises(RuntimeError) as context:
+            writer.close()
+        self.assertIsInstance(context.exception.__cause__, OSError)
+        self.assertEqual(self._written, ["checkpoint_0"])
+
+    def test_submit_after_failure(self):
+        writer = checkpoint_writer.CheckpointWriter(queue_size=1)
+        writer.submit(self._fail)
+        # (with a single slot, the third submission waits for the second to
+        # be taken, i.e. for the failed write to be done.)
+        with self.assertRaises(RuntimeError):
+            for i in range(3):
+                writer.submit(self._write(f"checkpoint_{i}"))
+        with self.assertRaises(RuntimeError):
+            writer.close()
+        self.assertEqual(self._written, [])
@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+
+from loggers import column_buffer
+
+
+class ColumnBufferTest(unittest.TestCase):
+    def test_growth(self):
+        """Rows and columns beyond the initial allocation are kept."""
+        buffer = column_buffer.ColumnBuffer(num_rows=2, num_columns=2)
+        expected = {}
+        for column in range(5):
+            tag = f"tag_{column}"
+            # (columns are written at every column + 1th step.)
+            steps = np.arange(0, 20, column + 1)
+            for step in steps:
+                buffer.write(tag=tag, step=step, value=float(column * 100 + step))
+            values = np.full(20, np.nan)
+            values[steps] = column * 100 + steps
+            expected[tag] = values
+
+        self.assertEqual(len(buffer), 20)
+        arrays = buffer.to_arrays()
+        self.assertEqual(list(arrays), list(expected))
+        for tag, values in expected.items():
+            np.testing.assert_array_equal(arrays[tag], values, err_msg=tag)
+
+    def test_step_order(self):
+        buffer = column_buffer.ColumnBuffer()
+        buffer.write_array(
+            tag="a", steps=np.array([5, 0, 3]), values=np.array([1.0, 2.0, 3.0])
+        )
+        buffer.write(tag="b", step=1, value=4.0)
+        np.testing.assert_array_equal(buffer.to_arrays()["a"], [2, np.nan, 3, 1])
+        np.testing.assert_array_equal(
+            buffer.to_arrays()["b"], [np.nan, 4, np.nan, np.nan]
+        )
+
+    def test_blocks(self):
+        buffer = column_buffer.ColumnBuffer(num_rows=1, num_columns=1)
+        matrix = np.arange(6.0).reshape(2, 3)
+        buffer.write_block(name="Q", step=0, values=matrix)
+        buffer.write_block_array(
+            name="Q", steps=np.array([1, 2]), values=np.stack([matrix, -matrix])
+        )
+        arrays = buffer.to_arrays()
+        self.assertEqual(list(arrays), column_buffer.flat_tags("Q", (2, 3)))
+        self.assertEqual(list(arrays)[:2], ["Q_0_0", "Q_0_1"])
+        np.testing.assert_array_equal(
+            np.stack(list(arrays.values()), axis=-1),
+            np.stack([matrix, matrix, -matrix]).reshape(3, 6),
+        )
+        with self.assertRaises(ValueError):
+            buffer.write_block(name="Q", step=3, values=matrix.T)
+
+    def test_dtypes(self):
+        """Columns are exported with the dtype of their first (floating
+        point) value; integer columns as float64 (missing rows are NaN)."""
+        buffer = column_buffer.ColumnBuffer()
+        buffer.write(tag="single", step=0, value=np.float32(0.1))
+        buffer.write(tag="double", step=0, value=0.1)
+        buffer.write(tag="integer", step=1, value=3)
+        buffer.write_block(name="Q", step=0, values=np.ones((2, 2), np.float32))
+
+        arrays = buffer.to_arrays()
+        self.assertEqual(arrays["single"].dtype, np.float32)
+        self.assertEqual(arrays["single"][0], np.float32(0.1))
+        self.assertEqual(arrays["double"].dtype, np.float64)
+        self.assertEqual(arrays["integer"].dtype, np.float64)
+        np.testing.assert_array_equal(arrays["integer"], [np.nan, 3])
+        self.assertEqual(arrays["Q_1_1"].dtype, np.float32)
+        self.assertEqual(buffer.to_dataframe()["single"].dtype, np.float32)
+
+    def test_reset(self):
+        """After a reset, only values (and tags) written since are exported,
+        in order of registration."""
+        buffer = column_buffer.ColumnBuffer(num_rows=2, num_columns=2)
+        buffer.register_tags(["a", "b", "c"])
+        for step in range(5):
+            buffer.write(tag="a", step=step, value=1.0)
+            buffer.write(tag="c", step=step, value=np.float32(2))
+        buffer.reset()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.to_arrays(), {})
+
+        buffer.write(tag="c", step=7, value=3.0)
+        buffer.write(tag="b", step=6, value=4.0)
+        # same step as before the reset.
+        buffer.write(tag="b", step=4, value=5.0)
+        arrays = buffer.to_arrays()
+        self.assertEqual(list(arrays), ["b", "c"])
+        np.testing.assert_array_equal(arrays["b"], [5, 4, np.nan])
+        np.testing.assert_array_equal(arrays["c"], [np.nan, np.nan, 3])
+        # dtype of first write since reset.
+        self.assertEqual(arrays["c"].dtype, np.float64)
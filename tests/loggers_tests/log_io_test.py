@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from loggers import column_buffer
+from loggers import log_io
+
+NUM_CHECKPOINTS = 3
+STEPS_PER_CHECKPOINT = 20
+
+
+def assert_same_values(binary, csv, err_msg: str = "") -> None:
+    """Binary values equal csv values parsed at the binary precision
+    (e.g. float32 logs are written to csv at float32 precision)."""
+    binary = np.asarray(binary)
+    # (pandas parses csv floats to within a few ulp.)
+    np.testing.assert_allclose(
+        binary, np.asarray(csv).astype(binary.dtype), rtol=1e-14, err_msg=err_msg
+    )
+
+
+class LogRoundTripTest(unittest.TestCase):
+    """Logs written as csv and as binary read back the same."""
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        self._rng = np.random.RandomState(0)
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def _checkpoints(self):
+        """Columns of each checkpoint as taken out of a logging buffer,
+        with errors logged at every step and overlaps at every other step."""
+        buffer = column_buffer.ColumnBuffer(num_rows=4, num_columns=4)
+        for checkpoint in range(NUM_CHECKPOINTS):
+            for step in range(
+                checkpoint * STEPS_PER_CHECKPOINT,
+                (checkpoint + 1) * STEPS_PER_CHECKPOINT,
+            ):
+                buffer.write("generalisation_error_0", step, self._rng.rand())
+                buffer.write(
+                    "generalisation_error_1", step, np.float32(self._rng.rand())
+                )
+                if step % 2 == 0:
+                    buffer.write_block(
+                        "student_self_overlap", step, self._rng.randn(2, 2)
+                    )
+            yield buffer.to_arrays()
+            buffer.reset()
+
+    def test_unified(self):
+        csv_path = os.path.join(self._folder, "csv", "network_log.csv")
+        npz_path = os.path.join(self._folder, "npz", "network_log.csv")
+        os.makedirs(os.path.dirname(csv_path))
+
+        for shard_index, columns in enumerate(self._checkpoints()):
+            pd.DataFrame(columns, columns=list(columns.keys())).to_csv(
+                csv_path, mode="a", header=shard_index == 0, index=False
+            )
+            log_io.write_shard(
+                log_path=npz_path, shard_index=shard_index, columns=columns
+            )
+
+        self.assertFalse(os.path.exists(npz_path))
+        self.assertEqual(len(log_io.shard_paths(npz_path)), NUM_CHECKPOINTS)
+
+        with log_io.LogReader(csv_path) as csv_reader, log_io.LogReader(
+            npz_path
+        ) as npz_reader:
+            self.assertEqual(csv_reader.keys(), npz_reader.keys())
+            self.assertIn("student_self_overlap_1_0", npz_reader.keys())
+            for key in csv_reader.keys():
+                self.assertEqual(
+                    len(npz_reader[key]), NUM_CHECKPOINTS * STEPS_PER_CHECKPOINT
+                )
+                assert_same_values(npz_reader[key], csv_reader[key], err_msg=key)
+
+        assert_same_values(
+            log_io.read_log(npz_path, columns=["generalisation_error_0"]),
+            log_io.read_log(csv_path, columns=["generalisation_error_0"]),
+        )
+
+    def test_missing_tags(self):
+        log_path = os.path.join(self._folder, "network_log.csv")
+        log_io.write_shard(
+            log_path=log_path, shard_index=0, columns={"a": np.arange(3.0)}
+        )
+        log_io.write_shard(
+            log_path=log_path,
+            shard_index=1,
+            columns={"a": np.arange(3.0, 5.0), "b": np.ones(2)},
+        )
+
+        log = log_io.read_log(log_path)
+        self.assertEqual(list(log.columns), ["a", "b"])
+        np.testing.assert_array_equal(log["a"], np.arange(5.0))
+        np.testing.assert_array_equal(log["b"], [np.nan] * 3 + [1.0, 1.0])
+
+    def test_split(self):
+        store_path = log_io.store_path(os.path.join(self._folder, "network_log.csv"))
+
+        csv_paths = {}
+        for checkpoint_index, columns in enumerate(self._checkpoints()):
+            log_io.append_to_store(store_path=store_path, columns=columns)
+            for tag, values in columns.items():
+                csv_paths[tag] = os.path.join(self._folder, f"{tag}.csv")
+                pd.DataFrame({tag: values}).to_csv(
+                    csv_paths[tag], mode="a", header=checkpoint_index == 0, index=False
+                )
+
+        with log_io.StoreReader(store_path) as store:
+            self.assertEqual(store.keys(), list(csv_paths.keys()))
+            for tag, csv_path in csv_paths.items():
+                assert_same_values(store[tag], pd.read_csv(csv_path)[tag], err_msg=tag)
+
+    def test_closed(self):
+        """Columns loaded before closing remain available."""
+        log_path = os.path.join(self._folder, "network_log.csv")
+        log_io.write_shard(
+            log_path=log_path, shard_index=0, columns={"a": np.arange(3.0)}
+        )
+        with log_io.LogReader(log_path) as reader:
+            column = reader["a"]
+        np.testing.assert_array_equal(reader["a"], column)
+        self.assertEqual(reader.keys(), ["a"])
@@ -0,0 +1,4 @@
+from . import dynamics_test
+from . import integrators_test
+
+__all__ = ["dynamics_test", "integrators_test"]
@@ -0,0 +1,165 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+from ode import configuration
+from ode import dynamics
+from ode import vectorised_dynamics
+
+NUM_STEPS = 30
+SWITCH_STEP = 15
+
+# derivatives and errors compared at each step.
+QUANTITIES = ["dq_dt", "dr_dt", "du_dt", "dh1_dt", "dh2_dt", "error_1", "error_2"]
+
+
+def random_configuration(
+    seed: int, num_students: int = 3, num_teachers: int = 2, input_dimension: int = 500
+) -> configuration.StudentTwoTeacherConfiguration:
+    """Overlaps of random student and teacher weights, with random heads."""
+    rng = np.random.RandomState(seed)
+    student = 0.5 * rng.randn(num_students, input_dimension)
+    teacher_1 = rng.randn(num_teachers, input_dimension)
+    teacher_2 = rng.randn(num_teachers, input_dimension)
+
+    def overlap(a, b):
+        return a @ b.T / input_dimension
+
+    return configuration.StudentTwoTeacherConfiguration(
+        Q=overlap(student, student),
+        R=overlap(student, teacher_1),
+        U=overlap(student, teacher_2),
+        T=overlap(teacher_1, teacher_1),
+        S=overlap(teacher_2, teacher_2),
+        V=overlap(teacher_1, teacher_2),
+        h1=rng.randn(num_students),
+        h2=rng.randn(num_students),
+        th1=rng.randn(num_teachers),
+        th2=rng.randn(num_teachers),
+    )
+
+
+def make_ode(ode_class, overlap_configuration, **changes):
+    arguments = dict(
+        overlap_configuration=overlap_configuration,
+        nonlinearity="scaled_erf",
+        w_learning_rate=1.0,
+        h_learning_rate=1.0,
+        dt=0.01,
+        soft_committee=False,
+        train_first_layer=True,
+        train_head_layer=True,
+        frozen_feature=False,
+    )
+    arguments.update(changes)
+    return ode_class(**arguments)
+
+
+class EngineEquivalenceTest(unittest.TestCase):
+    """Loop, vectorised and JIT engines integrate the same dynamics."""
+
+    def _assert_same_trajectory(self, ode_class, atol: float) -> None:
+        for seed in range(3):
+            reference = make_ode(dynamics.StudentTeacherODE, random_configuration(seed))
+            ode = make_ode(ode_class, random_configuration(seed))
+            for step in range(NUM_STEPS):
+                if step == SWITCH_STEP:
+                    reference.switch_teacher()
+                    ode.switch_teacher()
+                for quantity in QUANTITIES:
+                    np.testing.assert_allclose(
+                        getattr(ode, quantity),
+                        getattr(reference, quantity),
+                        rtol=0,
+                        atol=atol,
+                        err_msg=f"{quantity} at step {step} (seed {seed})",
+                    )
+                reference.step()
+                ode.step()
+            np.testing.assert_allclose(ode.state, reference.state, rtol=0, atol=atol)
+
+    def test_vectorised(self):
+        self._assert_same_trajectory(
+            vectorised_dynamics.VectorisedStudentTeacherODE, atol=1e-14
+        )
+
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba not installed")
+    def test_jit(self):
+        from ode import jit_dynamics
+
+        self._assert_same_trajectory(jit_dynamics.JITStudentTeacherODE, atol=1e-14)
+
+
+class EnsembleEquivalenceTest(unittest.TestCase):
+    """Members of an ensemble integrate as they would on their own."""
+
+    def test_members(self):
+        seeds = range(3)
+        ensemble = make_ode(
+            vectorised_dynamics.VectorisedStudentTeacherODE,
+            configuration.EnsembleStudentTwoTeacherConfiguration(
+                configurations=[random_configuration(seed) for seed in seeds]
+            ),
+        )
+        members = [
+            make_ode(
+                vectorised_dynamics.VectorisedStudentTeacherODE,
+                random_configuration(seed),
+            )
+            for seed in seeds
+        ]
+
+        for step in range(NUM_STEPS):
+            if step == SWITCH_STEP:
+                ensemble.switch_teacher()
+                for member in members:
+                    member.switch_teacher()
+            for quantity in QUANTITIES:
+                np.testing.assert_allclose(
+                    getattr(ensemble, quantity),
+                    np.stack([getattr(member, quantity) for member in members]),
+                    rtol=0,
+                    atol=1e-14,
+                    err_msg=f"{quantity} at step {step}",
+                )
+            ensemble.step()
+            for member in members:
+                member.step()
+
+        np.testing.assert_allclose(
+            ensemble.state,
+            np.stack([member.state for member in members]),
+            rtol=0,
+            atol=1e-14,
+        )
+        np.testing.assert_allclose(
+            ensemble.error_1_log,
+            np.stack([member.error_1_log for member in members], axis=-1),
+            rtol=0,
+            atol=1e-14,
+        )
+
+    def test_mismatched_shapes(self):
+        with self.assertRaises(ValueError):
+            configuration.EnsembleStudentTwoTeacherConfiguration(
+                configurations=[
+                    random_configuration(0),
+                    random_configuration(1, num_students=4),
+                ]
+            )
+
+    def test_invalid_member(self):
+        ensemble_configuration = configuration.EnsembleStudentTwoTeacherConfiguration(
+            configurations=[random_configuration(seed) for seed in range(3)]
+        )
+        state = ensemble_configuration.state
+        # (last entry of state is a head weight of the second teacher's task.)
+        state[1, -1] = np.nan
+        ensemble_configuration.set_state(state)
+        ensemble = make_ode(
+            vectorised_dynamics.VectorisedStudentTeacherODE, ensemble_configuration
+        )
+
+        with self.assertRaisesRegex(ValueError, r"members \[1\]"):
+            ensemble.error_2
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+
+from ode import integrators
+from ode import vectorised_dynamics
+from tests.ode_tests import dynamics_test
+
+
+def rotation(state: np.ndarray) -> np.ndarray:
+    """Harmonic oscillator, y'' = -y, as a first order system."""
+    return np.stack((state[..., 1], -state[..., 0]), axis=-1)
+
+
+def integrate(integrator, derivative_fn, state, time, timestep):
+    """Integrate from state up to time, landing on it exactly."""
+    elapsed = 0.0
+    while time - elapsed > 1e-12:
+        state, timestep_taken, next_timestep = integrator.step(
+            derivative_fn=derivative_fn,
+            state=state,
+            timestep=min(timestep, time - elapsed),
+        )
+        elapsed += timestep_taken
+        if integrator.adaptive:
+            timestep = next_timestep
+    return state
+
+
+class IntegratorTest(unittest.TestCase):
+    def _convergence_rate(self, integrator) -> float:
+        """Observed order of global error at t = 1 when halving the step."""
+        exact = np.array([np.cos(1.0), -np.sin(1.0)])
+        errors = [
+            np.max(
+                np.abs(
+                    integrate(integrator, rotation, np.array([1.0, 0.0]), 1.0, timestep)
+                    - exact
+                )
+            )
+            for timestep in [0.1, 0.05]
+        ]
+        return np.log2(errors[0] / errors[1])
+
+    def test_euler_order(self):
+        self.assertAlmostEqual(
+            self._convergence_rate(integrators.EulerIntegrator()), 1, delta=0.2
+        )
+
+    def test_rk4_order(self):
+        self.assertAlmostEqual(
+            self._convergence_rate(integrators.RK4Integrator()), 4, delta=0.2
+        )
+
+    def test_dormand_prince_tolerance(self):
+        integrator = integrators.DormandPrinceIntegrator(
+            relative_tolerance=1e-8, absolute_tolerance=1e-10
+        )
+        # batch of states sharing each step.
+        state = np.array([[1.0, 0.0], [0.0, 2.0]])
+        final_state = integrate(integrator, rotation, state, 5.0, timestep=1.0)
+        exact = np.array(
+            [[np.cos(5.0), -np.sin(5.0)], [2 * np.sin(5.0), 2 * np.cos(5.0)]]
+        )
+        np.testing.assert_allclose(final_state, exact, rtol=0, atol=1e-6)
+        # initial step of 1.0 is too large for the tolerances.
+        self.assertGreater(integrator.num_rejected_steps, 0)
+
+    def test_dormand_prince_minimum_step(self):
+        integrator = integrators.DormandPrinceIntegrator(
+            relative_tolerance=0.0, absolute_tolerance=1e-30, min_timestep=1e-3
+        )
+        with self.assertRaises(RuntimeError):
+            integrator.step(
+                derivative_fn=lambda state: -(state ** 2),
+                state=np.array([1.0]),
+                timestep=1.0,
+            )
+
+
+class StudentTeacherODEIntegratorTest(unittest.TestCase):
+    """Higher order integrators converge to the same order parameters."""
+
+    def _final_state(self, integrator, timestep: float) -> np.ndarray:
+        ode = dynamics_test.make_ode(
+            vectorised_dynamics.VectorisedStudentTeacherODE,
+            dynamics_test.random_configuration(0),
+            dt=timestep,
+            integrator=integrator,
+        )
+        while 0.5 - ode.time > 1e-12:
+            ode.step(max_timestep=0.5 - ode.time)
+        return ode.state
+
+    def test_rk4_dormand_prince(self):
+        rk4 = self._final_state(integrators.RK4Integrator(), timestep=0.01)
+        dormand_prince = self._final_state(
+            integrators.DormandPrinceIntegrator(
+                relative_tolerance=1e-10, absolute_tolerance=1e-12
+            ),
+            timestep=0.01,
+        )
+        euler = self._final_state(integrators.EulerIntegrator(), timestep=0.01)
+
+        np.testing.assert_allclose(rk4, dormand_prince, rtol=0, atol=1e-8)
+        # (first order error is resolved.)
+        self.assertGreater(np.max(np.abs(euler - rk4)), 1e-5)
@@ -0,0 +1,4 @@
+from . import base_regulariser_test
+from . import ewc_test
+
+__all__ = ["base_regulariser_test", "ewc_test"]
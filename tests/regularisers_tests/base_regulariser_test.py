@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+import torch
+from torch import nn
+
+from regularisers import quadratic_penalty
+from regularisers import synaptic_intelligence
+
+
+# names of (non-head) parameters penalised by regularisers.
+SHARED_PARAMETERS = ["layers.0.weight", "layers.0.bias"]
+
+
+class _Student(nn.Module):
+    """Student with shared and head parameters, and (settable) path integral
+    contributions as read by synaptic intelligence."""
+
+    def __init__(self):
+        super().__init__()
+        self.layers = nn.ModuleList([nn.Linear(5, 3).double()])
+        self.heads = nn.ModuleList([nn.Linear(3, 1).double()])
+        self.previous_task_path_integral_contributions = None
+
+
+def explicit_penalty(importance, parameters, importances, anchors):
+    """sum_t omega_t * (theta - theta_t) ** 2 over previous tasks t."""
+    return importance * sum(
+        (omega * (parameters - anchor) ** 2).sum()
+        for omega, anchor in zip(importances, anchors)
+    )
+
+
+class BaseRegulariserTest(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self._student = _Student()
+
+    def _switch(self, regulariser) -> None:
+        regulariser.compute_first_task_importance(
+            student=self._student,
+            previous_teacher_index=0,
+            previous_teacher=None,
+            loss_function=None,
+            data_module=None,
+        )
+
+    def _shared_parameters(self) -> torch.Tensor:
+        return torch.cat(
+            [param.flatten() for param in self._student.layers.parameters()]
+        )
+
+    def _perturb(self) -> None:
+        with torch.no_grad():
+            for param in self._student.parameters():
+                param.add_(torch.randn_like(param))
+
+    def test_signed_importances(self):
+        """Signed (SI) importances over several switches, including ones that
+        cancel, give the explicit sum of the penalties of previous tasks."""
+        regulariser = synaptic_intelligence.SynapticIntelligence(
+            importance=0.3, device="cpu"
+        )
+        importances = []
+        anchors = []
+        for switch in range(4):
+            contributions = {
+                n: torch.randn_like(param)
+                for n, param in self._student.named_parameters()
+            }
+            if switch == 1:
+                # cancels importances of first task.
+                contributions = {n: -omega for n, omega in previous.items()}
+            previous = contributions
+
+            self._student.previous_task_path_integral_contributions = contributions
+            self._switch(regulariser)
+            importances.append(
+                torch.cat([contributions[n].flatten() for n in SHARED_PARAMETERS])
+            )
+            anchors.append(self._shared_parameters().detach().clone())
+            self._perturb()
+
+            penalty = regulariser.penalty(self._student)
+            expected = explicit_penalty(
+                0.3, self._shared_parameters(), importances, anchors
+            )
+            self.assertAlmostEqual(penalty.item(), expected.item(), places=10)
+
+        # gradients wrt shared parameters agree as well.
+        gradients = torch.autograd.grad(
+            regulariser.penalty(self._student), list(self._student.layers.parameters())
+        )
+        expected_gradients = torch.autograd.grad(
+            explicit_penalty(0.3, self._shared_parameters(), importances, anchors),
+            list(self._student.layers.parameters()),
+        )
+        for gradient, expected_gradient in zip(gradients, expected_gradients):
+            np.testing.assert_allclose(gradient.numpy(), expected_gradient.numpy())
+
+    def test_anchor(self):
+        """Penalty vanishes at the anchor of a single previous task."""
+        regulariser = quadratic_penalty.QuadraticPenalty(importance=1.0, device="cpu")
+        self._switch(regulariser)
+        self.assertAlmostEqual(regulariser.penalty(self._student).item(), 0.0)
+        self._perturb()
+        self.assertGreater(regulariser.penalty(self._student).item(), 0.0)
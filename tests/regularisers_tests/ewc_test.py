@@ -0,0 +1,113 @@
+import unittest
+
+import numpy as np
+import torch
+from torch import nn
+
+import constants
+from regularisers import ewc
+from students import continual_student
+
+INPUT_DIMENSION = 20
+NUM_SAMPLES = 50
+
+
+class _DataModule:
+    """Gives a fixed test set, as read by EWC."""
+
+    def __init__(self, dataset: torch.Tensor):
+        self._dataset = dataset
+
+    def get_test_data(self):
+        return {constants.Constants.X: self._dataset}
+
+
+def make_student(**changes) -> continual_student.ContinualStudent:
+    arguments = dict(
+        input_dimension=INPUT_DIMENSION,
+        hidden_dimensions=[4, 3],
+        output_dimension=1,
+        bias=True,
+        loss_type="regression",
+        nonlinearity="scaled_erf",
+        initialise_outputs=True,
+        apply_nonlinearity_on_output=False,
+        soft_committee=False,
+        train_hidden_layers=True,
+        train_head_layer=True,
+        freeze_features=[],
+        scale_hidden_lr=True,
+        scale_head_lr=True,
+        scale_forward_by_hidden=False,
+        num_teachers=2,
+        learning_rate=0.5,
+        initialisation_std=0.5,
+    )
+    arguments.update(changes)
+    return continual_student.ContinualStudent(**arguments)
+
+
+class EWCTest(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self._student = make_student()
+        self._student.signal_task_boundary(new_task=1)
+        self._teacher = nn.Linear(INPUT_DIMENSION, 1)
+        self._dataset = torch.randn(NUM_SAMPLES, INPUT_DIMENSION)
+        self._loss_function = nn.MSELoss()
+
+    def _explicit_fisher(self, num_samples: int):
+        """Squared gradients of the loss on each sample, averaged over samples,
+        with the head of the previous task."""
+        self._student.signal_task_boundary(new_task=0)
+        params = {n: p for n, p in self._student.named_parameters() if "heads" not in n}
+        fisher = {n: torch.zeros_like(param) for n, param in params.items()}
+        for data in self._dataset[:num_samples]:
+            self._student.zero_grad()
+            loss = self._loss_function(
+                self._student(data[None]), self._teacher(data[None]).detach()
+            )
+            loss.backward()
+            for n, param in params.items():
+                fisher[n] += param.grad ** 2 / num_samples
+        self._student.signal_task_boundary(new_task=1)
+        return fisher
+
+    def _fisher(self, **changes):
+        regulariser = ewc.EWC(importance=1.0, device="cpu", **changes)
+        regulariser.compute_first_task_importance(
+            student=self._student,
+            previous_teacher_index=0,
+            previous_teacher=self._teacher,
+            loss_function=self._loss_function,
+            data_module=_DataModule(self._dataset),
+        )
+        # heads of current task are restored.
+        self.assertEqual(self._student.current_teacher, 1)
+        return regulariser._precision_matrices
+
+    def _assert_same_fisher(self, fisher, explicit_fisher):
+        self.assertEqual(set(fisher), set(explicit_fisher))
+        for n, precision in fisher.items():
+            np.testing.assert_allclose(
+                precision.numpy(),
+                explicit_fisher[n].numpy(),
+                rtol=1e-4,
+                atol=1e-10,
+                err_msg=n,
+            )
+
+    def test_batched_fisher(self):
+        """Batched Fisher information agrees with per sample gradients, for
+        chunks that do not divide the test set."""
+        for chunk_size in [1, 7, NUM_SAMPLES]:
+            with self.subTest(chunk_size=chunk_size):
+                self._assert_same_fisher(
+                    self._fisher(chunk_size=chunk_size),
+                    self._explicit_fisher(NUM_SAMPLES),
+                )
+
+    def test_fisher_samples(self):
+        self._assert_same_fisher(
+            self._fisher(fisher_samples=20, chunk_size=7), self._explicit_fisher(20)
+        )
@@ -0,0 +1,8 @@
+# test modules are not imported eagerly, as they require config_manager
+# (see conftest).
+__all__ = [
+    "batched_network_runner_test",
+    "ensemble_ode_runner_test",
+    "network_runner_test",
+    "ode_runner_test",
+]
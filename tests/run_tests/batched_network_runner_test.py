@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import constants
+from run import batched_network_runner
+from run import network_runner
+from tests.run_tests import configuration_utils
+from tests.run_tests import network_runner_test
+from utils import experiment_utils
+
+
+def network_log(runner: network_runner.NetworkRunner) -> pd.DataFrame:
+    return pd.read_csv(
+        os.path.join(runner._checkpoint_path, constants.Constants.NETWORK_CSV)
+    )
+
+
+class BatchedNetworkRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self._checkpoint_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._checkpoint_folder)
+
+    def _runner(self, name: str, seed: int, **changes) -> network_runner.NetworkRunner:
+        config = configuration_utils.run_configuration(
+            checkpoint_path=os.path.join(self._checkpoint_folder, name),
+            **{
+                **network_runner_test.TEST_CONFIG_CHANGES,
+                constants.Constants.SEED: seed,
+                # learning rates may differ between members.
+                constants.Constants.LEARNING_RATE: 0.5 + 0.25 * seed,
+                **changes,
+            },
+        )
+        experiment_utils.set_random_seeds(seed)
+        return network_runner.NetworkRunner(config=config)
+
+    def test_serial_training(self):
+        """Members of batched training log as they would in serial runs."""
+        seeds = range(3)
+
+        serial_logs = []
+        for seed in seeds:
+            runner = self._runner(f"serial_{seed}", seed)
+            runner.train()
+            serial_logs.append(network_log(runner))
+
+        runners = [self._runner(f"batched_{seed}", seed) for seed in seeds]
+        batched_network_runner.BatchedNetworkRunner(runners).train()
+
+        for runner, serial_log in zip(runners, serial_logs):
+            log = network_log(runner)
+            self.assertEqual(list(log.columns), list(serial_log.columns))
+            # (networks are trained in float32.)
+            np.testing.assert_allclose(log.values, serial_log.values, atol=1e-5)
+
+    def test_shared_curriculum(self):
+        runners = [
+            self._runner("0", 0),
+            self._runner("1", 1, **{constants.Constants.SWITCH_STEPS: [250]}),
+        ]
+        with self.assertRaises(ValueError):
+            batched_network_runner.BatchedNetworkRunner(runners).train()
@@ -0,0 +1,27 @@
+import os
+
+import torch
+
+import constants
+from run import config_template
+from run import student_teacher_config
+
+FILE_PATH = os.path.dirname(os.path.realpath(__file__))
+CONFIG_PATH = os.path.join(FILE_PATH, os.pardir, os.pardir, "run", "config.yaml")
+
+
+def run_configuration(
+    checkpoint_path: str, **changes
+) -> student_teacher_config.StudentTeacherConfiguration:
+    """Configuration of run/config.yaml amended by changes (values by property
+    name), for a run on the cpu checkpointing to checkpoint_path."""
+    config = student_teacher_config.StudentTeacherConfiguration(
+        config=CONFIG_PATH, template=config_template.ConfigTemplate.base_config_template
+    )
+    for property_name, value in changes.items():
+        config.amend_property(property_name=property_name, new_property_value=value)
+
+    os.makedirs(checkpoint_path, exist_ok=True)
+    config.add_property(constants.Constants.CHECKPOINT_PATH, checkpoint_path)
+    config.add_property(constants.Constants.EXPERIMENT_DEVICE, torch.device("cpu"))
+    return config
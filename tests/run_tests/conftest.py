@@ -0,0 +1,4 @@
+import pytest
+
+# runners are configured through config_manager (see requirements.txt).
+pytest.importorskip("config_manager", reason="config_manager not installed")
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import constants
+from run import ensemble_ode_runner
+from run import network_runner
+from run import ode_runner
+from tests.run_tests import configuration_utils
+from utils import experiment_utils
+
+# short ode runs of the vectorised engine, with a switch.
+TEST_CONFIG_CHANGES = {
+    constants.Constants.ENGINE: constants.Constants.VECTORISED,
+    constants.Constants.TOTAL_TRAINING_STEPS: 1000,
+    constants.Constants.SWITCH_STEPS: [500],
+    constants.Constants.INPUT_DIMENSION: 100,
+    constants.Constants.CHECKPOINT_FREQUENCY: 500,
+    constants.Constants.LOG_OVERLAPS: True,
+}
+
+
+class EnsembleODERunnerTest(unittest.TestCase):
+    def setUp(self):
+        self._checkpoint_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._checkpoint_folder)
+
+    def _member(self, name: str, seed: int, **changes):
+        """Configuration and initial network configuration of a member."""
+        config = configuration_utils.run_configuration(
+            checkpoint_path=os.path.join(self._checkpoint_folder, name),
+            **{**TEST_CONFIG_CHANGES, constants.Constants.SEED: seed, **changes},
+        )
+        experiment_utils.set_random_seeds(seed)
+        return config, network_runner.initial_network_configuration(config=config)
+
+    @staticmethod
+    def _ode_log(config) -> pd.DataFrame:
+        return pd.read_csv(
+            os.path.join(config.checkpoint_path, constants.Constants.ODE_CSV),
+            float_precision="round_trip",
+        )
+
+    def test_members(self):
+        """Members log as they would in single ODE runs."""
+        seeds = range(3)
+        configs, network_configurations = zip(
+            *[self._member(f"ensemble_{seed}", seed) for seed in seeds]
+        )
+        ensemble_ode_runner.EnsembleODERunner(
+            configs=list(configs), network_configurations=list(network_configurations)
+        ).run()
+
+        for seed, config in zip(seeds, configs):
+            single_config, network_configuration = self._member(f"single_{seed}", seed)
+            ode_runner.ODERunner(
+                config=single_config, network_configuration=network_configuration
+            ).run()
+
+            log = self._ode_log(config)
+            single_log = self._ode_log(single_config)
+            self.assertEqual(list(log.columns), list(single_log.columns))
+            np.testing.assert_allclose(log.values, single_log.values, atol=1e-12)
+
+    def test_shared_settings(self):
+        members = [
+            self._member("0", 0),
+            self._member("1", 1, **{constants.Constants.LEARNING_RATE: 0.5}),
+        ]
+        configs, network_configurations = zip(*members)
+        with self.assertRaisesRegex(ValueError, constants.Constants.LEARNING_RATE):
+            ensemble_ode_runner.EnsembleODERunner(
+                configs=list(configs),
+                network_configurations=list(network_configurations),
+            )
@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import torch
+
+import constants
+from run import network_runner
+from tests.run_tests import configuration_utils
+from utils import experiment_utils
+
+# short runs of small networks, without consolidation or saved weights.
+TEST_CONFIG_CHANGES = {
+    constants.Constants.TOTAL_TRAINING_STEPS: 1000,
+    constants.Constants.SWITCH_STEPS: [500],
+    constants.Constants.INPUT_DIMENSION: 100,
+    constants.Constants.TEST_BATCH_SIZE: 1000,
+    constants.Constants.CHECKPOINT_FREQUENCY: 500,
+    constants.Constants.LOG_OVERLAPS: True,
+    constants.Constants.VERBOSE: False,
+    constants.Constants.CONSOLIDATION_TYPE: None,
+    constants.Constants.SAVE_WEIGHTS_AT_SWITCH: False,
+    constants.Constants.SAVE_INITIAL_WEIGHTS: False,
+    constants.Constants.SAVE_TEACHER_WEIGHTS: False,
+}
+
+
+class NetworkRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self._checkpoint_folder = tempfile.mkdtemp()
+        self._num_runners = 0
+
+    def tearDown(self):
+        shutil.rmtree(self._checkpoint_folder)
+
+    def _runner(self, **changes) -> network_runner.NetworkRunner:
+        config = configuration_utils.run_configuration(
+            checkpoint_path=os.path.join(
+                self._checkpoint_folder, str(self._num_runners)
+            ),
+            **{**TEST_CONFIG_CHANGES, **changes},
+        )
+        self._num_runners += 1
+        experiment_utils.set_random_seeds(config.seed)
+        return network_runner.NetworkRunner(config=config)
+
+    @staticmethod
+    def _network_log(runner: network_runner.NetworkRunner) -> pd.DataFrame:
+        return pd.read_csv(
+            os.path.join(runner._checkpoint_path, constants.Constants.NETWORK_CSV)
+        )
+
+    def test_manual_gradients(self):
+        """Runs with hand derived and autograd gradients log the same."""
+        logs = []
+        for gradient_engine in [
+            constants.Constants.AUTOGRAD,
+            constants.Constants.MANUAL,
+        ]:
+            runner = self._runner(
+                **{constants.Constants.GRADIENT_ENGINE: gradient_engine}
+            )
+            runner.train()
+            logs.append(self._network_log(runner))
+
+        self.assertEqual(list(logs[0].columns), list(logs[1].columns))
+        # (networks are trained in float32.)
+        np.testing.assert_allclose(logs[1].values, logs[0].values, atol=1e-5)
+
+    def test_analytic_errors(self):
+        """Analytic generalisation errors agree with Monte Carlo estimates."""
+        monte_carlo = self._runner(
+            **{
+                constants.Constants.ERROR_EVALUATION: constants.Constants.MONTE_CARLO,
+                constants.Constants.TEST_BATCH_SIZE: 50000,
+            }
+        )
+        monte_carlo._setup_training()
+        # student away from its (small) initialisation.
+        with torch.no_grad():
+            for parameter in monte_carlo._student.parameters():
+                parameter.normal_()
+
+        analytic = self._runner(
+            **{constants.Constants.ERROR_EVALUATION: constants.Constants.ANALYTIC}
+        )
+        analytic._student.load_state_dict(monte_carlo._student.state_dict())
+        for teacher, monte_carlo_teacher in zip(
+            analytic._teachers.teachers, monte_carlo._teachers.teachers
+        ):
+            teacher.load_state_dict(monte_carlo_teacher.state_dict())
+
+        # (monte carlo estimates over 50000 test inputs.)
+        np.testing.assert_allclose(
+            analytic._compute_generalisation_errors(),
+            monte_carlo._compute_generalisation_errors(),
+            rtol=0.05,
+        )
+
+    def test_chunked_training(self):
+        """Training in chunks between scheduled events logs as step by step
+        training, for events that do not align with task switches."""
+        changes = {
+            constants.Constants.TEST_FREQUENCY: 7,
+            constants.Constants.LOG_FREQUENCY: 13,
+        }
+        for stopping_condition, curriculum_changes in [
+            (
+                constants.Constants.SWITCH_STEPS,
+                {constants.Constants.SWITCH_STEPS: [333]},
+            ),
+            (
+                constants.Constants.FIXED_PERIOD,
+                {constants.Constants.FIXED_PERIOD: 333},
+            ),
+        ]:
+            with self.subTest(stopping_condition=stopping_condition):
+                changes.update(curriculum_changes)
+                changes[constants.Constants.STOPPING_CONDITION] = stopping_condition
+
+                chunked = self._runner(**changes)
+                chunked.train()
+                self.assertIsNotNone(chunked._event_schedule)
+
+                with mock.patch.object(
+                    network_runner.NetworkRunner,
+                    "_setup_event_schedule",
+                    return_value=None,
+                ):
+                    step_by_step = self._runner(**changes)
+                    step_by_step.train()
+
+                np.testing.assert_array_equal(
+                    self._network_log(chunked).values,
+                    self._network_log(step_by_step).values,
+                )
+
+    def test_threshold_curriculum(self):
+        """Switches on error thresholds cannot be scheduled."""
+        runner = self._runner(
+            **{
+                constants.Constants.STOPPING_CONDITION: (
+                    constants.Constants.LOSS_THRESHOLDS
+                ),
+                constants.Constants.LOSS_THRESHOLDS: [0.1],
+            }
+        )
+        runner.train()
+        self.assertIsNone(runner._event_schedule)
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import constants
+from ode import vectorised_dynamics
+from run import network_runner
+from run import ode_runner
+from tests.run_tests import configuration_utils
+from utils import experiment_utils
+
+# two long tasks of a single student unit, over which the order parameters
+# converge, starting from the plateau of small initial student weights (along
+# which derivatives are below STEADY_STATE_TOLERANCE).
+STEADY_STATE_TOLERANCE = 1e-3
+TEST_CONFIG_CHANGES = {
+    constants.Constants.STUDENT_HIDDEN_LAYERS: [1],
+    constants.Constants.ENGINE: constants.Constants.VECTORISED,
+    constants.Constants.TIMESTEP: 0.1,
+    constants.Constants.TOTAL_TRAINING_STEPS: 40000,
+    constants.Constants.SWITCH_STEPS: [20000],
+    constants.Constants.INPUT_DIMENSION: 100,
+    constants.Constants.CHECKPOINT_FREQUENCY: 10000,
+}
+
+
+class ODERunnerTest(unittest.TestCase):
+    def setUp(self):
+        self._checkpoint_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._checkpoint_folder)
+
+    def _ode_log(self, name: str, **changes) -> pd.DataFrame:
+        config = configuration_utils.run_configuration(
+            checkpoint_path=os.path.join(self._checkpoint_folder, name),
+            **{**TEST_CONFIG_CHANGES, **changes},
+        )
+        experiment_utils.set_random_seeds(config.seed)
+        ode_runner.ODERunner(
+            config=config,
+            network_configuration=network_runner.initial_network_configuration(
+                config=config
+            ),
+        ).run()
+        return pd.read_csv(
+            os.path.join(config.checkpoint_path, constants.Constants.ODE_CSV)
+        )
+
+    def test_steady_state_skip(self):
+        """Converged stretches are skipped, the initial plateau is not."""
+        log = self._ode_log("full")
+        with mock.patch.object(
+            vectorised_dynamics.VectorisedStudentTeacherODE,
+            "skip",
+            autospec=True,
+            side_effect=vectorised_dynamics.VectorisedStudentTeacherODE.skip,
+        ) as skip:
+            skipped_log = self._ode_log(
+                "skipped",
+                **{constants.Constants.STEADY_STATE_TOLERANCE: STEADY_STATE_TOLERANCE},
+            )
+        skip.assert_called()
+
+        self.assertEqual(list(log.columns), list(skipped_log.columns))
+        self.assertEqual(len(log), len(skipped_log))
+
+        # logs are identical up to the first skip, which only comes after
+        # the error has left its initial plateau.
+        differing_rows = np.flatnonzero((log.values != skipped_log.values).any(axis=1))
+        self.assertGreater(len(differing_rows), 0)
+        first_skipped_row = differing_rows[0]
+        error = log[f"{constants.Constants.GENERALISATION_ERROR}_0"]
+        self.assertLess(error[first_skipped_row], 0.5 * error[0])
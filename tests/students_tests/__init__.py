@@ -0,0 +1,3 @@
+from . import continual_student_test
+
+__all__ = ["continual_student_test"]
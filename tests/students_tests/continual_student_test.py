@@ -0,0 +1,90 @@
+import copy
+import unittest
+
+import numpy as np
+import torch
+from torch import nn
+
+from students import continual_student
+
+INPUT_DIMENSION = 50
+NUM_STEPS = 20
+
+
+def make_student(nonlinearity: str, **changes) -> continual_student.ContinualStudent:
+    arguments = dict(
+        input_dimension=INPUT_DIMENSION,
+        hidden_dimensions=[3],
+        output_dimension=1,
+        bias=False,
+        loss_type="regression",
+        nonlinearity=nonlinearity,
+        initialise_outputs=True,
+        apply_nonlinearity_on_output=False,
+        soft_committee=False,
+        train_hidden_layers=True,
+        train_head_layer=True,
+        freeze_features=[],
+        scale_hidden_lr=True,
+        scale_head_lr=True,
+        scale_forward_by_hidden=False,
+        num_teachers=2,
+        learning_rate=0.5,
+        initialisation_std=0.5,
+    )
+    arguments.update(changes)
+    return continual_student.ContinualStudent(**arguments)
+
+
+class ManualSGDTest(unittest.TestCase):
+    """Hand derived SGD steps agree with torch optimiser steps."""
+
+    def _assert_same_training(self, nonlinearity: str, batch_size: int, **changes):
+        torch.manual_seed(0)
+        autograd_student = make_student(nonlinearity, **changes)
+        manual_student = copy.deepcopy(autograd_student)
+        for student in [autograd_student, manual_student]:
+            student.signal_task_boundary(new_task=1)
+
+        optimiser = torch.optim.SGD(autograd_student.get_trainable_parameters(), lr=0.5)
+        loss_function = nn.MSELoss()
+
+        for _ in range(NUM_STEPS):
+            x = torch.randn(batch_size, INPUT_DIMENSION)
+            target = torch.randn(batch_size, 1)
+
+            optimiser.zero_grad()
+            loss = 0.5 * loss_function(autograd_student(x), target)
+            loss.backward()
+            optimiser.step()
+
+            manual_student.sgd_step(x=x, target=target)
+
+        for (name, parameter), manual_parameter in zip(
+            autograd_student.named_parameters(), manual_student.parameters()
+        ):
+            np.testing.assert_allclose(
+                manual_parameter.detach().numpy(),
+                parameter.detach().numpy(),
+                rtol=1e-5,
+                atol=1e-6,
+                err_msg=name,
+            )
+
+    def test_nonlinearities(self):
+        for nonlinearity in ["scaled_erf", "relu", "sigmoid", "linear"]:
+            for batch_size in [1, 7]:
+                with self.subTest(nonlinearity=nonlinearity, batch_size=batch_size):
+                    self._assert_same_training(nonlinearity, batch_size)
+
+    def test_untrained_head(self):
+        self._assert_same_training("scaled_erf", 1, train_head_layer=False)
+
+    def test_forward_scaling(self):
+        self._assert_same_training(
+            "scaled_erf",
+            1,
+            scale_forward_by_hidden=True,
+            scale_hidden_lr=False,
+            scale_head_lr=False,
+        )
@@ -0,0 +1,3 @@
+from . import event_schedule_test
+
+__all__ = ["event_schedule_test"]
@@ -0,0 +1,33 @@
+import unittest
+
+from utils import event_schedule
+
+
+def all_events(schedule: event_schedule.EventSchedule, total_steps: int):
+    events = []
+    step = 0
+    while step < total_steps:
+        step = schedule.next_event(step)
+        events.append(step)
+    return events
+
+
+class EventScheduleTest(unittest.TestCase):
+    def test_periodic(self):
+        schedule = event_schedule.EventSchedule(periods=[4, 6], total_steps=15)
+        self.assertEqual(all_events(schedule, 15), [4, 6, 8, 12, 15])
+
+    def test_one_off(self):
+        schedule = event_schedule.EventSchedule(periods=[10], total_steps=30)
+        schedule.add(7)
+        schedule.add(10)
+        schedule.add(25)
+        self.assertEqual(all_events(schedule, 30), [7, 10, 20, 25, 30])
+
+    def test_added_during_training(self):
+        schedule = event_schedule.EventSchedule(periods=[10], total_steps=30)
+        self.assertEqual(schedule.next_event(0), 10)
+        # events up to the current step are dropped.
+        schedule.add(5)
+        schedule.add(13)
+        self.assertEqual(schedule.next_event(10), 13)
@@ -0,0 +1,104 @@
+from typing import List
+
+import numpy as np
+
+import constants
+from utils import network_configuration
+
+
+def _i2(
+    cross_covariance: np.ndarray,
+    variances_a: np.ndarray,
+    variances_b: np.ndarray,
+    nonlinearity: str,
+) -> np.ndarray:
+    """Matrix of E[g(x_a) g(x_b)] for zero mean Gaussian preactivations.
+
+    Args:
+        cross_covariance: covariances between preactivations a and b.
+        variances_a: variances of preactivations a.
+        variances_b: variances of preactivations b.
+        nonlinearity: name of activation function g.
+
+    Returns:
+        i2: expectations, same shape as cross_covariance.
+
+    Raises:
+        ValueError: if no closed form is implemented for nonlinearity.
+    """
+    if nonlinearity == constants.Constants.SCALED_ERF:
+        normalisation = np.sqrt(np.outer(1 + variances_a, 1 + variances_b))
+        i2 = 2 * np.arcsin(cross_covariance / normalisation) / np.pi
+    elif nonlinearity == constants.Constants.LINEAR:
+        i2 = cross_covariance
+    else:
+        raise ValueError(
+            f"No closed form generalisation error for nonlinearity {nonlinearity}."
+        )
+    return i2
+
+
+def iid_gaussian_generalisation_errors(
+    network_config: network_configuration.NetworkConfiguration,
+    nonlinearity: str,
+    covariance_scaling: float,
+    student_forward_scaling: float,
+    teacher_forward_scaling: float,
+) -> List[float]:
+    """Exact generalisation errors, 0.5 * E[(student - teacher)^2], of student
+    with respect to each teacher for zero mean IID Gaussian inputs.
+
+    These are functions of the order parameters only: the hidden
+    preactivations of student and teachers are jointly Gaussian with
+    covariances given by the overlaps Q, R and T (up to covariance_scaling).
+
+    Args:
+        network_config: overlaps and head weights of student and teachers.
+        nonlinearity: activation function of student and teachers.
+        covariance_scaling: ratio of preactivation covariances to overlaps
+        (input variance * forward hidden scaling ** 2 * input dimension).
+        student_forward_scaling: scaling of student output.
+        teacher_forward_scaling: scaling of teacher output.
+
+    Returns:
+        generalisation_errors: one per student head / teacher pair.
+    """
+    Q = covariance_scaling * network_config.student_self_overlap
+    student_variances = np.diag(Q)
+    student_self_term = _i2(Q, student_variances, student_variances, nonlinearity)
+
+    generalisation_errors = []
+
+    for student_head, teacher_head, R, T in zip(
+        network_config.student_head_weights,
+        network_config.teacher_head_weights,
+        network_config.student_teacher_overlaps,
+        network_config.teacher_self_overlaps,
+    ):
+        R = covariance_scaling * R
+        T = covariance_scaling * T
+        teacher_variances = np.diag(T)
+
+        student_student = student_forward_scaling ** 2 * (
+            student_head @ student_self_term @ student_head
+        )
+        student_teacher = (
+            student_forward_scaling
+            * teacher_forward_scaling
+            * (
+                student_head
+                @ _i2(R, student_variances, teacher_variances, nonlinearity)
+                @ teacher_head
+            )
+        )
+        teacher_teacher = teacher_forward_scaling ** 2 * (
+            teacher_head
+            @ _i2(T, teacher_variances, teacher_variances, nonlinearity)
+            @ teacher_head
+        )
+
+        generalisation_errors.append(
+            float(0.5 * (student_student - 2 * student_teacher + teacher_teacher))
+        )
+
+    return generalisation_errors
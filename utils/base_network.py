@@ -42,6 +42,7 @@ class BaseNetwork(nn.Module, abc.ABC):
         self._forward_scaling = forward_scaling
 
         self._nonlinear_function = self._get_nonlinear_function()
+        self._nonlinear_derivative = self._get_nonlinear_derivative()
         self._construct_layers()
 
     @property
@@ -76,6 +77,28 @@ class BaseNetwork(nn.Module, abc.ABC):
             raise ValueError(f"Unknown non-linearity: {self._nonlinearity}")
         return nonlinear_function
 
+    def _get_nonlinear_derivative(self) -> Callable:
+        """Makes the derivative of the nonlinearity specified by the config
+        (used for hand derived gradients).
+
+        Returns:
+            nonlinear_derivative: Callable object, derivative of nonlinearity.
+
+        Raises:
+            ValueError: If nonlinearity provided in config is not recognised
+        """
+        if self._nonlinearity == constants.Constants.RELU:
+            nonlinear_derivative = custom_activations.relu_derivative
+        elif self._nonlinearity == constants.Constants.SIGMOID:
+            nonlinear_derivative = custom_activations.sigmoid_derivative
+        elif self._nonlinearity == constants.Constants.SCALED_ERF:
+            nonlinear_derivative = custom_activations.scaled_erf_activation_derivative
+        elif self._nonlinearity == constants.Constants.LINEAR:
+            nonlinear_derivative = custom_activations.linear_activation_derivative
+        else:
+            raise ValueError(f"Unknown non-linearity: {self._nonlinearity}")
+        return nonlinear_derivative
+
     def _construct_layers(self) -> None:
         """Instantiate layers (input, hidden and output) according to
         dimensions specified in configuration. Note this method makes a call to
@@ -8,3 +8,20 @@ def linear_activation(x):
 
 def scaled_erf_activation(x):
     return torch.erf(x / np.sqrt(2))
+
+
+def linear_activation_derivative(x):
+    return torch.ones_like(x)
+
+
+def scaled_erf_activation_derivative(x):
+    return np.sqrt(2 / np.pi) * torch.exp(-(x ** 2) / 2)
+
+
+def relu_derivative(x):
+    return (x > 0).to(x.dtype)
+
+
+def sigmoid_derivative(x):
+    sigmoid = torch.sigmoid(x)
+    return sigmoid * (1 - sigmoid)
@@ -0,0 +1,34 @@
+import heapq
+from typing import List
+
+
+class EventSchedule:
+    """Sorted stream of steps at which a training loop has to do something
+    other than a training step (test, log, checkpoint, task switch...).
+
+    Periodic events (multiples of given periods) are merged lazily with one
+    off events added during training (e.g. task switches, known when a task
+    starts for curricula with fixed switch steps). The end of training is
+    always an event.
+    """
+
+    def __init__(self, periods: List[int], total_steps: int) -> None:
+        self._periodic_events = heapq.merge(
+            *[range(0, total_steps, period) for period in periods], [total_steps]
+        )
+        self._next_periodic_event = next(self._periodic_events)
+        self._events = []
+
+    def add(self, step: int) -> None:
+        """Add one off event at step."""
+        heapq.heappush(self._events, step)
+
+    def next_event(self, step: int) -> int:
+        """First event after step (exclusive)."""
+        while self._next_periodic_event <= step:
+            self._next_periodic_event = next(self._periodic_events)
+        while self._events and self._events[0] <= step:
+            heapq.heappop(self._events)
+        if self._events:
+            return min(self._events[0], self._next_periodic_event)
+        return self._next_periodic_event
@@ -0,0 +1,98 @@
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import torch
+
+from students import base_student
+from teachers.ensembles import base_teacher_ensemble
+from utils import network_configuration
+
+
+class OverlapTracker:
+    """Order parameters of a student with respect to a fixed set of teachers.
+
+    Teachers are not trained, so their weights (stacked), head weights, self
+    overlaps and cross overlaps are computed once at construction. Student
+    overlaps are evaluated on request with a single product of the student
+    weights with the stacked student and teacher weights, on the device of
+    the networks, and moved to the host in one transfer.
+    """
+
+    def __init__(
+        self,
+        student: base_student.BaseStudent,
+        teachers: base_teacher_ensemble.BaseTeacherEnsemble,
+        input_dimension: int,
+    ) -> None:
+        self._student = student
+        self._input_dimension = input_dimension
+
+        with torch.no_grad():
+            teacher_weights = [
+                teacher.layers[0].weight.data for teacher in teachers.teachers
+            ]
+            self._teacher_weights = torch.cat(teacher_weights)
+            self._teacher_sizes = [len(weights) for weights in teacher_weights]
+
+            self._teacher_head_weights = [
+                teacher.head.weight.data.cpu().numpy().flatten()
+                for teacher in teachers.teachers
+            ]
+            self._teacher_self_overlaps = [
+                teacher.self_overlap.cpu().numpy() for teacher in teachers.teachers
+            ]
+            self._teacher_cross_overlaps = [
+                overlap.cpu().numpy() for overlap in teachers.cross_overlaps
+            ]
+
+    def to(self, device: torch.device) -> None:
+        """Move cached teacher weights to device (of the networks)."""
+        self._teacher_weights = self._teacher_weights.to(device)
+
+    def overlaps(self) -> Tuple[torch.Tensor, List[torch.Tensor]]:
+        """Student self overlap and student-teacher overlaps (on device)."""
+        with torch.no_grad():
+            student_weights = self._student.layers[0].weight.data
+            overlaps = (
+                student_weights.mm(
+                    torch.cat((student_weights, self._teacher_weights)).t()
+                )
+                / self._input_dimension
+            )
+        student_self_overlap, *student_teacher_overlaps = overlaps.split(
+            [len(student_weights)] + self._teacher_sizes, dim=1
+        )
+        return student_self_overlap, student_teacher_overlaps
+
+    def network_configuration(self) -> network_configuration.NetworkConfiguration:
+        student_self_overlap, student_teacher_overlaps = self.overlaps()
+        overlaps = [student_self_overlap] + student_teacher_overlaps
+
+        with torch.no_grad():
+            heads = [head.weight.data.flatten() for head in self._student.heads]
+            # single device to host transfer.
+            values = (
+                torch.cat([overlap.flatten() for overlap in overlaps] + heads)
+                .cpu()
+                .numpy()
+            )
+
+        sizes = [overlap.numel() for overlap in overlaps] + [
+            head.numel() for head in heads
+        ]
+        splits = np.split(values, np.cumsum(sizes)[:-1])
+        overlaps = [
+            split.reshape(overlap.shape)
+            for split, overlap in zip(splits[: len(overlaps)], overlaps)
+        ]
+        student_head_weights = splits[len(overlaps) :]
+
+        return network_configuration.NetworkConfiguration(
+            student_head_weights=student_head_weights,
+            teacher_head_weights=self._teacher_head_weights,
+            student_self_overlap=overlaps[0],
+            teacher_self_overlaps=self._teacher_self_overlaps,
+            teacher_cross_overlaps=self._teacher_cross_overlaps,
+            student_teacher_overlaps=overlaps[1:],
+        )